@@ -1,7 +1,8 @@
-def design_slides(title: str, bullets: list[str]) -> dict:
+def design_slides(title: str, bullets: list[str], notes: str = "") -> dict:
     return{
 
         "title"  :title,
         "bullets": bullets,
-        "image" : None
-    }
\ No newline at end of file
+        "image" : None,
+        "notes" : notes
+    }
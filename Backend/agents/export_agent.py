@@ -22,33 +22,58 @@
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from typing import List, Dict, Any
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.text.text import Font
+from typing import List, Dict, Any, Optional
+from io import BytesIO
 import logging
-import os
+
+from utils.template_registry import TemplateRegistry, DEFAULT_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
-def export_to_pptx(slides: List[Dict[str, Any]], filename: str = "generated_slides.pptx") -> bool:
+# Text styles are written once into the slide master and layouts by _apply_theme,
+# so the slide builders below only set text.
+THEMES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "slide_size": (Inches(13.33), Inches(7.5)),
+        "cover_title": {"font": "Calibri", "size": 44, "bold": True, "color": RGBColor(31, 73, 125), "align": "ctr"},
+        "cover_subtitle": {"font": "Calibri", "size": 24, "color": RGBColor(89, 89, 89), "align": "ctr"},
+        "title": {"font": "Calibri", "size": 32, "bold": True, "color": RGBColor(31, 73, 125)},
+        "body": {"font": "Calibri", "size": 20, "color": RGBColor(64, 64, 64)},
+        "title_margins": {"bottom": Inches(0.1)},
+        "body_margins": {"left": Inches(0.2), "right": Inches(0.2), "top": Inches(0.1), "bottom": Inches(0.1)},
+    },
+    "enhanced": {
+        "cover_title": {"font": "Segoe UI", "size": 48, "bold": True, "color": RGBColor(31, 73, 125), "align": "ctr"},
+        "cover_subtitle": {"font": "Segoe UI", "size": 18, "color": RGBColor(89, 89, 89), "align": "ctr"},
+        "title": {"font": "Segoe UI", "size": 36, "bold": True, "color": RGBColor(31, 73, 125)},
+        "body": {"font": "Segoe UI", "size": 22, "color": RGBColor(64, 64, 64), "space_after": 12},
+        "title_margins": {},
+        "body_margins": {"left": Inches(0.3), "top": Inches(0.2)},
+    },
+}
+
+def _build_presentation(slides: List[Dict[str, Any]], template: str = DEFAULT_TEMPLATE,
+                        title: Optional[str] = None) -> Presentation:
+    # An empty copy of the template, parsed once per process (and sized and themed if it is the default).
+    prs = template_registry.new_presentation(template, "default")
+    
+    if slides:
+        # Without an explicit deck title, the title slide repeats the first slide's title.
+        _create_title_slide(prs, title or slides[0]["title"])
+    
+    for i, slide_data in enumerate(slides):
+        _create_content_slide(prs, slide_data, i + 1)
+    
+    return prs
+
+def export_to_pptx(slides: List[Dict[str, Any]], filename: str = "generated_slides.pptx",
+                   template: str = DEFAULT_TEMPLATE, title: Optional[str] = None) -> bool:
     try:
-        prs = Presentation()
-        
-        if len(prs.slides) > 0:
-            slides_to_remove = list(prs.slides)
-            for slide in slides_to_remove:
-                slide_id = slide.slide_id
-                prs.part.drop_rel(prs.slides._sldIdLst[0].rId)
-                del prs.slides._sldIdLst[0]
-        
-        prs.slide_width = Inches(13.33)
-        prs.slide_height = Inches(7.5)
-        
-        if slides:
-            _create_title_slide(prs, slides[0]["title"])
-        
-        for i, slide_data in enumerate(slides):
-            _create_content_slide(prs, slide_data, i + 1)
-        
+        prs = _build_presentation(slides, template, title)
         prs.save(filename)
         logger.info(f"✅ Exported {len(slides)} slides to {filename}")
         return True
@@ -57,6 +82,25 @@ def export_to_pptx(slides: List[Dict[str, Any]], filename: str = "generated_slid
         logger.error(f"❌ Export failed: {str(e)}")
         return False
 
+def export_to_buffer(slides: List[Dict[str, Any]], template: str = DEFAULT_TEMPLATE,
+                     title: Optional[str] = None) -> Optional[BytesIO]:
+    """
+    Serialize the presentation into an in-memory buffer instead of a file.
+    
+    Returns the buffer rewound to the start, or None if export failed.
+    """
+    try:
+        prs = _build_presentation(slides, template, title)
+        buffer = BytesIO()
+        prs.save(buffer)
+        buffer.seek(0)
+        logger.info(f"✅ Exported {len(slides)} slides to memory ({buffer.getbuffer().nbytes} bytes)")
+        return buffer
+        
+    except Exception as e:
+        logger.error(f"❌ Export failed: {str(e)}")
+        return None
+
 def _create_title_slide(prs: Presentation, main_title: str):
     """Create an attractive title slide."""
     slide_layout = prs.slide_layouts[0]  # Title slide layout
@@ -64,33 +108,11 @@ def _create_title_slide(prs: Presentation, main_title: str):
     
     # Set title
     if slide.shapes.title:
-        title = slide.shapes.title
-        title.text = main_title.replace(" - Part 1", "").replace(" (Slide 1)", "")
-        
-        # Format title
-        title_frame = title.text_frame
-        title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-        
-        # Title font formatting
-        title_run = title_frame.paragraphs[0].runs[0]
-        title_run.font.name = 'Calibri'
-        title_run.font.size = Pt(44)
-        title_run.font.bold = True
-        title_run.font.color.rgb = RGBColor(31, 73, 125)  # Professional blue
+        slide.shapes.title.text = main_title.replace(" - Part 1", "").replace(" (Slide 1)", "")
     
     # Add subtitle
     if len(slide.placeholders) > 1:
-        subtitle = slide.placeholders[1]
-        subtitle.text = "AI-Generated Presentation"
-        
-        # Format subtitle
-        subtitle_frame = subtitle.text_frame
-        subtitle_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-        
-        subtitle_run = subtitle_frame.paragraphs[0].runs[0]
-        subtitle_run.font.name = 'Calibri'
-        subtitle_run.font.size = Pt(24)
-        subtitle_run.font.color.rgb = RGBColor(89, 89, 89)  # Gray
+        slide.placeholders[1].text = "AI-Generated Presentation"
 
 def _create_content_slide(prs: Presentation, slide_data: Dict[str, Any], slide_number: int):
     """Create a content slide with bullets."""
@@ -99,59 +121,41 @@ def _create_content_slide(prs: Presentation, slide_data: Dict[str, Any], slide_n
     
     # Set slide title
     if slide.shapes.title:
-        title = slide.shapes.title
-        title.text = slide_data.get("title", f"Slide {slide_number}")
-        
-        # Format title
-        title_frame = title.text_frame
-        title_frame.margin_bottom = Inches(0.1)
-        
-        title_run = title_frame.paragraphs[0].runs[0]
-        title_run.font.name = 'Calibri'
-        title_run.font.size = Pt(32)
-        title_run.font.bold = True
-        title_run.font.color.rgb = RGBColor(31, 73, 125)
+        slide.shapes.title.text = slide_data.get("title", f"Slide {slide_number}")
     
     # Add content
     if len(slide.placeholders) > 1:
-        content_placeholder = slide.placeholders[1]
-        text_frame = content_placeholder.text_frame
-        text_frame.clear()  # Clear default text
-        
-        bullets = slide_data.get("bullets", [])
-        
-        # Add bullets with formatting
-        for i, bullet_text in enumerate(bullets):
-            if i == 0:
-                p = text_frame.paragraphs[0]
-            else:
-                p = text_frame.add_paragraph()
-            
-            p.text = bullet_text
-            p.level = 0  # First level bullet
-            
-            # Format bullet text
-            if p.runs:
-                run = p.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(20)
-                run.font.color.rgb = RGBColor(64, 64, 64)
+        _fill_bullets(slide.placeholders[1].text_frame, slide_data.get("bullets", []))
+    
+    # Speaker notes; the notes slide is only created when there is something to put on it.
+    if slide_data.get("notes"):
+        slide.notes_slide.notes_text_frame.text = slide_data["notes"]
+
+def _fill_bullets(text_frame, bullets: List[str]):
+    text_frame.clear()  # Clear default text
+    
+    for i, bullet_text in enumerate(bullets):
+        if i == 0:
+            p = text_frame.paragraphs[0]
+        else:
+            p = text_frame.add_paragraph()
         
-        # Set text frame properties
-        text_frame.margin_left = Inches(0.2)
-        text_frame.margin_right = Inches(0.2)
-        text_frame.margin_top = Inches(0.1)
-        text_frame.margin_bottom = Inches(0.1)
+        p.text = bullet_text
+        p.level = 0  # First level bullet
+
+def export_to_bytes(slides: List[Dict[str, Any]], template: str = DEFAULT_TEMPLATE,
+                    title: Optional[str] = None) -> Optional[bytes]:
+    """Serialize the presentation to PPTX bytes; a picklable entry point for process pools."""
+    buffer = export_to_buffer(slides, template, title)
+    return buffer.getvalue() if buffer is not None else None
 
 def create_enhanced_presentation(slides: List[Dict[str, Any]], filename: str = "presentation.pptx"):
     """
     Create a presentation with enhanced design elements.
     """
     try:
-        prs = Presentation()
-        
-        # Customize slide master if needed
-        _apply_theme(prs)
+        # Slide master already customized by the enhanced theme
+        prs = template_registry.new_presentation(DEFAULT_TEMPLATE, "enhanced")
         
         # Create slides
         for i, slide_data in enumerate(slides):
@@ -170,11 +174,95 @@ def create_enhanced_presentation(slides: List[Dict[str, Any]], filename: str = "
         logger.error(f"❌ Enhanced presentation creation failed: {str(e)}")
         return False
 
-def _apply_theme(prs: Presentation):
-    """Apply a professional theme to the presentation."""
-    # Note: Advanced theming would require more complex manipulation
-    # of the slide master and layouts
-    pass
+def _apply_theme(prs: Presentation, theme_name: str = "default"):
+    """
+    Apply a professional theme to the presentation.
+    
+    Title and body text styles go into the slide master, and the title-slide
+    and content layouts get the cover styles and text margins, so every slide
+    inherits them instead of carrying its own run formatting.
+    """
+    theme = THEMES[theme_name]
+    
+    if "slide_size" in theme:
+        prs.slide_width, prs.slide_height = theme["slide_size"]
+    
+    tx_styles = prs.slide_master.element.find(qn("p:txStyles"))
+    _style_list_level(tx_styles.find(qn("p:titleStyle")), theme["title"])
+    _style_list_level(tx_styles.find(qn("p:bodyStyle")), theme["body"])
+    
+    for placeholder in prs.slide_layouts[0].placeholders:
+        ph_type = placeholder.placeholder_format.type
+        if ph_type in (PP_PLACEHOLDER.CENTER_TITLE, PP_PLACEHOLDER.TITLE):
+            _style_list_level(_list_style(placeholder), theme["cover_title"])
+        elif ph_type == PP_PLACEHOLDER.SUBTITLE:
+            _style_list_level(_list_style(placeholder), theme["cover_subtitle"])
+    
+    for placeholder in prs.slide_layouts[1].placeholders:
+        if placeholder.placeholder_format.type == PP_PLACEHOLDER.TITLE:
+            _set_margins(placeholder.text_frame, theme["title_margins"])
+        elif placeholder.placeholder_format.idx == 1:
+            _set_margins(placeholder.text_frame, theme["body_margins"])
+
+def _list_style(placeholder):
+    txBody = placeholder.element.find(qn("p:txBody"))
+    lstStyle = txBody.find(qn("a:lstStyle"))
+    if lstStyle is None:
+        lstStyle = OxmlElement("a:lstStyle")
+        txBody.find(qn("a:bodyPr")).addnext(lstStyle)
+    return lstStyle
+
+def _style_list_level(list_style, style: Dict[str, Any]):
+    """Write a text style into the first outline level of a master or placeholder list style."""
+    lvl1pPr = list_style.find(qn("a:lvl1pPr"))
+    if lvl1pPr is None:
+        lvl1pPr = OxmlElement("a:lvl1pPr")
+        list_style.insert(0, lvl1pPr)
+    
+    if "align" in style:
+        lvl1pPr.set("algn", style["align"])
+    
+    if "space_after" in style:
+        _set_space_after(lvl1pPr, style["space_after"])
+    
+    defRPr = lvl1pPr.find(qn("a:defRPr"))
+    if defRPr is None:
+        defRPr = OxmlElement("a:defRPr")
+        extLst = lvl1pPr.find(qn("a:extLst"))
+        if extLst is not None:
+            extLst.addprevious(defRPr)
+        else:
+            lvl1pPr.append(defRPr)
+    
+    font = Font(defRPr)
+    font.name = style["font"]
+    font.size = Pt(style["size"])
+    if "bold" in style:
+        font.bold = style["bold"]
+    font.color.rgb = style["color"]
+
+def _set_space_after(pPr, points: int):
+    spcAft = pPr.find(qn("a:spcAft"))
+    if spcAft is not None:
+        pPr.remove(spcAft)
+    
+    spcAft = OxmlElement("a:spcAft")
+    spcPts = OxmlElement("a:spcPts")
+    spcPts.set("val", str(points * 100))
+    spcAft.append(spcPts)
+    
+    # spcAft follows lnSpc/spcBef and precedes every other paragraph property.
+    anchor = pPr.find(qn("a:spcBef"))
+    if anchor is None:
+        anchor = pPr.find(qn("a:lnSpc"))
+    if anchor is not None:
+        anchor.addnext(spcAft)
+    else:
+        pPr.insert(0, spcAft)
+
+def _set_margins(text_frame, margins: Dict[str, int]):
+    for side, value in margins.items():
+        setattr(text_frame, f"margin_{side}", value)
 
 def _create_enhanced_title_slide(prs: Presentation, slide_data: Dict[str, Any]):
     """Create an enhanced title slide with design elements."""
@@ -182,18 +270,7 @@ def _create_enhanced_title_slide(prs: Presentation, slide_data: Dict[str, Any]):
     slide = prs.slides.add_slide(slide_layout)
     
     # Main title
-    title = slide.shapes.title
-    title.text = slide_data.get("title", "Presentation")
-    
-    # Enhanced title formatting
-    title_frame = title.text_frame
-    title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-    
-    for run in title_frame.paragraphs[0].runs:
-        run.font.name = 'Segoe UI'
-        run.font.size = Pt(48)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(31, 73, 125)
+    slide.shapes.title.text = slide_data.get("title", "Presentation")
     
     # Add subtitle with first few bullets as overview
     if len(slide.placeholders) > 1 and slide_data.get("bullets"):
@@ -201,15 +278,6 @@ def _create_enhanced_title_slide(prs: Presentation, slide_data: Dict[str, Any]):
         bullets = slide_data.get("bullets", [])
         subtitle_text = " • ".join(bullets[:3]) if len(bullets) > 1 else bullets[0] if bullets else ""
         subtitle.text = subtitle_text
-        
-        # Format subtitle
-        subtitle_frame = subtitle.text_frame
-        subtitle_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-        
-        for run in subtitle_frame.paragraphs[0].runs:
-            run.font.name = 'Segoe UI'
-            run.font.size = Pt(18)
-            run.font.color.rgb = RGBColor(89, 89, 89)
 
 def _create_enhanced_content_slide(prs: Presentation, slide_data: Dict[str, Any], slide_number: int):
     """Create enhanced content slide with better formatting."""
@@ -217,42 +285,9 @@ def _create_enhanced_content_slide(prs: Presentation, slide_data: Dict[str, Any]
     slide = prs.slides.add_slide(slide_layout)
     
     # Title
-    title = slide.shapes.title
-    title.text = slide_data.get("title", f"Content {slide_number}")
-    
-    # Enhanced title formatting
-    title_frame = title.text_frame
-    for run in title_frame.paragraphs[0].runs:
-        run.font.name = 'Segoe UI'
-        run.font.size = Pt(36)
-        run.font.bold = True
-        run.font.color.rgb = RGBColor(31, 73, 125)
+    slide.shapes.title.text = slide_data.get("title", f"Content {slide_number}")
     
     # Content with enhanced bullets
-    content_placeholder = slide.placeholders[1]
-    text_frame = content_placeholder.text_frame
-    text_frame.clear()
-    
-    bullets = slide_data.get("bullets", [])
-    
-    for i, bullet_text in enumerate(bullets):
-        if i == 0:
-            p = text_frame.paragraphs[0]
-        else:
-            p = text_frame.add_paragraph()
-        
-        p.text = bullet_text
-        p.level = 0
-        
-        # Enhanced bullet formatting
-        for run in p.runs:
-            run.font.name = 'Segoe UI'
-            run.font.size = Pt(22)
-            run.font.color.rgb = RGBColor(64, 64, 64)
-        
-        # Add spacing between bullets
-        p.space_after = Pt(12)
-    
-    # Adjust text frame margins
-    text_frame.margin_left = Inches(0.3)
-    text_frame.margin_top = Inches(0.2)
\ No newline at end of file
+    _fill_bullets(slide.placeholders[1].text_frame, slide_data.get("bullets", []))
+
+template_registry = TemplateRegistry(prepare=_apply_theme)
@@ -0,0 +1,155 @@
+"""
+Local extractive summarizer: picks the most central sentences of a text without a model call.
+
+Sentences become TF-IDF vectors, TextRank (PageRank over their cosine
+similarities) scores how central each one is, and the score is boosted by
+similarity to the topic. The best sentences are taken greedily, skipping
+near-duplicates of those already chosen, and returned in document order.
+A few hundred sentences take a few milliseconds.
+"""
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+# How much similarity to the topic raises a sentence's score, and how much earlier sentences are preferred.
+TOPIC_WEIGHT = 2.0
+POSITION_WEIGHT = 0.3
+# Candidates at least this similar to an already chosen sentence are skipped as redundant.
+REDUNDANCY_THRESHOLD = 0.5
+MAX_SENTENCES = 1000
+
+MIN_SENTENCE_WORDS = 5
+MAX_BULLET_WORDS = 25
+TRUNCATED_BULLET_WORDS = 20
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Wikipedia pronunciation and citation debris, e.g. "(/ˈpærɪs/; French: ...)" or "[12]".
+_BRACKETED = re.compile(r"\s*\[[^\]]*\]|\s*\([^)]*[/;][^)]*\)")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your yours yourself yourselves
+one two many much may might must shall since upon within without however although though thus among
+""".split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on ., ! and ? followed by a capitalized word, and on blank lines."""
+    sentences = []
+    for block in re.split(r"\n\s*\n|\n(?=\s*[-*•])", text):
+        block = " ".join(block.split())
+        if block:
+            sentences.extend(part.strip() for part in _SENTENCE_END.split(block) if part.strip())
+    return sentences
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+
+
+def _tfidf(documents: List[List[str]], extra: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    L2-normalized TF-IDF rows for `documents`, plus rows for `extra` (e.g. the
+    topic) weighted with the same vocabulary and IDF.
+    """
+    vocabulary: Dict[str, int] = {}
+    rows, cols = [], []
+    for row, words in enumerate(documents + extra):
+        for word in words:
+            if row >= len(documents) and word not in vocabulary:
+                continue
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    counts = np.zeros((len(documents) + len(extra), max(1, len(vocabulary))), dtype=np.float32)
+    np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+
+    document_counts = counts[:len(documents)]
+    df = np.count_nonzero(document_counts, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + df)) + 1
+    weights = np.log1p(counts) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms == 0, 1, norms)
+    return weights[:len(documents)], weights[len(documents):]
+
+
+def _textrank(similarity: np.ndarray) -> np.ndarray:
+    n = similarity.shape[0]
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences similar to nothing spread their rank evenly instead of leaking it.
+    transition = np.where(out_weight > 0, similarity / np.where(out_weight == 0, 1, out_weight), 1.0 / n)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < TOLERANCE:
+            return updated
+        rank = updated
+    return rank
+
+
+def _as_bullet(sentence: str) -> str:
+    sentence = _BRACKETED.sub("", sentence).strip()
+    words = sentence.split()
+    if len(words) > MAX_BULLET_WORDS:
+        return " ".join(words[:TRUNCATED_BULLET_WORDS]) + "..."
+    return sentence.rstrip(".")
+
+
+def rank_sentences(sentences: List[str], topic: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score each sentence by TextRank centrality, boosted by similarity to
+    `topic` and by position. Returns the scores and the sentence vectors.
+    """
+    documents = [tokenize(sentence) for sentence in sentences]
+    vectors, extra = _tfidf(documents, [tokenize(topic)] if topic else [])
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    scores = _textrank(similarity)
+
+    if topic and extra.size:
+        scores = scores * (1 + TOPIC_WEIGHT * (vectors @ extra[0]))
+    position = np.arange(len(sentences), dtype=np.float64)
+    scores = scores * (1 + POSITION_WEIGHT / (1 + position / 5))
+    return scores, vectors
+
+
+def extractive_summarize(text: str, max_bullets: int = 4, topic: Optional[str] = None) -> List[str]:
+    """Pick up to `max_bullets` central, non-redundant sentences of `text` as bullets, in document order."""
+    if not text or not text.strip():
+        return []
+
+    sentences = [s for s in split_sentences(text) if len(s.split()) >= MIN_SENTENCE_WORDS][:MAX_SENTENCES]
+    if len(sentences) <= max_bullets:
+        if sentences:
+            return [_as_bullet(s) for s in sentences]
+        return [text[:100] + "..." if len(text) > 100 else text.strip()]
+
+    scores, vectors = rank_sentences(sentences, topic)
+
+    chosen: List[int] = []
+    redundant: List[int] = []
+    for index in np.argsort(-scores):
+        if chosen and float(np.max(vectors[chosen] @ vectors[index])) >= REDUNDANCY_THRESHOLD:
+            redundant.append(int(index))
+            continue
+        chosen.append(int(index))
+        if len(chosen) == max_bullets:
+            break
+    # Repetitive text may not have enough distinct sentences; top up with the best of the rest.
+    chosen.extend(redundant[:max_bullets - len(chosen)])
+
+    return [_as_bullet(sentences[i]) for i in sorted(chosen)]
@@ -0,0 +1,189 @@
+"""
+Direct OOXML exporter for very large decks.
+
+Instead of building python-pptx objects for every shape and run, slide XML is
+produced from string templates and written straight into a ZIP stream. The
+templates are rendered once per presentation template by the regular
+python-pptx slide builders, so the output matches `export_to_pptx` for the
+title and title+bullets layouts. Speaker notes are not written; decks with
+notes go through `export_to_pptx`.
+"""
+import re
+import zipfile
+import threading
+import logging
+from io import BytesIO
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+from xml.sax.saxutils import escape
+
+from agents.export_agent import template_registry, _create_title_slide, _create_content_slide
+from utils.template_registry import DEFAULT_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+TITLE_MARKER = "SLIDEMAGE_TITLE_MARKER"
+BULLET_MARKER = "SLIDEMAGE_BULLET_MARKER"
+
+SLIDE_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+SLIDE_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+FIRST_SLIDE_ID = 256
+
+# Characters XML 1.0 cannot represent; python-pptx would refuse them outright.
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class _SlideTemplates:
+    """Package parts and slide XML fragments for one presentation template."""
+
+    def __init__(self, package: bytes):
+        source = zipfile.ZipFile(BytesIO(package))
+        self.parts = [(info, source.read(info.filename)) for info in source.infolist()]
+
+        presentation = source.read("ppt/presentation.xml").decode("utf-8")
+        self.presentation_head, self.presentation_tail = presentation.split("<p:sldIdLst/>")
+
+        rels = source.read("ppt/_rels/presentation.xml.rels").decode("utf-8")
+        self.rels_head, self.rels_tail = rels.rsplit("</Relationships>", 1)
+        self.rels_tail = "</Relationships>" + self.rels_tail
+        self.first_rid = max(int(n) for n in re.findall(r'Id="rId(\d+)"', rels)) + 1
+
+        content_types = source.read("[Content_Types].xml").decode("utf-8")
+        self.types_head, self.types_tail = content_types.rsplit("</Types>", 1)
+        self.types_tail = "</Types>" + self.types_tail
+
+        self._render_samples(package)
+
+    def _render_samples(self, package: bytes):
+        from pptx import Presentation
+
+        prs = Presentation(BytesIO(package))
+        _create_title_slide(prs, TITLE_MARKER)
+        _create_content_slide(prs, {"title": TITLE_MARKER, "bullets": [BULLET_MARKER]}, 1)
+        _create_content_slide(prs, {"title": TITLE_MARKER, "bullets": []}, 2)
+
+        title_slide, content_slide, empty_slide = prs.slides
+        self.title_xml = title_slide.part.blob.decode("utf-8")
+        self.title_rels = title_slide.part.rels.xml.decode("utf-8")
+        self.content_rels = content_slide.part.rels.xml.decode("utf-8")
+
+        content = content_slide.part.blob.decode("utf-8")
+        marker = content.index(BULLET_MARKER)
+        start = content.rindex("<a:p>", 0, marker)
+        end = content.index("</a:p>", marker) + len("</a:p>")
+        self.content_head = content[:start]
+        self.content_tail = content[end:]
+        self.bullet_head = content[start:marker]
+        self.bullet_tail = content[marker + len(BULLET_MARKER):end]
+
+        # A slide without bullets keeps the empty paragraph left by text_frame.clear().
+        empty = empty_slide.part.blob.decode("utf-8")
+        self.empty_body = empty[len(self.content_head):len(empty) - len(self.content_tail)]
+
+        # A line break inside a bullet closes the run, adds <a:br/> and opens a new run.
+        run_start = self.bullet_head.rindex("<a:r>")
+        run_end = self.bullet_tail.index("</a:r>") + len("</a:r>")
+        self.line_break = self.bullet_tail[:run_end] + "<a:br/>" + self.bullet_head[run_start:]
+
+    def text(self, value: str) -> str:
+        lines = _INVALID_XML_CHARS.sub("", value.replace("\v", "\n")).split("\n")
+        return self.line_break.join(escape(line) for line in lines)
+
+    def title_slide(self, title: str) -> str:
+        return self.title_xml.replace(TITLE_MARKER, self.text(title))
+
+    def content_slide(self, title: str, bullets: List[str]) -> str:
+        if bullets:
+            body = "".join(self.bullet_head + self.text(bullet) + self.bullet_tail for bullet in bullets)
+        else:
+            body = self.empty_body
+        return self.content_head.replace(TITLE_MARKER, self.text(title)) + body + self.content_tail
+
+
+_templates: Dict[str, _SlideTemplates] = {}
+_templates_lock = threading.Lock()
+
+
+def _get_templates(template: str) -> _SlideTemplates:
+    with _templates_lock:
+        templates = _templates.get(template)
+        if templates is None:
+            templates = _SlideTemplates(template_registry.package(template, "default"))
+            _templates[template] = templates
+        return templates
+
+
+def write_pptx(slides: List[Dict[str, Any]], output: Union[str, BinaryIO], template: str = DEFAULT_TEMPLATE,
+               title: Optional[str] = None):
+    """
+    Write a deck to a path or writable binary stream without python-pptx.
+
+    Package parts are written first, then each slide is rendered and written
+    on its own, so memory per slide stays constant however long the deck is.
+    The stream does not need to be seekable.
+    """
+    templates = _get_templates(template)
+    # The deck opens with a title slide, followed by one content slide per entry.
+    slide_count = len(slides) + 1 if slides else 0
+    slide_ids = range(slide_count)
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for info, data in templates.parts:
+            if info.filename == "[Content_Types].xml":
+                data = (templates.types_head + "".join(
+                    f'<Override PartName="/ppt/slides/slide{n + 1}.xml" ContentType="{SLIDE_CONTENT_TYPE}"/>'
+                    for n in slide_ids
+                ) + templates.types_tail).encode("utf-8")
+            elif info.filename == "ppt/presentation.xml":
+                id_list = "".join(
+                    f'<p:sldId id="{FIRST_SLIDE_ID + n}" r:id="rId{templates.first_rid + n}"/>' for n in slide_ids
+                )
+                sld_id_lst = f"<p:sldIdLst>{id_list}</p:sldIdLst>" if slide_count else "<p:sldIdLst/>"
+                data = (templates.presentation_head + sld_id_lst + templates.presentation_tail).encode("utf-8")
+            elif info.filename == "ppt/_rels/presentation.xml.rels":
+                data = (templates.rels_head + "".join(
+                    f'<Relationship Id="rId{templates.first_rid + n}" Type="{SLIDE_REL_TYPE}" '
+                    f'Target="slides/slide{n + 1}.xml"/>'
+                    for n in slide_ids
+                ) + templates.rels_tail).encode("utf-8")
+            archive.writestr(info.filename, data)
+
+        if not slides:
+            return
+
+        title = (title or slides[0]["title"]).replace(" - Part 1", "").replace(" (Slide 1)", "")
+        archive.writestr("ppt/slides/slide1.xml", templates.title_slide(title))
+        archive.writestr("ppt/slides/_rels/slide1.xml.rels", templates.title_rels)
+
+        for i, slide_data in enumerate(slides):
+            number = i + 2
+            slide_xml = templates.content_slide(slide_data.get("title", f"Slide {i + 1}"),
+                                                slide_data.get("bullets", []))
+            archive.writestr(f"ppt/slides/slide{number}.xml", slide_xml)
+            archive.writestr(f"ppt/slides/_rels/slide{number}.xml.rels", templates.content_rels)
+
+
+def export_to_pptx_fast(slides: List[Dict[str, Any]], filename: str = "generated_slides.pptx",
+                        template: str = DEFAULT_TEMPLATE, title: Optional[str] = None) -> bool:
+    """Same output as export_to_pptx, written directly as OOXML."""
+    try:
+        write_pptx(slides, filename, template, title)
+        logger.info(f"✅ Exported {len(slides)} slides to {filename}")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Export failed: {str(e)}")
+        return False
+
+
+def export_to_bytes_fast(slides: List[Dict[str, Any]], template: str = DEFAULT_TEMPLATE,
+                         title: Optional[str] = None) -> Optional[bytes]:
+    """Same output as export_to_bytes, written directly as OOXML."""
+    try:
+        buffer = BytesIO()
+        write_pptx(slides, buffer, template, title)
+        logger.info(f"✅ Exported {len(slides)} slides to memory ({buffer.getbuffer().nbytes} bytes)")
+        return buffer.getvalue()
+
+    except Exception as e:
+        logger.error(f"❌ Export failed: {str(e)}")
+        return None
@@ -1,10 +1,32 @@
-import wikipedia
+from typing import Dict, List
+from connectors.wikipedia_connector import fetch_summaries, get_client, WIKIPEDIA_LANGUAGE
+from utils.research_cache import STATUS_FOUND
 
-def research(topic: str) -> str:
+SUMMARY_SENTENCES = 5
+CACHE_SOURCE = f"wikipedia-summary-{SUMMARY_SENTENCES}"
+
+def warm_up():
+    get_client(WIKIPEDIA_LANGUAGE)
+
+def research_many(topics: List[str]) -> Dict[str, str]:
+    """
+    Research several topics at once: uncached topics share batched Wikipedia
+    requests, and every result lands in the research cache, so a later
+    research(topic) for any of them is a cache hit.
+    """
     try:
-        s = wikipedia.summary(topic, sentences=5)
-        print("✅ Research Successful")
-        return s
+        results = fetch_summaries(topics, WIKIPEDIA_LANGUAGE, SUMMARY_SENTENCES, CACHE_SOURCE)
     except Exception as e:
+        # Network and API errors are transient, so they are not cached.
         print("⚠️ Research Failed:", e)
-        return "Error"
+        return {topic: "Error" for topic in topics}
+
+    return {topic: content if status == STATUS_FOUND else "Error" for topic, (status, content) in results.items()}
+
+def research(topic: str) -> str:
+    result = research_many([topic])[topic]
+    if result == "Error":
+        print("⚠️ Research Failed:", topic)
+    else:
+        print("✅ Research Successful")
+    return result
@@ -0,0 +1,189 @@
+"""
+Retrieval over uploaded documents, for question answering that sends the
+model only the passages relevant to a question.
+
+Each document's `chunk_text` chunks are embedded with a hashing vectorizer
+into a float32 matrix saved as `<id>.npy` next to a JSON file holding the
+chunk texts. Searches memory-map the matrices, so the OS pages in only what
+a query touches and thousands of documents stay queryable without being
+held in RAM.
+"""
+import os
+import re
+import asyncio
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+import numpy as np
+
+from agents.extractive_summarizer import tokenize
+from agents.summarizer_agent import answer_question_async
+from utils.cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_INDEX_DIR = os.getenv("SLIDEMAGE_DOCUMENT_INDEX_DIR", os.path.join(CACHE_DIR, "documents"))
+EMBEDDING_DIM = 1024
+# Memory-mapped matrices kept open between queries.
+OPEN_DOCUMENTS = 256
+
+_DOCUMENT_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """
+    L2-normalized hashing-vectorizer embeddings of word unigrams and bigrams,
+    with sublinear term frequency, one float32 row per text.
+    """
+    matrix = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = tokenize(text)
+        counts: Dict[str, int] = {}
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            counts[feature] = counts.get(feature, 0) + 1
+        for feature, count in counts.items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            weight = 1.0 + np.log(count)
+            matrix[row, digest % EMBEDDING_DIM] += weight if digest >> 63 else -weight
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    return matrix
+
+
+class DocumentIndex:
+    """
+    Per-document chunk embeddings on disk, searched through memory maps.
+
+    Documents are identified by a hash of their text, so uploading the same
+    document twice reuses its index.
+    """
+
+    def __init__(self, directory: str = DOCUMENT_INDEX_DIR, max_open: int = OPEN_DOCUMENTS):
+        self.directory = directory
+        self.max_open = max_open
+        self._open: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"indexed": 0, "searches": 0}
+        self._search_seconds = 0.0
+
+    def add(self, chunks: List[str], title: str) -> Dict[str, Any]:
+        """Embed and store a document's chunks; return its metadata (id, title, chunk count)."""
+        chunks = [chunk for chunk in chunks if chunk.strip()]
+        if not chunks:
+            raise ValueError("Document has no text to index")
+
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk.encode("utf-8"))
+        document_id = digest.hexdigest()[:32]
+
+        meta = {"id": document_id, "title": title, "chunks": len(chunks), "created": time.time()}
+        if os.path.exists(self._path(document_id, "npy")):
+            return meta
+
+        vectors = embed_texts(chunks)
+        os.makedirs(self.directory, exist_ok=True)
+        # Chunk texts are written first: a matrix on disk means the document is complete.
+        self._write(document_id, "json", lambda f: f.write(json.dumps(dict(meta, texts=chunks)).encode("utf-8")))
+        self._write(document_id, "npy", lambda f: np.save(f, vectors))
+
+        with self._lock:
+            self._counters["indexed"] += 1
+        logger.info(f"Indexed document '{title}' ({len(chunks)} chunks) as {document_id}")
+        return meta
+
+    def exists(self, document_id: str) -> bool:
+        return bool(_DOCUMENT_ID.fullmatch(document_id)) and os.path.exists(self._path(document_id, "npy"))
+
+    def search(self, question: str, document_ids: List[str], top_k: int = 4) -> List[Dict[str, Any]]:
+        """
+        The `top_k` chunks most similar to `question` across `document_ids`,
+        best first, as dicts of document_id, chunk, score and text. Chunks
+        sharing no terms with the question are left out.
+        """
+        start = time.perf_counter()
+        query = embed_texts([question])[0]
+
+        candidates = []
+        for document_id in document_ids:
+            vectors = self._vectors(document_id)
+            scores = vectors @ query
+            # Keep only each document's own top k before merging, so the merge stays small.
+            best = np.argpartition(-scores, top_k - 1)[:top_k] if len(scores) > top_k else np.arange(len(scores))
+            candidates.extend((float(scores[i]), document_id, int(i)) for i in best if scores[i] > 0)
+
+        candidates.sort(reverse=True)
+        results = []
+        texts: Dict[str, List[str]] = {}
+        for score, document_id, chunk in candidates[:top_k]:
+            if document_id not in texts:
+                texts[document_id] = self._texts(document_id)
+            results.append({"document_id": document_id, "chunk": chunk, "score": round(score, 4),
+                            "text": texts[document_id][chunk]})
+
+        with self._lock:
+            self._counters["searches"] += 1
+            self._search_seconds += time.perf_counter() - start
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["open"] = len(self._open)
+            searches = stats["searches"]
+            stats["avg_search_ms"] = round(self._search_seconds / searches * 1000, 3) if searches else 0.0
+        return stats
+
+    def _vectors(self, document_id: str) -> np.ndarray:
+        with self._lock:
+            vectors = self._open.get(document_id)
+            if vectors is not None:
+                self._open.move_to_end(document_id)
+                return vectors
+
+        if not self.exists(document_id):
+            raise KeyError(document_id)
+        vectors = np.load(self._path(document_id, "npy"), mmap_mode="r")
+
+        with self._lock:
+            self._open[document_id] = vectors
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+        return vectors
+
+    def _texts(self, document_id: str) -> List[str]:
+        with open(self._path(document_id, "json"), "r", encoding="utf-8") as f:
+            return json.load(f)["texts"]
+
+    def _path(self, document_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{document_id}.{extension}")
+
+    def _write(self, document_id: str, extension: str, write):
+        # Write to a temp file first so concurrent readers never see a partial file.
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(temp_path, self._path(document_id, extension))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+document_index = DocumentIndex()
+
+
+async def ask_async(question: str, document_ids: List[str], top_k: int = 4) -> Dict[str, Any]:
+    """Answer `question` from the `top_k` most relevant chunks of the given documents."""
+    sources = await asyncio.to_thread(document_index.search, question, document_ids, top_k)
+    if not sources:
+        return {"answer": "The documents do not appear to cover this question.", "sources": []}
+
+    answer = await answer_question_async(question, [source["text"] for source in sources])
+    return {"answer": answer, "sources": sources}
@@ -25,30 +25,281 @@
 
 
 
-import google.generativeai as genai
 import os
+import json
 import time
+import asyncio
+import threading
 import logging
-from typing import List
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+from utils.helpers import chunk_text, validate_slide_data
+from utils.rate_limiter import (
+    gemini_rate_limiter, call_with_backoff, call_with_backoff_async, estimate_tokens
+)
+from utils.metrics import SUMMARIES, GEMINI_HEDGES, observe_gemini_call
+from utils.deadline import LatencyTracker
+from utils.model_pool import ModelPool
 
 logger = logging.getLogger(__name__)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
-    logger.error("GEMINI_API_KEY environment variable not set")
-    raise ValueError("GEMINI_API_KEY environment variable is required")
+    logger.warning("GEMINI_API_KEY environment variable not set, using fallback summarization")
 
-genai.configure(api_key=GEMINI_API_KEY)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.5-pro")
+# Inputs of up to FAST_MODEL_MAX_TOKENS tokens go to the fast model; an empty GEMINI_FAST_MODEL disables routing.
+GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", "models/gemini-2.5-flash")
+FAST_MODEL_MAX_TOKENS = int(os.getenv("SLIDEMAGE_FAST_MODEL_MAX_TOKENS", "4000"))
+MODEL_TIERS = {"fast": GEMINI_FAST_MODEL or GEMINI_MODEL, "large": GEMINI_MODEL}
+GEMINI_MAX_CONCURRENCY = int(os.getenv("SLIDEMAGE_GEMINI_MAX_CONCURRENCY", "16"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("SLIDEMAGE_GEMINI_TIMEOUT_SECONDS", "45"))
 
-def summarize(text: str, max_bullets: int = 4) -> List[str]:
-   
-    if not text or not text.strip():
-        logger.warning("Empty text provided to summarize")
-        return ["No content available"]
+# Input tokens per map/reduce prompt; text longer than this is summarized in parallel chunks.
+MAP_REDUCE_TOKEN_BUDGET = int(os.getenv("SLIDEMAGE_MAP_REDUCE_TOKEN_BUDGET", "6000"))
+MAP_REDUCE_MAX_WORKERS = int(os.getenv("SLIDEMAGE_MAP_REDUCE_MAX_WORKERS", "8"))
+MAP_BULLETS_PER_CHUNK = 6
+CHARS_PER_TOKEN = 4
+
+# Ask for the whole deck as JSON in one call, falling back to the line-based bullets on parse failure.
+STRUCTURED_DECK = os.getenv("SLIDEMAGE_STRUCTURED_DECK", "1") != "0"
+DECK_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Bump whenever the prompts change so cached decks built from older prompts are not reused.
+PROMPT_VERSION = "1"
+# Identifies the models and routing threshold, so changing either invalidates cached decks.
+MODEL_VERSION = f"{MODEL_TIERS['fast']}<={FAST_MODEL_MAX_TOKENS}|{MODEL_TIERS['large']}"
+
+_async_semaphore: Optional[asyncio.Semaphore] = None
+_async_semaphore_loop = None
+
+_genai = None
+_genai_lock = threading.Lock()
+
+# Recent latency per model, for hedging; hedged sync calls run on their own small pool.
+gemini_latency = LatencyTracker()
+_hedge_pool = ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY, thread_name_prefix="slidemage-hedge")
+_hedge_pool_busy = 0
+_hedge_pool_lock = threading.Lock()
+
+def _get_genai():
+    """Import and configure google.generativeai on first use; the import alone takes about a second."""
+    global _genai
+    
+    with _genai_lock:
+        if _genai is None:
+            if not GEMINI_API_KEY:
+                raise ValueError("GEMINI_API_KEY environment variable is required")
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            _genai = genai
+    return _genai
+
+def _new_model(name: str):
+    return _get_genai().GenerativeModel(name)
+
+model_pool = ModelPool(_new_model)
+
+def choose_tier(tokens: int, tier: Optional[str] = None) -> str:
+    """Use the requested tier, else the fast model for short inputs and the large one for long documents."""
+    if tier is not None:
+        if tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier: {tier}")
+        return tier
+    return "fast" if tokens <= FAST_MODEL_MAX_TOKENS else "large"
+
+def get_model(text: str, tier: Optional[str] = None):
+    """The pooled client for the model that should summarize `text`."""
+    return model_pool.get(MODEL_TIERS[choose_tier(estimate_tokens(text), tier)])
+
+def _model_name(model) -> str:
+    return getattr(model, "model_name", "unknown")
+
+def warm_up():
+    """
+    Load the extractive summarizer, and the Gemini client and model clients if
+    a key is configured, ahead of the first request.
+    """
+    import agents.extractive_summarizer  # noqa: F401
+    if GEMINI_API_KEY:
+        for name in set(MODEL_TIERS.values()):
+            model_pool.get(name)
+
+def _generate(model, prompt: str, budget: Optional[float] = None, **kwargs):
+    """
+    Call the model within the shared rate limit, backing off on 429/503 responses.
+    
+    Each attempt times out after GEMINI_TIMEOUT_SECONDS, or sooner once
+    `budget` seconds have passed since the call, so an abandoned call never
+    holds its thread past its budget.
+    """
+    tokens = estimate_tokens(prompt)
+    start = time.perf_counter()
+    expires_at = time.monotonic() + budget if budget is not None else None
     
-    model = genai.GenerativeModel("models/gemini-2.5-pro")
+    def attempt():
+        timeout = GEMINI_TIMEOUT_SECONDS
+        if expires_at is not None:
+            timeout = min(timeout, expires_at - time.monotonic())
+            if timeout <= 0:
+                raise TimeoutError("No time left for a model call")
+        return model.generate_content(prompt, request_options={"timeout": timeout}, **kwargs)
     
-    prompt = f"""
+    try:
+        gemini_rate_limiter.acquire(tokens)
+        response = call_with_backoff(attempt)
+    except Exception:
+        observe_gemini_call("sync", _model_name(model), "error", time.perf_counter() - start, tokens)
+        raise
+    
+    duration = time.perf_counter() - start
+    gemini_latency.observe(_model_name(model), duration)
+    observe_gemini_call("sync", _model_name(model), "ok", duration, tokens, response)
+    return response
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    global _async_semaphore, _async_semaphore_loop
+    
+    loop = asyncio.get_running_loop()
+    if _async_semaphore is None or _async_semaphore_loop is not loop:
+        _async_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        _async_semaphore_loop = loop
+    return _async_semaphore
+
+async def _generate_async(model, prompt: str, timeout: Optional[float] = None, **kwargs):
+    """
+    Async counterpart of _generate.
+    
+    At most GEMINI_MAX_CONCURRENCY calls are in flight per event loop, and each
+    attempt is cancelled after `timeout` seconds. Cancelling the calling task
+    (e.g. because the client disconnected) cancels the request as well.
+    """
+    timeout = timeout or GEMINI_TIMEOUT_SECONDS
+    tokens = estimate_tokens(prompt)
+    start = time.perf_counter()
+    
+    try:
+        async with _get_async_semaphore():
+            await gemini_rate_limiter.acquire_async(tokens)
+            response = await call_with_backoff_async(
+                lambda: asyncio.wait_for(model.generate_content_async(prompt, **kwargs), timeout)
+            )
+    except asyncio.CancelledError:
+        observe_gemini_call("async", _model_name(model), "cancelled", time.perf_counter() - start, tokens)
+        raise
+    except Exception:
+        observe_gemini_call("async", _model_name(model), "error", time.perf_counter() - start, tokens)
+        raise
+    
+    duration = time.perf_counter() - start
+    gemini_latency.observe(_model_name(model), duration)
+    observe_gemini_call("async", _model_name(model), "ok", duration, tokens, response)
+    return response
+
+def _hedge_delay(model, budget: float) -> float:
+    # Hedge at the observed p95, but early enough that the second request has time to finish.
+    return min(gemini_latency.p95(_model_name(model)), budget / 2)
+
+def _submit_to_hedge_pool(model, prompt: str, budget: float, hedge: bool, **kwargs) -> Optional[Future]:
+    """Run _generate on the hedge pool; a hedge is only sent while one of its threads is free."""
+    global _hedge_pool_busy
+    
+    with _hedge_pool_lock:
+        if hedge and _hedge_pool_busy >= GEMINI_MAX_CONCURRENCY:
+            return None
+        _hedge_pool_busy += 1
+    
+    def release(_):
+        global _hedge_pool_busy
+        with _hedge_pool_lock:
+            _hedge_pool_busy -= 1
+    
+    call = _hedge_pool.submit(_generate, model, prompt, budget, **kwargs)
+    call.add_done_callback(release)
+    return call
+
+def _generate_hedged(model, prompt: str, budget: float, **kwargs):
+    """
+    _generate with a time budget.
+    
+    If no response arrives by the model's observed p95 latency and the hedge
+    pool has a free thread, a second, identical request is sent and whichever
+    succeeds first wins. Raises TimeoutError when neither answers within
+    `budget` seconds; the requests still in flight are abandoned, and time
+    out on their own once the budget is spent.
+    """
+    if budget <= 0:
+        raise TimeoutError("No time left for a model call")
+    
+    expires_at = time.monotonic() + budget
+    calls = [_submit_to_hedge_pool(model, prompt, budget, hedge=False, **kwargs)]
+    done, _ = wait(calls, timeout=_hedge_delay(model, budget))
+    if not done:
+        hedge = _submit_to_hedge_pool(model, prompt, max(0.0, expires_at - time.monotonic()), hedge=True, **kwargs)
+        if hedge is not None:
+            GEMINI_HEDGES.labels("sent").inc()
+            calls.append(hedge)
+        else:
+            GEMINI_HEDGES.labels("skipped").inc()
+    
+    error: Optional[BaseException] = None
+    pending = set(calls)
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, expires_at - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for call in done:
+            if call.exception() is None:
+                if len(calls) > 1:
+                    GEMINI_HEDGES.labels("hedge_won" if call is calls[1] else "primary_won").inc()
+                for other in pending:
+                    other.cancel()
+                return call.result()
+            error = call.exception()
+    
+    if error is not None and not pending:
+        raise error
+    GEMINI_HEDGES.labels("timed_out").inc()
+    raise TimeoutError(f"No model response within {budget:.1f}s")
+
+async def _generate_hedged_async(model, prompt: str, budget: float, **kwargs):
+    """Async counterpart of _generate_hedged; the losing or late requests are cancelled."""
+    if budget <= 0:
+        raise TimeoutError("No time left for a model call")
+    
+    expires_at = time.monotonic() + budget
+    calls = [asyncio.ensure_future(_generate_async(model, prompt, **kwargs))]
+    try:
+        done, _ = await asyncio.wait(calls, timeout=_hedge_delay(model, budget))
+        if not done:
+            GEMINI_HEDGES.labels("sent").inc()
+            calls.append(asyncio.ensure_future(_generate_async(model, prompt, **kwargs)))
+        
+        error: Optional[BaseException] = None
+        pending = set(calls)
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, expires_at - time.monotonic()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for call in done:
+                if call.exception() is None:
+                    if len(calls) > 1:
+                        GEMINI_HEDGES.labels("hedge_won" if call is calls[1] else "primary_won").inc()
+                    return call.result()
+                error = call.exception()
+        
+        if error is not None and not pending:
+            raise error
+        GEMINI_HEDGES.labels("timed_out").inc()
+        raise TimeoutError(f"No model response within {budget:.1f}s")
+    finally:
+        for call in calls:
+            if not call.done():
+                call.cancel()
+
+def _summary_prompt(text: str, max_bullets: int) -> str:
+    return f"""
     Create {max_bullets} concise bullet points from the following text for a presentation slide.
     Each bullet point should be:
     - Clear and informative
@@ -62,94 +313,423 @@ def summarize(text: str, max_bullets: int = 4) -> List[str]:
     Format: Return only the bullet points, one per line, without bullet symbols.
     """
 
+def _context_prompt(text: str, topic: str, max_bullets: int) -> str:
+    return f"""
+    Topic: {topic}
+    
+    Create {max_bullets} bullet points about "{topic}" from the following text.
+    Focus on the most important and relevant information related to {topic}.
+    
+    Text:
+    {text}
+    
+    Requirements:
+    - Each bullet should be 10-20 words
+    - Focus on facts, key concepts, or important details
+    - Make them presentation-ready
+    - Return only the bullet points, no formatting symbols
+    """
+
+def _question_prompt(question: str, passages: List[str]) -> str:
+    excerpts = "\n\n".join(f"[{i}] {passage}" for i, passage in enumerate(passages, 1))
+    return f"""
+    Answer the question using only the numbered excerpts from the document below.
+    Cite the excerpts you used by number, like [1]. If the excerpts do not contain
+    the answer, say that the document does not cover it.
+    
+    Excerpts:
+    {excerpts}
+    
+    Question: {question}
+    """
+
+def _deck_prompt(text: str, topic: str, slide_count: int, bullets_per_slide: int) -> str:
+    return f"""
+    Topic: {topic}
+    
+    Write a presentation of {slide_count} slides about "{topic}" using the following text.
+    Each slide needs:
+    - A short, specific title (at most 8 words, not just the topic name)
+    - {bullets_per_slide} bullet points of 10-20 words, presentation-ready and self-contained
+    - Speaker notes of 2-3 sentences expanding on the bullets
+    
+    Text:
+    {text}
+    
+    Return only JSON of this form, with no other text:
+    {{"slides": [{{"title": "...", "bullets": ["...", "..."], "notes": "..."}}]}}
+    """
+
+def _strip_code_fence(response_text: str) -> str:
+    text = response_text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return text
+
+def parse_deck(response_text: str, bullets_per_slide: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse a structured deck response into validated slides.
+    
+    The response must be `{"slides": [{"title": str, "bullets": [str, ...],
+    "notes": str}, ...]}` with at least one slide. Returns None when it is not
+    valid JSON or does not match that shape, so the caller can fall back.
+    """
+    if not response_text:
+        return None
+    
     try:
-        response = model.generate_content(prompt)
-        logger.info("AI summarization successful")
-        
-        time.sleep(1)
-        
-        if response.text:
-            bullets = [
-                line.strip().lstrip("•-* ").strip() 
-                for line in response.text.splitlines() 
-                if line.strip() and len(line.strip()) > 5
-            ]
-            
-            # Ensure we don't exceed max_bullets
-            bullets = bullets[:max_bullets] if bullets else [response.text.strip()]
-            
-            # Validate bullets aren't too long
-            processed_bullets = []
-            for bullet in bullets:
-                if len(bullet.split()) > 25:  # Too long, truncate
-                    words = bullet.split()[:20]
-                    bullet = " ".join(words) + "..."
-                processed_bullets.append(bullet)
-            
-            return processed_bullets if processed_bullets else ["Unable to generate summary"]
+        data = json.loads(_strip_code_fence(response_text))
+    except (TypeError, ValueError):
+        return None
+    
+    slides = data.get("slides") if isinstance(data, dict) else None
+    if not isinstance(slides, list) or not slides:
+        return None
+    
+    deck = []
+    for slide in slides:
+        if not isinstance(slide, dict) or not isinstance(slide.get("title"), str):
+            return None
+        bullets = slide.get("bullets")
+        notes = slide.get("notes", "")
+        if not isinstance(bullets, list) or not all(isinstance(b, str) for b in bullets) or not isinstance(notes, str):
+            return None
         
-        else:
-            logger.warning("Empty response from AI model")
-            return _fallback_summarize(text, max_bullets)
+        bullets = [b.strip().lstrip("•-* ").strip() for b in bullets if b.strip()][:bullets_per_slide]
+        if not bullets or not slide["title"].strip():
+            return None
+        deck.append(validate_slide_data({"title": slide["title"], "bullets": bullets, "notes": notes.strip()}))
+    
+    return deck
+
+def _split_bullets(response_text: str) -> List[str]:
+    return [
+        line.strip().lstrip("•-* ").strip()
+        for line in response_text.splitlines()
+        if line.strip() and len(line.strip()) > 5
+    ]
+
+def _process_summary(response, text: str, max_bullets: int) -> List[str]:
+    if not response.text:
+        logger.warning("Empty response from AI model")
+        return _fallback_summarize(text, max_bullets)
+    
+    bullets = _split_bullets(response.text)
+    
+    # Ensure we don't exceed max_bullets
+    bullets = bullets[:max_bullets] if bullets else [response.text.strip()]
+    
+    # Validate bullets aren't too long
+    processed_bullets = []
+    for bullet in bullets:
+        if len(bullet.split()) > 25:  # Too long, truncate
+            words = bullet.split()[:20]
+            bullet = " ".join(words) + "..."
+        processed_bullets.append(bullet)
+    
+    SUMMARIES.labels("model").inc()
+    return processed_bullets if processed_bullets else ["Unable to generate summary"]
+
+def _process_context_summary(response, text: str, max_bullets: int) -> List[str]:
+    if response.text:
+        bullets = _split_bullets(response.text)
+        if bullets:
+            SUMMARIES.labels("model").inc()
+            return bullets[:max_bullets]
+    
+    return _fallback_summarize(text, max_bullets)
+
+def summarize(text: str, max_bullets: int = 4, tier: Optional[str] = None) -> List[str]:
+   
+    if not text or not text.strip():
+        logger.warning("Empty text provided to summarize")
+        return ["No content available"]
+    
+    if not GEMINI_API_KEY:
+        return _fallback_summarize(text, max_bullets)
+    
+    model = get_model(text, tier)
+    prompt = _summary_prompt(text, max_bullets)
+
+    try:
+        response = _generate(model, prompt)
+        logger.info("AI summarization successful")
+        return _process_summary(response, text, max_bullets)
     
     except Exception as e:
         logger.error(f"⚠️ AI summarization failed: {str(e)}")
         return _fallback_summarize(text, max_bullets)
 
-def _fallback_summarize(text: str, max_bullets: int = 4) -> List[str]:
+async def summarize_async(text: str, max_bullets: int = 4, tier: Optional[str] = None) -> List[str]:
     
-    logger.info("Using fallback summarization method")
+    if not text or not text.strip():
+        logger.warning("Empty text provided to summarize")
+        return ["No content available"]
     
-    sentences = [
-        s.strip() 
-        for s in text.replace('!', '.').replace('?', '.').split('.')
-        if len(s.strip()) > 10
-    ]
+    if not GEMINI_API_KEY:
+        return _fallback_summarize(text, max_bullets)
     
-    bullets = sentences[:max_bullets]
+    model = get_model(text, tier)
+    prompt = _summary_prompt(text, max_bullets)
+    
+    try:
+        response = await _generate_async(model, prompt)
+        logger.info("AI summarization successful")
+        return _process_summary(response, text, max_bullets)
+    
+    except Exception as e:
+        logger.error(f"⚠️ AI summarization failed: {str(e)}")
+        return _fallback_summarize(text, max_bullets)
+
+def summarize_extractive(text: str, max_bullets: int = 4, topic: Optional[str] = None) -> List[str]:
+    """Summarize locally, without a model call; used offline or when the model is unavailable or out of time."""
+    return _fallback_summarize(text, max_bullets, topic)
+
+def _fallback_summarize(text: str, max_bullets: int = 4, topic: Optional[str] = None) -> List[str]:
+    
+    logger.info("Using fallback summarization method")
+    SUMMARIES.labels("fallback").inc()
+    
+    # Imported here so NumPy stays out of the startup path.
+    from agents.extractive_summarizer import extractive_summarize
+    bullets = extractive_summarize(text, max_bullets, topic)
     
     if not bullets:
         bullets = [text[:100] + "..." if len(text) > 100 else text]
     
     return bullets
 
-def summarize_with_context(text: str, topic: str, max_bullets: int = 4) -> List[str]:
-   
-    if not GEMINI_API_KEY:
-        return _fallback_summarize(text, max_bullets)
+def summarize_with_context(text: str, topic: str, max_bullets: int = 4,
+                           tier: Optional[str] = None, budget: Optional[float] = None,
+                           fallback: bool = True) -> List[str]:
+    """
+    Summarize `text` into bullets about `topic`.
     
-    model = genai.GenerativeModel("models/gemini-2.5-pro")
+    With `budget` (seconds) the call is hedged and abandoned once the budget
+    is spent. Failures fall back to the extractive summary, or raise when
+    `fallback` is False so the caller can tell a degraded summary apart.
+    """
+    if not GEMINI_API_KEY:
+        if not fallback:
+            raise ValueError("GEMINI_API_KEY environment variable is required")
+        return _fallback_summarize(text, max_bullets, topic)
     
-    prompt = f"""
-    Topic: {topic}
+    model = get_model(text, tier)
+    prompt = _context_prompt(text, topic, max_bullets)
     
-    Create {max_bullets} bullet points about "{topic}" from the following text.
-    Focus on the most important and relevant information related to {topic}.
+    try:
+        if budget is None:
+            response = _generate(model, prompt)
+        else:
+            response = _generate_hedged(model, prompt, budget)
+        logger.info(f"Contextual summarization successful for topic: {topic}")
+        return _process_context_summary(response, text, max_bullets)
+        
+    except Exception as e:
+        logger.error(f"Contextual summarization failed: {str(e)}")
+        if not fallback:
+            raise
     
-    Text:
-    {text}
+    return _fallback_summarize(text, max_bullets, topic)
+
+async def summarize_with_context_async(text: str, topic: str, max_bullets: int = 4,
+                                      tier: Optional[str] = None, budget: Optional[float] = None,
+                                      fallback: bool = True) -> List[str]:
+    """
+    Async counterpart of summarize_with_context.
     
-    Requirements:
-    - Each bullet should be 10-20 words
-    - Focus on facts, key concepts, or important details
-    - Make them presentation-ready
-    - Return only the bullet points, no formatting symbols
+    With `budget` (seconds) the call is hedged and abandoned once the budget
+    is spent. Failures fall back to the extractive summary, or raise when
+    `fallback` is False so the caller can tell a degraded summary apart.
     """
+    if not GEMINI_API_KEY:
+        if not fallback:
+            raise ValueError("GEMINI_API_KEY environment variable is required")
+        return _fallback_summarize(text, max_bullets, topic)
+    
+    model = get_model(text, tier)
+    prompt = _context_prompt(text, topic, max_bullets)
     
     try:
-        response = model.generate_content(prompt)
+        if budget is None:
+            response = await _generate_async(model, prompt)
+        else:
+            response = await _generate_hedged_async(model, prompt, budget)
         logger.info(f"Contextual summarization successful for topic: {topic}")
-        time.sleep(1)
-        
-        if response.text:
-            bullets = [
-                line.strip().lstrip("•-* ").strip()
-                for line in response.text.splitlines()
-                if line.strip() and len(line.strip()) > 5
-            ]
-            return bullets[:max_bullets] if bullets else _fallback_summarize(text, max_bullets)
+        return _process_context_summary(response, text, max_bullets)
         
     except Exception as e:
         logger.error(f"Contextual summarization failed: {str(e)}")
+        if not fallback:
+            raise
+    
+    return _fallback_summarize(text, max_bullets, topic)
+
+async def answer_question_async(question: str, passages: List[str], tier: Optional[str] = None) -> str:
+    """
+    Answer `question` from the retrieved `passages` only. Without a key, or if
+    the call fails, the answer is the passages' sentences most relevant to the question.
+    """
+    if GEMINI_API_KEY:
+        prompt = _question_prompt(question, passages)
+        try:
+            response = await _generate_async(get_model(prompt, tier), prompt)
+            if response.text and response.text.strip():
+                SUMMARIES.labels("model").inc()
+                return response.text.strip()
+        except Exception as e:
+            logger.error(f"Question answering failed: {str(e)}")
+    
+    sentences = _fallback_summarize("\n\n".join(passages), 3, question)
+    return " ".join(s if s.endswith(".") else s + "." for s in sentences)
+
+def _process_deck(response, bullets_per_slide: int) -> Optional[List[Dict[str, Any]]]:
+    try:
+        response_text = response.text
+    except Exception:
+        # .text raises when the response was blocked and has no parts.
+        response_text = ""
+    
+    deck = parse_deck(response_text or "", bullets_per_slide)
+    if deck is None:
+        logger.warning("Structured deck response did not match the schema")
+        return None
+    
+    SUMMARIES.labels("deck").inc()
+    return deck
+
+def summarize_deck(text: str, topic: str, max_bullets: int = 12, bullets_per_slide: int = 4,
+                   tier: Optional[str] = None, budget: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Ask the model for a whole deck (slide titles, bullets and speaker notes) as JSON in one call.
+    
+    Returns the validated slides, or None when there is no API key, the call
+    fails or the response does not parse; callers then fall back to
+    summarize_with_context and chunk the bullets themselves. With `budget`
+    (seconds) the call is hedged and given up once the budget is spent.
+    """
+    if not GEMINI_API_KEY or not text or not text.strip():
+        return None
+    
+    model = get_model(text, tier)
+    slide_count = max(1, -(-max_bullets // bullets_per_slide))
+    prompt = _deck_prompt(text, topic, slide_count, bullets_per_slide)
+    
+    try:
+        if budget is None:
+            response = _generate(model, prompt, generation_config=DECK_GENERATION_CONFIG)
+        else:
+            response = _generate_hedged(model, prompt, budget, generation_config=DECK_GENERATION_CONFIG)
+        logger.info(f"Structured deck generated for topic: {topic}")
+        return _process_deck(response, bullets_per_slide)
+    
+    except Exception as e:
+        logger.error(f"Structured deck generation failed: {str(e)}")
+        return None
+
+async def summarize_deck_async(text: str, topic: str, max_bullets: int = 12, bullets_per_slide: int = 4,
+                               tier: Optional[str] = None,
+                               budget: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """Async counterpart of summarize_deck."""
+    if not GEMINI_API_KEY or not text or not text.strip():
+        return None
+    
+    model = get_model(text, tier)
+    slide_count = max(1, -(-max_bullets // bullets_per_slide))
+    prompt = _deck_prompt(text, topic, slide_count, bullets_per_slide)
+    
+    try:
+        if budget is None:
+            response = await _generate_async(model, prompt, generation_config=DECK_GENERATION_CONFIG)
+        else:
+            response = await _generate_hedged_async(model, prompt, budget, generation_config=DECK_GENERATION_CONFIG)
+        logger.info(f"Structured deck generated for topic: {topic}")
+        return _process_deck(response, bullets_per_slide)
+    
+    except Exception as e:
+        logger.error(f"Structured deck generation failed: {str(e)}")
+        return None
+
+def _group_partials(partials: List[List[str]], token_budget: int) -> List[List[str]]:
+    """Pack partial bullet lists into groups whose combined text fits the token budget."""
+    groups = []
+    current: List[str] = []
+    current_tokens = 0
+    
+    for bullets in partials:
+        tokens = estimate_tokens("\n".join(bullets))
+        if current and current_tokens + tokens > token_budget:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current = current + bullets
+        current_tokens += tokens
+    
+    if current:
+        groups.append(current)
+    
+    # Always merge at least two partials per group so every level makes progress.
+    if len(groups) == len(partials) and len(groups) > 1:
+        groups = [sum(partials[i:i + 2], []) for i in range(0, len(partials), 2)]
+    
+    return groups
+
+def summarize_map_reduce(text: str, topic: str, max_bullets: int = 12, token_budget: Optional[int] = None,
+                         on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         tier: Optional[str] = None) -> List[str]:
+    """
+    Summarize long text by summarizing chunks in parallel and reducing the results.
+    
+    The text is split with chunk_text into pieces of about `token_budget`
+    tokens, each piece is summarized concurrently (map), and the partial bullet
+    lists are merged level by level until they fit in one prompt, which yields
+    the final `max_bullets` bullets (reduce). Text that fits in a single prompt
+    goes straight to summarize_with_context. `on_chunk` receives the latency
+    of every map and reduce call. The model tier is chosen once from the size
+    of the whole document, so every call for a long document uses the large model.
+    """
+    token_budget = token_budget or MAP_REDUCE_TOKEN_BUDGET
+    chunks = chunk_text(text, max_chunk_size=token_budget * CHARS_PER_TOKEN)
+    return summarize_chunks(chunks, topic, max_bullets, token_budget, on_chunk, tier)
+
+def summarize_chunks(chunks: List[str], topic: str, max_bullets: int = 12, token_budget: Optional[int] = None,
+                     on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     tier: Optional[str] = None) -> List[str]:
+    """
+    The map-reduce of summarize_map_reduce over text that is already split,
+    e.g. streamed from a document: each chunk (of at most about
+    `token_budget` tokens) is one map call, so the whole text is never
+    joined into a single string.
+    """
+    token_budget = token_budget or MAP_REDUCE_TOKEN_BUDGET
+    chunks = [chunk for chunk in chunks if chunk and chunk.strip()]
+    tier = choose_tier(sum(estimate_tokens(chunk) for chunk in chunks), tier)
+    
+    if len(chunks) <= 1:
+        return summarize_with_context(chunks[0] if chunks else "", topic, max_bullets, tier)
+    
+    logger.info(f"Map-reduce summarization of {len(chunks)} chunks for topic: {topic}")
+    
+    def summarize_part(phase: str, index: int, total: int, part: str) -> List[str]:
+        start = time.perf_counter()
+        bullets = summarize_with_context(part, topic, max_bullets=MAP_BULLETS_PER_CHUNK, tier=tier)
+        latency = time.perf_counter() - start
+        logger.info(f"{phase.capitalize()} {index + 1}/{total} summarized in {latency:.2f}s")
+        if on_chunk is not None:
+            on_chunk({"phase": phase, "index": index, "total": total, "latency": latency, "chars": len(part)})
+        return bullets
+    
+    with ThreadPoolExecutor(max_workers=min(len(chunks), MAP_REDUCE_MAX_WORKERS)) as pool:
+        partials = list(pool.map(
+            lambda item: summarize_part("map", item[0], len(chunks), item[1]),
+            enumerate(chunks)
+        ))
+        
+        while estimate_tokens("\n".join(sum(partials, []))) > token_budget and len(partials) > 1:
+            groups = _group_partials(partials, token_budget)
+            partials = list(pool.map(
+                lambda item: summarize_part("reduce", item[0], len(groups), "\n".join(item[1])),
+                enumerate(groups)
+            ))
     
-    return _fallback_summarize(text, max_bullets)
\ No newline at end of file
+    return summarize_with_context("\n".join(sum(partials, [])), topic, max_bullets, tier)
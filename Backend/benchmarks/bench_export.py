@@ -0,0 +1,116 @@
+"""
+Export benchmark: theme-level styling vs the old per-run formatting.
+
+Run from the Backend directory:
+
+    python -m benchmarks.bench_export [--sizes 10,100,300] [--repeat 3]
+"""
+import argparse
+import time
+from io import BytesIO
+from typing import Any, Dict, List
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+
+from agents.export_agent import export_to_bytes
+
+
+def make_slides(count: int, bullets_per_slide: int = 4) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": f"Benchmark Topic - Part {i + 1}",
+            "bullets": [f"Bullet {j + 1} of slide {i + 1} with a realistic amount of text in it"
+                        for j in range(bullets_per_slide)],
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_export_to_bytes(slides: List[Dict[str, Any]]) -> bytes:
+    """The exporter as it was before theme styling: fonts set run by run on every slide."""
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = slides[0]["title"]
+    paragraph = title_slide.shapes.title.text_frame.paragraphs[0]
+    paragraph.alignment = PP_ALIGN.CENTER
+    run = paragraph.runs[0]
+    run.font.name = 'Calibri'
+    run.font.size = Pt(44)
+    run.font.bold = True
+    run.font.color.rgb = RGBColor(31, 73, 125)
+
+    subtitle = title_slide.placeholders[1]
+    subtitle.text = "AI-Generated Presentation"
+    paragraph = subtitle.text_frame.paragraphs[0]
+    paragraph.alignment = PP_ALIGN.CENTER
+    run = paragraph.runs[0]
+    run.font.name = 'Calibri'
+    run.font.size = Pt(24)
+    run.font.color.rgb = RGBColor(89, 89, 89)
+
+    for slide_data in slides:
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        title = slide.shapes.title
+        title.text = slide_data["title"]
+        title.text_frame.margin_bottom = Inches(0.1)
+        run = title.text_frame.paragraphs[0].runs[0]
+        run.font.name = 'Calibri'
+        run.font.size = Pt(32)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(31, 73, 125)
+
+        text_frame = slide.placeholders[1].text_frame
+        text_frame.clear()
+        for i, bullet_text in enumerate(slide_data["bullets"]):
+            p = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+            p.text = bullet_text
+            p.level = 0
+            run = p.runs[0]
+            run.font.name = 'Calibri'
+            run.font.size = Pt(20)
+            run.font.color.rgb = RGBColor(64, 64, 64)
+
+        text_frame.margin_left = Inches(0.2)
+        text_frame.margin_right = Inches(0.2)
+        text_frame.margin_top = Inches(0.1)
+        text_frame.margin_bottom = Inches(0.1)
+
+    buffer = BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def time_export(export, slides: List[Dict[str, Any]], repeat: int):
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = export(slides)
+        best = min(best, time.perf_counter() - started)
+        size = len(data)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,300", help="comma-separated slide counts")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the best time is reported")
+    args = parser.parse_args()
+
+    print(f"{'slides':>7} {'per-run s':>10} {'theme s':>10} {'speedup':>8} {'per-run KB':>11} {'theme KB':>9}")
+    for count in (int(n) for n in args.sizes.split(",")):
+        slides = make_slides(count)
+        legacy_time, legacy_size = time_export(legacy_export_to_bytes, slides, args.repeat)
+        theme_time, theme_size = time_export(export_to_bytes, slides, args.repeat)
+        print(f"{count:>7} {legacy_time:>10.3f} {theme_time:>10.3f} {legacy_time / theme_time:>7.2f}x "
+              f"{legacy_size / 1024:>11.1f} {theme_size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Export benchmark: python-pptx object model vs the direct OOXML writer.
+
+Run from the Backend directory:
+
+    python -m benchmarks.bench_ooxml [--sizes 100,300,1000] [--repeat 2]
+
+Reports the best wall time and the peak traced memory of each exporter.
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+
+from agents.export_agent import export_to_bytes
+from agents.ooxml_export import export_to_bytes_fast
+from benchmarks.bench_export import make_slides
+
+
+def measure(export, slides, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = export(slides)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    export(slides)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,300,1000", help="comma-separated slide counts")
+    parser.add_argument("--repeat", type=int, default=2, help="runs per size; the best time is reported")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    # Load the template once so neither exporter pays for it inside the timings.
+    export_to_bytes_fast(make_slides(1))
+
+    print(f"{'slides':>7} {'pptx s':>8} {'ooxml s':>8} {'speedup':>8} {'pptx peak MB':>13} {'ooxml peak MB':>14} "
+          f"{'pptx KB':>8} {'ooxml KB':>9}")
+    for count in (int(n) for n in args.sizes.split(",")):
+        slides = make_slides(count)
+        pptx_time, pptx_peak, pptx_size = measure(export_to_bytes, slides, args.repeat)
+        ooxml_time, ooxml_peak, ooxml_size = measure(export_to_bytes_fast, slides, args.repeat)
+        print(f"{count:>7} {pptx_time:>8.3f} {ooxml_time:>8.3f} {pptx_time / ooxml_time:>7.1f}x "
+              f"{pptx_peak / 2 ** 20:>13.1f} {ooxml_peak / 2 ** 20:>14.1f} "
+              f"{pptx_size / 1024:>8.1f} {ooxml_size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Check that importing the backend stays within its cold-start budget.
+
+    python -m benchmarks.import_time [--budget-ms 1000] [--runs 3] [--top 15]
+
+`import main` is timed with `python -X importtime` in a fresh interpreter
+(without GEMINI_API_KEY, so a missing key must not break startup). The
+check fails when the fastest run exceeds the budget or when one of the
+lazily loaded dependencies is imported eagerly again. tests/test_import_time.py
+runs the same check under pytest.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = float(os.getenv("SLIDEMAGE_IMPORT_BUDGET_MS", "1000"))
+
+# Loaded on first use or by the background warm-up, never by `import main`.
+LAZY_MODULES = ("google.generativeai", "requests", "pptx", "PyPDF2", "docx", "numpy")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime_available() -> bool:
+    """Whether this interpreter reports import times with `-X importtime` (CPython 3.7+ does)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import json"],
+                            capture_output=True, text=True)
+    return result.returncode == 0 and any(_LINE.match(line) for line in result.stderr.splitlines())
+
+
+def measure(module: str = "main") -> Tuple[float, Dict[str, float]]:
+    """Import `module` in a new interpreter; return its cumulative time and each module's own time, in ms."""
+    env = dict(os.environ)
+    env.pop("GEMINI_API_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    total = 0.0
+    self_times: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, name = match.groups()
+        self_times[name] = int(self_us) / 1000
+        if name == module:
+            total = int(cumulative_us) / 1000
+    return total, self_times
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="the fastest run is compared against the budget")
+    parser.add_argument("--top", type=int, default=15, help="print the slowest modules of the fastest run")
+    args = parser.parse_args(argv)
+
+    runs = [measure() for _ in range(max(1, args.runs))]
+    total, self_times = min(runs, key=lambda run: run[0])
+
+    print(f"import main: {total:.0f} ms (budget {args.budget_ms:.0f} ms, "
+          f"runs: {', '.join(f'{t:.0f}' for t, _ in runs)})")
+    for name, ms in sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in self_times]
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if total > args.budget_ms:
+        print(f"FAIL: import main took {total:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
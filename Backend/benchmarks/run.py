@@ -0,0 +1,193 @@
+"""
+Offline benchmark suite.
+
+Run from the Backend directory:
+
+    python -m benchmarks.run                      # run everything, save results
+    python -m benchmarks.run -k export            # only benchmarks whose name contains "export"
+    python -m benchmarks.run --compare latest     # compare against the last saved run
+
+Wikipedia and Gemini are replaced by the deterministic fakes in
+benchmarks/stubs.py. Each run is stored as JSON in benchmarks/results/ so
+later runs can be compared with it; --compare exits with status 1 when a
+benchmark's median got slower than --threshold times the baseline.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.stubs import install_stubs, fake_article
+from benchmarks.bench_export import make_slides
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class Benchmark:
+    """A named case run once per parameter; `setup(param)` returns the callable to time."""
+
+    def __init__(self, name: str, params: List[Any], setup: Callable[[Any], Callable[[], Any]]):
+        self.name = name
+        self.params = params
+        self.setup = setup
+
+
+def _chunk_text(size: int):
+    from utils.helpers import chunk_text
+    text = fake_article("chunk_text", paragraphs=size // 600 + 1)[:size]
+    return lambda: chunk_text(text)
+
+
+def _chunk_bullets(count: int):
+    from utils.helpers import chunk_bullets
+    bullets = [f"Bullet number {n} with some words in it" for n in range(count)]
+    return lambda: chunk_bullets(bullets, bullets_per_slide=4)
+
+
+def _validate_slide_data(count: int):
+    from utils.helpers import validate_slide_data
+    slides = make_slides(count)
+    return lambda: [validate_slide_data(slide) for slide in slides]
+
+
+def _export_pptx(count: int):
+    from agents.export_agent import export_to_bytes
+    slides = make_slides(count)
+    return lambda: export_to_bytes(slides)
+
+
+def _export_ooxml(count: int):
+    from agents.ooxml_export import export_to_bytes_fast
+    slides = make_slides(count)
+    return lambda: export_to_bytes_fast(slides)
+
+
+def _build_workflow(bullets_per_slide: int):
+    from workflows.slide_workflow import build_workflow
+    return lambda: build_workflow("Benchmark topic", bullets_per_slide, in_memory=True, use_cache=False)
+
+
+def _build_workflow_from_text(size: int):
+    from workflows.slide_workflow import build_workflow_from_text
+    text = fake_article("build_workflow_from_text", paragraphs=size // 600 + 1)[:size]
+    return lambda: build_workflow_from_text(text, "Benchmark text", 1, in_memory=True)
+
+
+BENCHMARKS = [
+    Benchmark("helpers.chunk_text", [10_000, 100_000], _chunk_text),
+    Benchmark("helpers.chunk_bullets", [100, 1000], _chunk_bullets),
+    Benchmark("helpers.validate_slide_data", [100, 1000], _validate_slide_data),
+    Benchmark("export.pptx", [10, 100, 300], _export_pptx),
+    Benchmark("export.ooxml", [10, 100, 300, 1000], _export_ooxml),
+    Benchmark("workflow.build_workflow", [1, 4], _build_workflow),
+    Benchmark("workflow.build_workflow_from_text", [20_000, 200_000], _build_workflow_from_text),
+]
+
+
+def time_case(fn: Callable[[], Any], min_time: float, max_rounds: int) -> Dict[str, float]:
+    fn()  # warm-up: imports, template loading, caches
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_rounds and (len(samples) < 3 or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+
+    return {
+        "rounds": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if path == "latest":
+        runs = sorted(f for f in os.listdir(RESULTS_DIR) if f.endswith(".json")) if os.path.isdir(RESULTS_DIR) else []
+        if not runs:
+            return None
+        path = os.path.join(RESULTS_DIR, runs[-1])
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to spend on each case")
+    parser.add_argument("--max-rounds", type=int, default=50, help="upper bound on timed rounds per case")
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="simulated seconds per Gemini call")
+    parser.add_argument("--compare", metavar="RESULT", help="baseline JSON file, or 'latest'")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    parser.add_argument("--no-save", action="store_true", help="do not write this run to benchmarks/results")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    install_stubs(gemini_latency=args.gemini_latency)
+
+    # Read the baseline before this run is saved, so 'latest' means the previous run.
+    baseline = _load_baseline(args.compare) if args.compare else None
+    if args.compare and baseline is None:
+        print(f"No baseline found for {args.compare}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    print(f"{'benchmark':<48} {'median ms':>10} {'min ms':>9} {'rounds':>7} {'vs base':>8}")
+
+    for benchmark in BENCHMARKS:
+        if args.filter not in benchmark.name:
+            continue
+        for param in benchmark.params:
+            name = f"{benchmark.name}[{param}]"
+            stats = time_case(benchmark.setup(param), args.min_time, args.max_rounds)
+            results[name] = stats
+
+            ratio = ""
+            base = (baseline or {}).get("benchmarks", {}).get(name)
+            if base:
+                change = stats["median"] / base["median"]
+                ratio = f"{change:.2f}x"
+                if change > args.threshold:
+                    regressions.append((name, change))
+            print(f"{name:<48} {stats['median'] * 1000:>10.2f} {stats['min'] * 1000:>9.2f} "
+                  f"{stats['rounds']:>7} {ratio:>8}")
+
+    if not args.no_save and results:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = _git_commit()
+        run = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "gemini_latency": args.gemini_latency,
+            "benchmarks": results,
+        }
+        path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved results to {path}")
+
+    for name, change in regressions:
+        print(f"REGRESSION {name}: {change:.2f}x slower than baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
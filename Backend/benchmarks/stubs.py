@@ -0,0 +1,126 @@
+"""
+Deterministic offline stand-ins for Wikipedia and Gemini.
+
+install_stubs() must run before the workflow modules are used; it patches the
+research functions and the Gemini model class in place, so benchmarks never
+touch the network and always see the same text for the same input.
+"""
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+from typing import Dict, List
+
+WORDS = (
+    "system history network energy river culture language economy theory model "
+    "process structure population region research method policy market science "
+    "development industry island climate species community government technology "
+    "education infrastructure tradition architecture agriculture trade knowledge"
+).split()
+
+
+def _rng(seed: str) -> random.Random:
+    return random.Random(int(hashlib.sha256(seed.encode("utf-8")).hexdigest()[:16], 16))
+
+
+def fake_sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def fake_article(topic: str, paragraphs: int = 8, sentences: int = 6) -> str:
+    """A Wikipedia-sized article about `topic`; the same topic always gives the same text."""
+    rng = _rng(topic)
+    return "\n\n".join(
+        " ".join(fake_sentence(rng) for _ in range(sentences)) for _ in range(paragraphs)
+    )
+
+
+def fake_research(topic: str) -> str:
+    return fake_article(topic)
+
+
+def fake_research_many(topics: List[str]) -> Dict[str, str]:
+    return {topic: fake_research(topic) for topic in topics}
+
+
+def fake_fetch_wikipedia_summary(topic: str, language: str = "en") -> str:
+    return fake_article(f"{language}:{topic}", paragraphs=1)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    Answers prompts with the requested number of bullet lines after `latency` seconds,
+    or with a JSON deck of the requested size when the call asks for JSON output.
+    """
+
+    latency = 0.0
+
+    def __init__(self, model_name: str = "", **kwargs):
+        self.model_name = model_name
+
+    def _answer(self, prompt: str, generation_config=None) -> FakeResponse:
+        if (generation_config or {}).get("response_mime_type") == "application/json":
+            return self._answer_deck(prompt)
+        match = re.search(r"Create (\d+)", prompt)
+        count = int(match.group(1)) if match else 4
+        rng = _rng(prompt)
+        return FakeResponse("\n".join(fake_sentence(rng, words=rng.randint(10, 18)) for _ in range(count)))
+
+    def _answer_deck(self, prompt: str) -> FakeResponse:
+        slides = re.search(r"presentation of (\d+) slides", prompt)
+        bullets = re.search(r"- (\d+) bullet points", prompt)
+        rng = _rng(prompt)
+        deck = {"slides": [
+            {
+                "title": fake_sentence(rng, words=rng.randint(3, 6)).rstrip("."),
+                "bullets": [fake_sentence(rng, words=rng.randint(10, 18))
+                            for _ in range(int(bullets.group(1)) if bullets else 4)],
+                "notes": " ".join(fake_sentence(rng) for _ in range(2)),
+            }
+            for _ in range(int(slides.group(1)) if slides else 3)
+        ]}
+        return FakeResponse(json.dumps(deck))
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs) -> FakeResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._answer(prompt, generation_config)
+
+    async def generate_content_async(self, prompt: str, generation_config=None, **kwargs) -> FakeResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._answer(prompt, generation_config)
+
+
+def install_stubs(gemini_latency: float = 0.0):
+    """Route research, Wikipedia summaries and Gemini calls to the fakes above."""
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark-offline")
+
+    from agents import research_agent, summarizer_agent
+    from connectors import wikipedia_connector
+    from workflows import slide_workflow
+    from utils.rate_limiter import gemini_rate_limiter
+
+    FakeGeminiModel.latency = gemini_latency
+    summarizer_agent.model_pool.factory = FakeGeminiModel
+    summarizer_agent.model_pool.clear()
+
+    research_agent.research = fake_research
+    research_agent.research_many = fake_research_many
+    slide_workflow.research = fake_research
+    wikipedia_connector.fetch_wikipedia_summary = fake_fetch_wikipedia_summary
+
+    # The fakes have no quota, so the limiter should never be what is measured.
+    gemini_rate_limiter.requests_per_minute = 1e9
+    gemini_rate_limiter.tokens_per_minute = 1e12
+    gemini_rate_limiter.state_path = None
+    gemini_rate_limiter._state = {"requests": 1e9, "tokens": 1e12, "updated": time.time()}
+
@@ -0,0 +1,135 @@
+import os
+import threading
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+from utils.helpers import chunk_text
+
+logger = logging.getLogger(__name__)
+
+MAX_DOCUMENT_CHARS = int(os.getenv("SLIDEMAGE_MAX_DOCUMENT_CHARS", "200000"))
+TEXT_BLOCK_CHARS = 4000
+
+PDF_TYPES = {"application/pdf"}
+DOCX_TYPES = {"application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+TEXT_TYPES = {"text/plain"}
+
+
+class ExtractionCancelled(Exception):
+    """Raised when document extraction is stopped through its cancel event."""
+
+
+def _document_kind(path: str, content_type: Optional[str]) -> str:
+    if content_type in PDF_TYPES:
+        return "pdf"
+    if content_type in DOCX_TYPES:
+        return "docx"
+    if content_type in TEXT_TYPES:
+        return "txt"
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".pdf", ".docx", ".txt"):
+        return extension[1:]
+
+    raise ValueError(f"Unsupported document type: {content_type or extension}")
+
+
+def _iter_pdf(path: str) -> Iterator[str]:
+    from PyPDF2 import PdfReader
+
+    # PdfReader parses pages lazily from the open file, one page at a time.
+    reader = PdfReader(path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _iter_docx(path: str) -> Iterator[str]:
+    import docx
+
+    document = docx.Document(path)
+    for paragraph in document.paragraphs:
+        yield paragraph.text
+
+
+def _iter_txt(path: str) -> Iterator[str]:
+    # Yield blank-line separated paragraphs, splitting very long ones into blocks.
+    block = []
+    size = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                if block:
+                    yield "".join(block)
+                    block, size = [], 0
+                continue
+            block.append(line)
+            size += len(line)
+            if size >= TEXT_BLOCK_CHARS:
+                yield "".join(block)
+                block, size = [], 0
+    if block:
+        yield "".join(block)
+
+
+def iter_document_text(path: str, content_type: Optional[str] = None,
+                       cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+    """
+    Yield the text of a PDF, DOCX or TXT file piece by piece (page, paragraph or block).
+
+    Only the current piece is held in memory. Setting `cancel_event` stops the
+    extraction with ExtractionCancelled at the next piece.
+    """
+    kind = _document_kind(path, content_type)
+    readers = {"pdf": _iter_pdf, "docx": _iter_docx, "txt": _iter_txt}
+
+    for piece in readers[kind](path):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExtractionCancelled(f"Extraction of {os.path.basename(path)} was cancelled")
+        if piece and piece.strip():
+            yield piece.strip()
+
+
+def iter_text_chunks(path: str, content_type: Optional[str] = None, max_chunk_size: int = 1000,
+                     cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+    """Stream a document through chunk_text, yielding chunks as soon as they are complete."""
+    pending = ""
+
+    for piece in iter_document_text(path, content_type, cancel_event):
+        pending = f"{pending}\n\n{piece}" if pending else piece
+        if len(pending) < max_chunk_size * 4:
+            continue
+
+        chunks = chunk_text(pending, max_chunk_size=max_chunk_size)
+        # The last chunk may continue in the next piece, so carry it over.
+        for chunk in chunks[:-1]:
+            yield chunk
+        pending = chunks[-1]
+
+    if pending:
+        for chunk in chunk_text(pending, max_chunk_size=max_chunk_size):
+            if chunk.strip():
+                yield chunk
+
+
+def read_document_chunks(path: str, content_type: Optional[str] = None, max_chars: int = MAX_DOCUMENT_CHARS,
+                         max_chunk_size: int = 1000,
+                         cancel_event: Optional[threading.Event] = None) -> Tuple[List[str], bool]:
+    """
+    Collect chunks from the start of a document until `max_chars` characters
+    have been read. Returns the chunks and whether text was left unread.
+    """
+    chunks = []
+    total = 0
+    truncated = False
+
+    for chunk in iter_text_chunks(path, content_type, max_chunk_size, cancel_event):
+        # Reading one chunk past the limit tells a truncated document from one that fits exactly.
+        if total >= max_chars:
+            truncated = True
+            logger.info(f"Document truncated to the first {total} characters")
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+
+    logger.info(f"Extracted {len(chunks)} chunks ({total} characters) from {os.path.basename(path)}")
+    return chunks, truncated
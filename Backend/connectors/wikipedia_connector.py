@@ -1,13 +1,181 @@
-import wikipediaapi
-
-def fetch_wikipedia_summary(topic: str) ->str:
-    wiki = wikipediaapi.Wikipedia(
-      user_agent="SlideMage/1.0 (https://github.com/RominaFdo/slidemage)", 
-        language="en"  
-    )
-    page = wiki.page(topic)
-
-    if not page.exists():
-        return "No page found for this topic."
-    
-    return page.summary
\ No newline at end of file
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.research_cache import research_cache, STATUS_FOUND, STATUS_MISSING, STATUS_DISAMBIGUATION
+
+logger = logging.getLogger(__name__)
+
+# MediaWiki API endpoint; "{language}" is filled in per client.
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://{language}.wikipedia.org/w/api.php")
+WIKIPEDIA_LANGUAGE = os.getenv("WIKIPEDIA_LANGUAGE", "en")
+WIKIPEDIA_TIMEOUT_SECONDS = float(os.getenv("SLIDEMAGE_WIKIPEDIA_TIMEOUT_SECONDS", "10"))
+WIKIPEDIA_POOL_SIZE = int(os.getenv("SLIDEMAGE_WIKIPEDIA_POOL_SIZE", "16"))
+USER_AGENT = "SlideMage/1.0 (https://github.com/RominaFdo/slidemage)"
+# TextExtracts returns at most 20 intro extracts per request.
+MAX_TITLES_PER_REQUEST = 20
+
+CACHE_SOURCE = "wikipedia-intro"
+NO_PAGE = "No page found for this topic."
+
+# (status, resolved title, extract) for one requested title.
+PageResult = Tuple[str, str, str]
+
+
+class WikipediaClient:
+    """
+    One MediaWiki API client per language over a pooled keep-alive session.
+
+    Extracts are fetched for up to MAX_TITLES_PER_REQUEST titles per request,
+    with redirects followed and disambiguation pages flagged in the same
+    round trip. Titles with no page fall back to a search for the closest one.
+    """
+
+    def __init__(self, language: str = WIKIPEDIA_LANGUAGE, api_url: str = WIKIPEDIA_API_URL,
+                 timeout: float = WIKIPEDIA_TIMEOUT_SECONDS, pool_size: int = WIKIPEDIA_POOL_SIZE):
+        # requests is imported here so importing this module stays cheap.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.language = language
+        self.api_url = api_url.format(language=language)
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "titles": 0}
+
+    def _get(self, params: Dict[str, str]) -> dict:
+        with self._lock:
+            self._counters["requests"] += 1
+        response = self.session.get(
+            self.api_url, params={"action": "query", "format": "json", "formatversion": "2", **params},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if "error" in payload:
+            raise RuntimeError(f"MediaWiki API error: {payload['error'].get('info', payload['error'])}")
+        return payload
+
+    def extracts(self, titles: Iterable[str], sentences: Optional[int] = None) -> Dict[str, PageResult]:
+        """
+        Intro extracts for `titles`, limited to `sentences` sentences if given.
+        Every requested title maps to (status, resolved title, extract).
+        """
+        titles = list(dict.fromkeys(titles))
+        # "|" separates titles in the request and cannot appear in one.
+        results: Dict[str, PageResult] = {t: (STATUS_MISSING, t, "") for t in titles if not t.strip() or "|" in t}
+        titles = [t for t in titles if t not in results]
+        for start in range(0, len(titles), MAX_TITLES_PER_REQUEST):
+            batch = titles[start:start + MAX_TITLES_PER_REQUEST]
+            params = {"prop": "extracts|pageprops", "ppprop": "disambiguation", "exintro": "1",
+                      "explaintext": "1", "exlimit": "max", "redirects": "1", "titles": "|".join(batch)}
+            if sentences:
+                params["exsentences"] = str(sentences)
+            results.update(self._parse_extracts(batch, self._get(params)))
+        with self._lock:
+            self._counters["titles"] += len(titles)
+        return results
+
+    @staticmethod
+    def _parse_extracts(titles: List[str], payload: dict) -> Dict[str, PageResult]:
+        query = payload.get("query", {})
+        # Follow title normalization ("machine learning" -> "Machine learning"), then redirects.
+        renamed = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        redirects = {item["from"]: item["to"] for item in query.get("redirects", [])}
+        pages = {page["title"]: page for page in query.get("pages", [])}
+
+        results: Dict[str, PageResult] = {}
+        for title in titles:
+            resolved = renamed.get(title, title)
+            resolved = redirects.get(resolved, resolved)
+            page = pages.get(resolved)
+            if page is None or page.get("missing") or page.get("invalid") or not page.get("extract"):
+                results[title] = (STATUS_MISSING, resolved, "")
+            elif "disambiguation" in page.get("pageprops", {}):
+                results[title] = (STATUS_DISAMBIGUATION, resolved, page["extract"])
+            else:
+                results[title] = (STATUS_FOUND, resolved, page["extract"])
+        return results
+
+    def search(self, query: str) -> Optional[str]:
+        """Title of the best search hit for `query`, if any."""
+        hits = self._get({"list": "search", "srsearch": query, "srlimit": "1", "srprop": ""})
+        hits = hits.get("query", {}).get("search", [])
+        return hits[0]["title"] if hits else None
+
+    def summaries(self, topics: Iterable[str], sentences: Optional[int] = None) -> Dict[str, PageResult]:
+        """
+        Like extracts, but topics without a page of their own are searched for
+        and the top hit's extract is used instead (one search per such topic,
+        run concurrently over the pooled session, then a single batched
+        extract request for all of them).
+        """
+        results = self.extracts(topics, sentences)
+        missing = [topic for topic, (status, _, _) in results.items() if status == STATUS_MISSING and topic.strip()]
+        suggestions = {}
+        if missing:
+            # The search API takes one query per request, so searches cannot be batched like extracts.
+            with ThreadPoolExecutor(max_workers=min(len(missing), self.pool_size),
+                                    thread_name_prefix="slidemage-wikipedia") as pool:
+                hits = list(pool.map(self.search, missing))
+            suggestions = {topic: hit for topic, hit in zip(missing, hits) if hit}
+
+        if suggestions:
+            found = self.extracts(suggestions.values(), sentences)
+            for topic, suggestion in suggestions.items():
+                results[topic] = found[suggestion]
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+_clients: Dict[str, WikipediaClient] = {}
+_clients_lock = threading.Lock()
+
+def get_client(language: str = WIKIPEDIA_LANGUAGE) -> WikipediaClient:
+    with _clients_lock:
+        client = _clients.get(language)
+        if client is None:
+            client = _clients[language] = WikipediaClient(language)
+        return client
+
+def fetch_summaries(topics: Iterable[str], language: str = WIKIPEDIA_LANGUAGE, sentences: Optional[int] = None,
+                    cache_source: str = CACHE_SOURCE) -> Dict[str, Tuple[str, str]]:
+    """
+    (status, content) for each topic, from the research cache where possible
+    and otherwise from batched API requests. Results, including missing and
+    disambiguation pages, are cached; network and API errors propagate and
+    are not cached.
+    """
+    results: Dict[str, Tuple[str, str]] = {}
+    uncached = []
+    for topic in dict.fromkeys(topics):
+        cached = research_cache.get(cache_source, language, topic)
+        if cached is not None:
+            results[topic] = cached
+        else:
+            uncached.append(topic)
+
+    if uncached:
+        for topic, (status, title, extract) in get_client(language).summaries(uncached, sentences).items():
+            research_cache.put(cache_source, language, topic, status, extract)
+            results[topic] = (status, extract)
+        logger.info(f"Fetched {len(uncached)} Wikipedia summaries ({len(results) - len(uncached)} cached)")
+    return results
+
+def fetch_wikipedia_summary(topic: str, language: str = WIKIPEDIA_LANGUAGE) -> str:
+    status, content = fetch_summaries([topic], language)[topic]
+    return content if status == STATUS_FOUND else NO_PAGE
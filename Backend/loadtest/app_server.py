@@ -0,0 +1,116 @@
+"""
+Run the SlideMage API against the fake backends.
+
+    python -m loadtest.app_server --port 8765 --wikipedia-url http://127.0.0.1:9001 \
+        --gemini-url http://127.0.0.1:9002
+
+The Wikipedia connector is pointed at the fake MediaWiki API, and Gemini
+models are replaced by a small HTTP client for the fake Gemini REST API, so
+every request still pays real network round trips and server latency.
+"""
+import os
+import json
+import asyncio
+import argparse
+import threading
+from typing import Any, Dict, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+
+class _Response:
+    def __init__(self, payload: Dict[str, Any]):
+        self.text = "".join(
+            part.get("text", "")
+            for candidate in payload.get("candidates", [])[:1]
+            for part in candidate.get("content", {}).get("parts", [])
+        )
+        self.usage_metadata = payload.get("usageMetadata", {})
+
+
+def _raise_for_status(status: int, body: bytes):
+    if status < 400:
+        return
+    from google.api_core import exceptions
+    # Same exception classes as the real client, so the retry logic sees 429/503 as retryable.
+    raise exceptions.from_http_status(status, body.decode("utf-8", "replace"))
+
+
+class HttpGeminiModel:
+    """Just enough of genai.GenerativeModel to call the fake Gemini server over HTTP."""
+
+    base_url = ""
+    _local = threading.local()
+
+    def __init__(self, model_name: str = "models/gemini", **kwargs):
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+
+    def _path(self) -> str:
+        return f"/v1beta/{self.model_name}:generateContent"
+
+    @staticmethod
+    def _body(prompt: str, generation_config=None) -> bytes:
+        request = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config and "response_mime_type" in generation_config:
+            request["generationConfig"] = {"responseMimeType": generation_config["response_mime_type"]}
+        return json.dumps(request).encode("utf-8")
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs) -> _Response:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.post(self.base_url + self._path(), data=self._body(prompt, generation_config),
+                                headers={"Content-Type": "application/json"},
+                                timeout=(kwargs.get("request_options") or {}).get("timeout"))
+        _raise_for_status(response.status_code, response.content)
+        return _Response(response.json())
+
+    async def generate_content_async(self, prompt: str, generation_config=None, **kwargs) -> _Response:
+        status, body = await _post_async(self.base_url, self._path(), self._body(prompt, generation_config))
+        _raise_for_status(status, body)
+        return _Response(json.loads(body))
+
+
+async def _post_async(base_url: str, path: str, body: bytes) -> Tuple[int, bytes]:
+    """Minimal HTTP/1.1 POST on asyncio streams; one connection per call."""
+    url = urlparse(base_url)
+    reader, writer = await asyncio.open_connection(url.hostname, url.port)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {url.netloc}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--wikipedia-url", required=True, help="base URL of the fake MediaWiki API")
+    parser.add_argument("--gemini-url", required=True, help="base URL of the fake Gemini API")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "loadtest-offline")
+    os.environ["WIKIPEDIA_API_URL"] = f"{args.wikipedia_url}/w/api.php"
+
+    import uvicorn
+    from agents import summarizer_agent
+
+    HttpGeminiModel.base_url = args.gemini_url
+    summarizer_agent.model_pool.factory = HttpGeminiModel
+
+    import main as app_module
+    uvicorn.run(app_module.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
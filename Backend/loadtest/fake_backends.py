@@ -0,0 +1,157 @@
+"""
+Local HTTP stand-ins for the MediaWiki API and the Gemini REST API.
+
+Both servers answer with deterministic content (see benchmarks/stubs.py),
+after a delay drawn from a configurable latency distribution, and fail a
+configurable fraction of requests the way the real services do when they are
+overloaded.
+"""
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.stubs import fake_article, FakeGeminiModel
+
+
+class LatencyModel:
+    """
+    Delay distribution parsed from a spec string:
+
+    - ``fixed:0.2`` – always 0.2 s
+    - ``uniform:0.1,0.5`` – between 0.1 and 0.5 s
+    - ``exp:0.3`` – exponential with a 0.3 s mean
+    - ``lognormal:0.8,0.6`` – log-normal with a 0.8 s median and sigma 0.6 (long tail)
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        kind, _, raw = spec.partition(":")
+        self.kind = kind
+        self.args = [float(v) for v in raw.split(",") if v]
+        self.spec = spec
+        if kind not in ("fixed", "uniform", "exp", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.args[0] if self.args else 0.0
+        if self.kind == "uniform":
+            return rng.uniform(self.args[0], self.args[1])
+        if self.kind == "exp":
+            return rng.expovariate(1.0 / self.args[0]) if self.args[0] > 0 else 0.0
+        return rng.lognormvariate(math.log(self.args[0]), self.args[1])
+
+
+class _FakeServer:
+    """Threaded HTTP server running in a daemon thread on a free local port."""
+
+    def __init__(self, latency: LatencyModel, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.counters = {"requests": 0, "errors": 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, b"")
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server._handle(self, body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, body: bytes):
+        with self._rng_lock:
+            delay = self.latency.sample(self._rng)
+            fail = self._rng.random() < self.error_rate
+            self.counters["requests"] += 1
+            if fail:
+                self.counters["errors"] += 1
+        time.sleep(delay)
+
+        if fail:
+            status, payload = self.error_response()
+        else:
+            status, payload = self.respond(handler.path, body)
+
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def error_response(self) -> Tuple[int, dict]:
+        return 503, {"error": {"code": 503, "message": "Service unavailable"}}
+
+    def respond(self, path: str, body: bytes) -> Tuple[int, dict]:
+        raise NotImplementedError
+
+
+class FakeWikipediaServer(_FakeServer):
+    """Answers the batched extract and search queries made by the Wikipedia connector (formatversion=2)."""
+
+    def respond(self, path: str, body: bytes) -> Tuple[int, dict]:
+        params = {k: v[0] for k, v in parse_qs(urlparse(path).query, keep_blank_values=True).items()}
+
+        if params.get("list") == "search":
+            return 200, {"query": {"search": [{"ns": 0, "title": params.get("srsearch", "")}]}}
+
+        pages = []
+        for title in params.get("titles", "").split("|"):
+            page_id = int(hashlib.sha256(title.encode("utf-8")).hexdigest()[:8], 16)
+            pages.append({"pageid": page_id, "ns": 0, "title": title, "extract": fake_article(title)})
+        return 200, {"query": {"pages": pages}}
+
+
+class FakeGeminiServer(_FakeServer):
+    """Answers `models/*:generateContent` requests like FakeGeminiModel: bullet lines, or a JSON deck."""
+
+    def error_response(self) -> Tuple[int, dict]:
+        # Real overload shows up as a mix of quota and availability errors.
+        status = 429 if self._rng.random() < 0.5 else 503
+        return status, {"error": {"code": status, "message": "Fake overload"}}
+
+    def respond(self, path: str, body: bytes) -> Tuple[int, dict]:
+        request = json.loads(body or b"{}")
+        prompt = "".join(
+            part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", [])
+        )
+        mime_type = request.get("generationConfig", {}).get("responseMimeType")
+        text = FakeGeminiModel().generate_content(prompt, {"response_mime_type": mime_type}).text
+        return 200, {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": 1, "index": 0}],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4 + 1,
+                "candidatesTokenCount": len(text) // 4 + 1,
+                "totalTokenCount": (len(prompt) + len(text)) // 4 + 2,
+            },
+        }
@@ -0,0 +1,281 @@
+"""
+Load test for the SlideMage API with simulated backends.
+
+Run from the Backend directory:
+
+    python -m loadtest.run --rate 1,2,4,8 --duration 30 --mix generate_slides=3,upload_doc=1 \
+        --gemini-latency lognormal:1.5,0.4 --wikipedia-latency exp:0.2 --gemini-error-rate 0.02
+
+Starts fake Wikipedia and Gemini servers, launches the app in a subprocess
+against them, and sends an open-loop request mix at each target rate in turn
+(arrivals do not wait for earlier responses, so queueing shows up as latency).
+Requests that would exceed --max-in-flight are dropped and counted. For every
+rate and endpoint it reports throughput and p50/p95/p99 latency.
+Everything runs on 127.0.0.1; no network access is needed.
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmarks.stubs import fake_article
+from loadtest.fake_backends import FakeGeminiServer, FakeWikipediaServer, LatencyModel
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ("generate_slides", "upload_doc")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class AppProcess:
+    """The API server in a subprocess, with caches in a throwaway directory."""
+
+    def __init__(self, wikipedia_url: str, gemini_url: str, gemini_rpm: float, workers_env: Dict[str, str],
+                 log_path: Optional[str] = None):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._cache_dir = tempfile.TemporaryDirectory(prefix="slidemage-loadtest-")
+
+        env = dict(os.environ)
+        env.update({
+            "GEMINI_API_KEY": env.get("GEMINI_API_KEY", "loadtest-offline"),
+            "SLIDEMAGE_CACHE_DIR": self._cache_dir.name,
+            "SLIDEMAGE_DECK_CACHE_DISK_MB": "0",
+            "SLIDEMAGE_GEMINI_RPM": str(gemini_rpm),
+            "SLIDEMAGE_GEMINI_TPM": str(gemini_rpm * 100000),
+        })
+        env.update(workers_env)
+
+        self._log = open(log_path or os.devnull, "w")
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "loadtest.app_server", "--port", str(self.port),
+             "--wikipedia-url", wikipedia_url, "--gemini-url", gemini_url],
+            cwd=BACKEND_DIR, env=env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+
+    def wait_ready(self, timeout: float = 60.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"App exited with status {self._process.returncode}")
+            try:
+                if requests.get(f"{self.url}/jobs", timeout=1).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("App did not become ready in time")
+
+    def stop(self):
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+        self._log.close()
+        self._cache_dir.cleanup()
+
+
+class LoadGenerator:
+    def __init__(self, base_url: str, mix: Dict[str, float], max_in_flight: int, timeout: float,
+                 document_chars: int, seed: int):
+        self.base_url = base_url
+        self.endpoints = list(mix)
+        self.weights = [mix[name] for name in self.endpoints]
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.document = fake_article("loadtest document", paragraphs=document_chars // 600 + 1)[:document_chars]
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, endpoint: str, n: int) -> Dict[str, Any]:
+        session = self._session()
+        started = time.perf_counter()
+        status: Any
+        try:
+            if endpoint == "generate_slides":
+                # Unique topics, so the deck and research caches never short-circuit the work.
+                response = session.post(f"{self.base_url}/generate_slides", data={"topic": f"Load test topic {n}"},
+                                        timeout=self.timeout)
+            else:
+                files = {"file": (f"loadtest_{n}.txt", self.document.encode("utf-8"), "text/plain")}
+                response = session.post(f"{self.base_url}/upload_doc", files=files, timeout=self.timeout)
+            status = response.status_code
+            size = len(response.content)
+        except requests.RequestException as e:
+            status = type(e).__name__
+            size = 0
+        finally:
+            self._slots.release()
+        return {"endpoint": endpoint, "status": status, "latency": time.perf_counter() - started, "bytes": size}
+
+    def run_stage(self, rate: float, duration: float, poisson: bool) -> Dict[str, Any]:
+        futures = []
+        dropped: Dict[str, int] = defaultdict(int)
+        started = time.perf_counter()
+        next_at = started
+
+        while next_at - started < duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            endpoint = self.rng.choices(self.endpoints, self.weights)[0]
+            with self._lock:
+                self._counter += 1
+                n = self._counter
+
+            if self._slots.acquire(blocking=False):
+                futures.append(self._pool.submit(self._send, endpoint, n))
+            else:
+                dropped[endpoint] += 1
+
+            next_at += self.rng.expovariate(rate) if poisson else 1.0 / rate
+
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - started
+        return summarize_stage(rate, elapsed, results, dropped)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+def summarize_stage(rate: float, elapsed: float, results: List[Dict[str, Any]],
+                    dropped: Dict[str, int]) -> Dict[str, Any]:
+    by_endpoint: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for result in results:
+        by_endpoint[result["endpoint"]].append(result)
+
+    endpoints = {}
+    for endpoint in sorted(set(by_endpoint) | set(dropped)):
+        entries = by_endpoint.get(endpoint, [])
+        ok = [e for e in entries if isinstance(e["status"], int) and e["status"] < 400]
+        latencies = [e["latency"] for e in ok]
+        errors: Dict[str, int] = defaultdict(int)
+        for e in entries:
+            if e not in ok:
+                errors[str(e["status"])] += 1
+        endpoints[endpoint] = {
+            "sent": len(entries),
+            "ok": len(ok),
+            "errors": dict(errors),
+            "dropped": dropped.get(endpoint, 0),
+            "throughput": len(ok) / elapsed if elapsed else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        }
+    return {"rate": rate, "seconds": elapsed, "endpoints": endpoints}
+
+
+def print_stage(stage: Dict[str, Any]):
+    print(f"\nTarget {stage['rate']:g} req/s over {stage['seconds']:.1f}s")
+    print(f"  {'endpoint':<16} {'sent':>6} {'ok':>6} {'err':>5} {'drop':>5} {'ok/s':>7} "
+          f"{'p50 s':>7} {'p95 s':>7} {'p99 s':>7}")
+    for endpoint, s in stage["endpoints"].items():
+        print(f"  {endpoint:<16} {s['sent']:>6} {s['ok']:>6} {sum(s['errors'].values()):>5} {s['dropped']:>5} "
+              f"{s['throughput']:>7.2f} {s['p50']:>7.2f} {s['p95']:>7.2f} {s['p99']:>7.2f}")
+        if s["errors"]:
+            print(f"  {'':<16} errors: {s['errors']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", default="2", help="target requests/s; a comma-separated list runs one stage each")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per stage")
+    parser.add_argument("--mix", default="generate_slides=3,upload_doc=1", help="endpoint=weight,...")
+    parser.add_argument("--poisson", action="store_true", help="exponential inter-arrival times instead of a fixed pace")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="client-side concurrency cap")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--document-chars", type=int, default=50000, help="size of the uploaded text document")
+    parser.add_argument("--wikipedia-latency", default="exp:0.15", help="fixed:S | uniform:A,B | exp:MEAN | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--wikipedia-error-rate", type=float, default=0.0)
+    parser.add_argument("--gemini-latency", default="lognormal:1.0,0.4")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="fraction answered with 429/503")
+    parser.add_argument("--gemini-rpm", type=float, default=1e6, help="app-side Gemini rate limit")
+    parser.add_argument("--max-workers", type=int, help="SLIDEMAGE_MAX_WORKERS for the app")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--app-log", metavar="PATH", help="write the app's output here instead of discarding it")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    mix = _parse_mix(args.mix)
+    rates = [float(r) for r in args.rate.split(",")]
+
+    wikipedia = FakeWikipediaServer(LatencyModel(args.wikipedia_latency), args.wikipedia_error_rate, args.seed).start()
+    gemini = FakeGeminiServer(LatencyModel(args.gemini_latency), args.gemini_error_rate, args.seed + 1).start()
+
+    workers_env = {"SLIDEMAGE_MAX_WORKERS": str(args.max_workers)} if args.max_workers else {}
+    app = AppProcess(wikipedia.url, gemini.url, args.gemini_rpm, workers_env, args.app_log)
+    generator = None
+    stages = []
+    try:
+        app.wait_ready()
+        print(f"App ready at {app.url}; Wikipedia {args.wikipedia_latency} (errors {args.wikipedia_error_rate:.0%}), "
+              f"Gemini {args.gemini_latency} (errors {args.gemini_error_rate:.0%})")
+
+        generator = LoadGenerator(app.url, mix, args.max_in_flight, args.timeout, args.document_chars, args.seed)
+        for rate in rates:
+            stage = generator.run_stage(rate, args.duration, args.poisson)
+            stage["backend_requests"] = {"wikipedia": dict(wikipedia.counters), "gemini": dict(gemini.counters)}
+            stages.append(stage)
+            print_stage(stage)
+    finally:
+        if generator is not None:
+            generator.close()
+        app.stop()
+        wikipedia.stop()
+        gemini.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "stages": stages}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,22 +28,83 @@
 #     return FileResponse(pptx_file, filename="slides.pptx")
 
 import __main__
-from fastapi import FastAPI, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from workflows.slide_workflow import build_workflow
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from workflows.slide_workflow import build_workflow, build_workflow_async, build_workflow_from_document, warm_up
+from workflows.job_queue import JobQueue, QueueFullError, JOB_SUCCEEDED, JOB_FAILED
+from workflows.batch_workflow import stream_batch_zip, shutdown_export_pool, BATCH_MAX_TOPICS
+from connectors.document_connector import read_document_chunks
+from agents.summarizer_agent import model_pool
+from utils.cache import deck_cache
+from utils.research_cache import research_cache
+from utils.semantic_cache import topic_index
 
 import os
+import re
+import json
+import time
+import asyncio
 import tempfile
+import threading
 import logging
+import unicodedata
+from io import BytesIO
+from urllib.parse import quote
+from typing import List, Optional
+from pydantic import BaseModel
 
 logging.basicConfig(level = logging.INFO)
 logger = logging.getLogger(__name__)
 
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+DISCONNECT_POLL_SECONDS = 0.5
+SSE_POLL_SECONDS = 0.25
+SSE_HEARTBEAT_SECONDS = 15.0
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+DOCUMENT_TYPES = ["text/plain", "application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
+ASK_MAX_TOP_K = 10
+# Load heavy dependencies and templates in the background once the server is up ("0" loads them on first use).
+WARM_UP = os.getenv("SLIDEMAGE_WARM_UP", "1") != "0"
+
+job_queue = JobQueue()
+
+def _pptx_response(data: bytes, filename: str, headers: Optional[dict] = None) -> StreamingResponse:
+    """Stream an in-memory deck back to the client as a download."""
+    # Every client understands the plain ASCII filename; those that support
+    # RFC 6266 prefer the exact UTF-8 one in filename* when it differs.
+    decomposed = unicodedata.normalize("NFKD", filename)
+    fallback = "".join(char for char in decomposed if not unicodedata.combining(char))
+    fallback = re.sub(r'[^\x20-\x7e]|["\\]', "_", fallback)
+    disposition = f'attachment; filename="{fallback}"'
+    
+    quoted = quote(filename)
+    if quoted != filename:
+        disposition += f"; filename*=utf-8''{quoted}"
+    
+    return StreamingResponse(
+        BytesIO(data),
+        media_type=PPTX_MEDIA_TYPE,
+        headers={"Content-Disposition": disposition, "Content-Length": str(len(data)), **(headers or {})}
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start serving right away; warm-up runs alongside the first requests.
+    warm_up_task = asyncio.ensure_future(asyncio.to_thread(warm_up)) if WARM_UP else None
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    job_queue.shutdown()
+    shutdown_export_pool()
+
 app = FastAPI(
     title =  "SlideMage",
     description = "AI-powered presentation generation service",
-    version = "1.0.0"   
+    version = "1.0.0",
+    lifespan = lifespan
 )
 
 app.add_middleware(
@@ -54,56 +115,371 @@ app.add_middleware(
     allow_headers = ["*"],
 )
 
+class ClientDisconnected(Exception):
+    pass
+
+async def _run_until_disconnect(request: Request, coro):
+    """Await coro, cancelling it if the client goes away before it finishes."""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
 @app.post("/generate_slides")
-async def generate_slides(topic: str = Form(...)):
+async def generate_slides(request: Request, topic: str = Form(...), offline: Optional[bool] = Form(None)):
     try: 
         if not topic.strip():
             raise HTTPException(status_code=400, detail="Topic cannot be empty")
         
         logger.info(f"Generating slides for topic: {topic}")
-        pptx_file = build_workflow(topic)
+        pptx_data = await _run_until_disconnect(request, build_workflow_async(topic, in_memory=True, offline=offline))
 
-        if not os.path.exists(pptx_file):
+        if not pptx_data:
             raise HTTPException(status_code=500, detail="Failed to generate presentation")
         
-        return FileResponse(pptx_file, media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                            filename=f"{topic}_slides.pptx")
+        return _pptx_response(pptx_data, f"{topic}_slides.pptx")
     
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        logger.info(f"Client disconnected, cancelled slide generation for topic: {topic}")
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         logger.error(f"Error generating slides: {e}")
         raise HTTPException(status_code = 500, detail = f"Error generating slides: {str(e)}")
 
 
-@app.post("/upload_doc")
-async def upload_doc(file: UploadFile):
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/generate_slides/stream")
+async def generate_slides_stream(topic: str, offline: Optional[bool] = None):
+    """
+    Generate a deck as a background job and stream its progress as server-sent events.
+    
+    Emits `queued`, one `stage` event per workflow stage start/finish (with
+    timings), and finally `complete` with the download URL or `error`.
+    """
+    if not topic.strip():
+        raise HTTPException(status_code=400, detail="Topic cannot be empty")
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def on_progress(event: dict):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+    
     try:
-        allowed_types = ["text/plain", "application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
-        if file.content_type not in allowed_types:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
+        job_id = job_queue.submit(
+            build_workflow, topic,
+            in_memory=True,
+            on_progress=on_progress,
+            offline=offline,
+            description=f"Slides for topic: {topic}",
+            metadata={"filename": f"{topic}_slides.pptx"}
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return _job_event_stream(job_id, events)
+
+def _job_event_stream(job_id: str, events: asyncio.Queue) -> StreamingResponse:
+    """Stream a queued job's progress events as SSE, ending with `complete` or `error`."""
+    async def event_stream():
+        started = time.time()
+        last_sent = started
+        yield _sse("queued", {"job_id": job_id, "status_url": f"/jobs/{job_id}"})
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=SSE_POLL_SECONDS)
+                event["elapsed"] = time.time() - started
+                yield _sse("stage", event)
+                last_sent = time.time()
+                continue
+            except asyncio.TimeoutError:
+                pass
+            
+            job = job_queue.get(job_id)
+            if job is None or job["status"] in (JOB_SUCCEEDED, JOB_FAILED):
+                # Flush stage events that raced with the job finishing.
+                while not events.empty():
+                    event = events.get_nowait()
+                    event["elapsed"] = time.time() - started
+                    yield _sse("stage", event)
+                
+                if job is not None and job["status"] == JOB_SUCCEEDED:
+                    yield _sse("complete", {"job_id": job_id, "result_url": f"/jobs/{job_id}/result",
+                                            "elapsed": time.time() - started})
+                else:
+                    error = job["error"] if job is not None else "Job expired"
+                    yield _sse("error", {"job_id": job_id, "detail": error})
+                return
+            
+            if time.time() - last_sent > SSE_HEARTBEAT_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = time.time()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class BatchRequest(BaseModel):
+    topics: List[str]
+    bullets_per_slide: int = 4
+    offline: Optional[bool] = None
+
+@app.post("/generate_slides/batch")
+async def generate_slides_batch(batch: BatchRequest):
+    """Generate decks for many topics and stream them back as a ZIP with a manifest.json."""
+    topics = [topic for topic in batch.topics if topic and topic.strip()]
+    if not topics:
+        raise HTTPException(status_code=400, detail="At least one topic is required")
+    
+    if len(topics) > BATCH_MAX_TOPICS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_TOPICS} topics per batch")
+    
+    if batch.bullets_per_slide < 1:
+        raise HTTPException(status_code=400, detail="bullets_per_slide must be at least 1")
+    
+    logger.info(f"Generating batch of {len(topics)} topics")
+    return StreamingResponse(
+        stream_batch_zip(topics, batch.bullets_per_slide, offline=batch.offline),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="slides_batch.zip"'}
+    )
+
+
+async def _save_upload(file: UploadFile) -> str:
+    """Copy an upload to a temporary file and return its path; the caller deletes it."""
+    if file.content_type not in DOCUMENT_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as temp_file:
+        try:
+            # Copy in blocks so large uploads are never held in memory whole.
+            while True:
+                block = await file.read(UPLOAD_BLOCK_SIZE)
+                if not block:
+                    break
+                temp_file.write(block)
+        except Exception:
+            # Nobody else knows the path yet, so a partial copy must be removed here.
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+        return temp_file.name
+
+def _build_from_upload(temp_path: str, content_type: Optional[str], title: str, on_progress=None) -> bytes:
+    """Build a deck from a saved upload, deleting the file once done."""
+    try:
+        return build_workflow_from_document(temp_path, content_type, title, in_memory=True, on_progress=on_progress)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+@app.post("/upload_doc")
+async def upload_doc(request: Request, file: UploadFile):
+    try:
+        temp_path = await _save_upload(file)
         
+        cancel_event = threading.Event()
+        events: List[dict] = []
         try:
-            topic = f"Document: {file.filename}"
-            pptx_file = build_workflow(topic)
+            title = os.path.splitext(file.filename)[0] or "Document"
+            pptx_data = await _run_until_disconnect(request, asyncio.to_thread(
+                build_workflow_from_document, temp_path, file.content_type, title,
+                in_memory=True, cancel_event=cancel_event, on_progress=events.append
+            ))
             
-            return FileResponse(
-                pptx_file, 
-                media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                filename=f"{file.filename}_slides.pptx"
-            )
+            truncated = any(event["status"] == "truncated" for event in events)
+            return _pptx_response(pptx_data, f"{file.filename}_slides.pptx",
+                                  headers={"X-Document-Truncated": "true" if truncated else "false"})
+        except ClientDisconnected:
+            # The worker thread cannot be cancelled directly; tell the extractor to stop.
+            cancel_event.set()
+            logger.info(f"Client disconnected, cancelled document processing for: {file.filename}")
+            raise HTTPException(status_code=499, detail="Client closed request")
         finally:
             # Clean up temporary file
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing document: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
 
+@app.post("/upload_doc/stream")
+async def upload_doc_stream(file: UploadFile):
+    """
+    Build a deck from a document as a background job and stream its progress
+    as server-sent events, like /generate_slides/stream. Long documents also
+    emit one `chunk` event per map and reduce call.
+    """
+    temp_path = await _save_upload(file)
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def on_progress(event: dict):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+    
+    try:
+        title = os.path.splitext(file.filename)[0] or "Document"
+        job_id = job_queue.submit(
+            _build_from_upload, temp_path, file.content_type, title, on_progress,
+            description=f"Slides for document: {file.filename}",
+            metadata={"filename": f"{file.filename}_slides.pptx"}
+        )
+    except QueueFullError as e:
+        os.unlink(temp_path)
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return _job_event_stream(job_id, events)
+
+
+@app.post("/documents", status_code=201)
+async def index_document(file: UploadFile):
+    """Index a PDF, DOCX or TXT document for /ask and return its id."""
+    from agents.retrieval_agent import document_index
+    
+    try:
+        temp_path = await _save_upload(file)
+        try:
+            chunks, truncated = await asyncio.to_thread(read_document_chunks, temp_path, file.content_type)
+        finally:
+            os.unlink(temp_path)
+        
+        title = os.path.splitext(file.filename)[0] or "Document"
+        meta = await asyncio.to_thread(document_index.add, chunks, title)
+        return {"document_id": meta["id"], "title": meta["title"], "chunks": meta["chunks"], "truncated": truncated}
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error indexing document: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error indexing document: {str(e)}")
+
+
+class AskRequest(BaseModel):
+    question: str
+    document_ids: List[str]
+    top_k: int = 4
+
+@app.post("/ask")
+async def ask(request: AskRequest):
+    """Answer a question from the most relevant passages of indexed documents, with those passages as sources."""
+    from agents.retrieval_agent import ask_async, document_index
+    
+    if not request.question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+    
+    if not request.document_ids:
+        raise HTTPException(status_code=400, detail="At least one document_id is required")
+    
+    if not 1 <= request.top_k <= ASK_MAX_TOP_K:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 1 and {ASK_MAX_TOP_K}")
+    
+    missing = [document_id for document_id in request.document_ids if not document_index.exists(document_id)]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown document ids: {', '.join(missing)}")
+    
+    try:
+        return await ask_async(request.question, request.document_ids, request.top_k)
+    except Exception as e:
+        logger.error(f"Error answering question: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error answering question: {str(e)}")
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(topic: str = Form(...), offline: Optional[bool] = Form(None)):
+    if not topic.strip():
+        raise HTTPException(status_code=400, detail="Topic cannot be empty")
+
+    try:
+        job_id = job_queue.submit(
+            build_workflow, topic,
+            in_memory=True,
+            offline=offline,
+            description=f"Slides for topic: {topic}",
+            metadata={"filename": f"{topic}_slides.pptx"}
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"job_id": job_id, "status_url": f"/jobs/{job_id}", "result_url": f"/jobs/{job_id}/result"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "description": job["description"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+    }
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job["status"] == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+
+    if job["status"] != JOB_SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    pptx_data = job["result"]
+    if not pptx_data:
+        raise HTTPException(status_code=410, detail="Job result is no longer available")
+
+    return _pptx_response(pptx_data, job["metadata"].get("filename", "slides.pptx"))
+
+
+@app.get("/jobs")
+async def job_stats():
+    return job_queue.stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage and Gemini latency histograms, token counts, cache ratios, export sizes."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    from agents.export_agent import template_registry
+    from agents.retrieval_agent import document_index
+    
+    return {"decks": deck_cache.stats(), "research": research_cache.stats(), "templates": template_registry.stats(),
+            "models": model_pool.stats(), "topics": topic_index.stats(), "documents": document_index.stats()}
+
 
 if __name__ == "__main__":
     import uvicorn
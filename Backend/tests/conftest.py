@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend imports its packages relative to Backend/, as when run with `uvicorn main:app`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
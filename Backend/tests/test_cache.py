@@ -0,0 +1,72 @@
+import os
+import time
+
+from utils.cache import DeckCache, make_deck_key
+
+
+def memory_cache(tmp_path, **kwargs):
+    # disk_quota=0 keeps lookups in the memory tier.
+    return DeckCache(cache_dir=str(tmp_path), disk_quota=0, **kwargs)
+
+
+def test_make_deck_key_normalizes_topic():
+    assert make_deck_key("Machine  Learning", 3, "v1") == make_deck_key("machine learning", 3, "v1")
+    assert make_deck_key("machine learning", 3, "v1") != make_deck_key("machine learning", 4, "v1")
+    assert make_deck_key("machine learning", 3, "v1") != make_deck_key("machine learning", 3, "v2")
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = memory_cache(tmp_path, max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.put("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_tier_is_bounded_by_bytes(tmp_path):
+    cache = memory_cache(tmp_path, max_bytes=10)
+    cache.put("a", b"x" * 6)
+    cache.put("b", b"x" * 6)
+    assert cache.get("a") is None
+    assert cache.stats()["memory_bytes"] == 6
+
+    # Entries larger than the whole tier are not cached in memory at all.
+    cache.put("c", b"x" * 11)
+    assert cache.get("c") is None
+    assert cache.get("b") == b"x" * 6
+
+
+def test_disk_tier_serves_memory_misses(tmp_path):
+    cache = DeckCache(cache_dir=str(tmp_path), max_entries=1)
+    cache.put("a", b"deck a")
+    cache.put("b", b"deck b")
+
+    assert cache.get("a") == b"deck a"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_expires_entries_after_ttl(tmp_path):
+    cache = DeckCache(cache_dir=str(tmp_path), max_entries=1, ttl=60)
+    cache.put("a", b"deck a")
+    cache.put("b", b"deck b")
+    path = os.path.join(str(tmp_path), "a.pptx")
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+
+    assert cache.get("a") is None
+    assert not os.path.exists(path)
+
+
+def test_disk_tier_evicts_oldest_files_over_quota(tmp_path):
+    cache = DeckCache(cache_dir=str(tmp_path), disk_quota=10)
+    cache.put("a", b"x" * 6)
+    stale = time.time() - 10
+    os.utime(os.path.join(str(tmp_path), "a.pptx"), (stale, stale))
+    cache.put("b", b"x" * 6)
+
+    assert sorted(os.listdir(str(tmp_path))) == ["b.pptx"]
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from agents.summarizer_agent import parse_deck
+from utils.helpers import validate_slide_data
+
+
+def deck(*slides):
+    return json.dumps({"slides": list(slides)})
+
+
+def test_parses_a_valid_deck():
+    response = deck({"title": "Basics", "bullets": ["• Models learn", "- From data", "  "], "notes": " Say hi "},
+                    {"title": "Uses", "bullets": ["Search", "Vision", "Speech"]})
+
+    assert parse_deck(response, bullets_per_slide=2) == [
+        {"title": "Basics", "bullets": ["Models learn", "From data"], "image": None, "notes": "Say hi"},
+        {"title": "Uses", "bullets": ["Search", "Vision"], "image": None, "notes": ""},
+    ]
+
+
+def test_accepts_a_fenced_response():
+    response = "```json\n" + deck({"title": "Basics", "bullets": ["Models learn"]}) + "\n```"
+    assert parse_deck(response, 4)[0]["bullets"] == ["Models learn"]
+
+
+@pytest.mark.parametrize("response", [
+    None,
+    "",
+    "Here are your slides: ...",
+    '{"slides": [{"title": "Basics", "bullets": ["Models learn"]}',
+    "[]",
+    json.dumps({"slides": []}),
+    json.dumps({"slides": {"title": "Basics"}}),
+    json.dumps({"pages": [{"title": "Basics", "bullets": ["Models learn"]}]}),
+    deck("Basics"),
+    deck({"bullets": ["Models learn"]}),
+    deck({"title": 42, "bullets": ["Models learn"]}),
+    deck({"title": "   ", "bullets": ["Models learn"]}),
+    deck({"title": "Basics", "bullets": "Models learn"}),
+    deck({"title": "Basics", "bullets": ["Models learn", 7]}),
+    deck({"title": "Basics", "bullets": ["  ", ""]}),
+    deck({"title": "Basics", "bullets": ["Models learn"], "notes": ["not", "a", "string"]}),
+    deck({"title": "Basics", "bullets": ["Models learn"]}, {"title": "Broken"}),
+])
+def test_rejects_malformed_decks(response):
+    assert parse_deck(response, 4) is None
+
+
+def test_validate_slide_data_fills_and_truncates():
+    slide = validate_slide_data({"title": "T" * 150, "bullets": ["B" * 250, "", None, "  ok  "]})
+
+    assert slide["title"] == "T" * 97 + "..."
+    assert slide["bullets"] == ["B" * 197 + "...", "ok"]
+    assert slide["notes"] == ""
+
+
+def test_validate_slide_data_handles_missing_or_odd_fields():
+    assert validate_slide_data({})["title"] == "Untitled Slide"
+    assert validate_slide_data({"bullets": []})["bullets"] == ["Content not available"]
+    assert validate_slide_data({"bullets": "single bullet"})["bullets"] == ["single bullet"]
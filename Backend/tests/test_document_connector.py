@@ -0,0 +1,28 @@
+from connectors.document_connector import read_document_chunks
+
+
+def write_document(tmp_path, paragraphs):
+    path = tmp_path / "document.txt"
+    path.write_text("\n\n".join(f"Paragraph {i} about solar panels." for i in range(paragraphs)), encoding="utf-8")
+    return str(path)
+
+
+def test_reads_whole_document_under_the_limit(tmp_path):
+    chunks, truncated = read_document_chunks(write_document(tmp_path, 20), "text/plain", max_chars=10_000,
+                                             max_chunk_size=200)
+    assert not truncated
+    assert "Paragraph 19" in chunks[-1]
+
+
+def test_flags_text_left_unread(tmp_path):
+    chunks, truncated = read_document_chunks(write_document(tmp_path, 200), "text/plain", max_chars=1_000,
+                                             max_chunk_size=200)
+    assert truncated
+    assert 1_000 <= sum(len(chunk) for chunk in chunks) < 1_200
+
+
+def test_document_that_fits_exactly_is_not_truncated(tmp_path):
+    path = write_document(tmp_path, 20)
+    chunks, _ = read_document_chunks(path, "text/plain", max_chunk_size=200)
+    total = sum(len(chunk) for chunk in chunks)
+    assert read_document_chunks(path, "text/plain", max_chars=total, max_chunk_size=200) == (chunks, False)
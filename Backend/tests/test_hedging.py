@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from agents import summarizer_agent
+
+
+class FakeModel:
+    model_name = "fake"
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.timeouts = []
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, request_options=None, **kwargs):
+        with self.lock:
+            self.timeouts.append(request_options["timeout"])
+        if self.delay > request_options["timeout"]:
+            time.sleep(request_options["timeout"])
+            raise TimeoutError("Deadline exceeded")
+        time.sleep(self.delay)
+        return type("Response", (), {"text": "ok", "usage_metadata": None})()
+
+
+@pytest.fixture(autouse=True)
+def fast_hedges(monkeypatch):
+    monkeypatch.setattr(summarizer_agent, "_hedge_delay", lambda model, budget: 0.02)
+
+
+def test_sync_calls_carry_the_per_call_timeout():
+    model = FakeModel(delay=0)
+    assert summarizer_agent._generate(model, "prompt").text == "ok"
+    assert model.timeouts == [summarizer_agent.GEMINI_TIMEOUT_SECONDS]
+
+
+def test_slow_call_is_hedged_and_bounded_by_the_budget():
+    model = FakeModel(delay=0.5)
+    with pytest.raises(TimeoutError):
+        summarizer_agent._generate_hedged(model, "prompt", budget=0.2)
+
+    assert len(model.timeouts) == 2
+    assert all(timeout <= 0.2 for timeout in model.timeouts)
+    # The abandoned calls time out on their own and give their threads back.
+    time.sleep(0.3)
+    assert summarizer_agent._hedge_pool_busy == 0
+
+
+def test_no_hedge_while_the_pool_is_busy(monkeypatch):
+    monkeypatch.setattr(summarizer_agent, "GEMINI_MAX_CONCURRENCY", 0)
+    model = FakeModel(delay=0.1)
+    assert summarizer_agent._generate_hedged(model, "prompt", budget=1.0).text == "ok"
+    assert len(model.timeouts) == 1
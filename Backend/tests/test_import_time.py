@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.import_time import IMPORT_BUDGET_MS, LAZY_MODULES, importtime_available, measure
+
+pytestmark = pytest.mark.skipif(not importtime_available(), reason="-X importtime is not supported here")
+
+
+@pytest.fixture(scope="module")
+def fastest_run():
+    # The fastest of a few runs, so a busy machine does not fail the budget.
+    return min((measure() for _ in range(3)), key=lambda run: run[0])
+
+
+def test_heavy_dependencies_stay_lazy(fastest_run):
+    _, self_times = fastest_run
+    assert [name for name in LAZY_MODULES if name in self_times] == []
+
+
+def test_import_main_within_budget(fastest_run):
+    total, _ = fastest_run
+    assert total <= IMPORT_BUDGET_MS, f"import main took {total:.0f} ms, over the {IMPORT_BUDGET_MS:.0f} ms budget"
@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from workflows.job_queue import JobQueue, QueueFullError, JOB_SUCCEEDED
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job is None or job["finished_at"] is not None:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_rejects_jobs_beyond_workers_plus_queue_depth():
+    queue = JobQueue(max_workers=1, max_queue_depth=1)
+    release = threading.Event()
+    try:
+        queue.submit(release.wait)
+        queue.submit(release.wait)
+        with pytest.raises(QueueFullError):
+            queue.submit(release.wait)
+    finally:
+        release.set()
+        queue.shutdown(wait=True)
+
+
+def test_finished_jobs_free_their_slot():
+    queue = JobQueue(max_workers=1, max_queue_depth=0)
+    try:
+        job_id = queue.submit(lambda: "deck")
+        assert wait_for(queue, job_id)["status"] == JOB_SUCCEEDED
+        queue.submit(lambda: "another deck")
+    finally:
+        queue.shutdown(wait=True)
+
+
+def test_expired_jobs_are_purged_on_read():
+    queue = JobQueue(max_workers=1, max_queue_depth=0, job_ttl=0)
+    try:
+        job_id = queue.submit(lambda: "deck")
+        # A zero TTL expires the job as soon as it finishes, before any further submit.
+        assert wait_for(queue, job_id) is None
+        time.sleep(0.01)
+        assert queue.get(job_id) is None
+        assert queue.stats()[JOB_SUCCEEDED] == 0
+    finally:
+        queue.shutdown(wait=True)
+
+
+def test_keeps_at_most_max_finished_jobs():
+    queue = JobQueue(max_workers=1, max_queue_depth=10, max_finished=2)
+    try:
+        job_ids = [queue.submit(lambda n=n: n) for n in range(5)]
+        wait_for(queue, job_ids[-1])
+        assert [queue.get(job_id) is not None for job_id in job_ids] == [False, False, False, True, True]
+        assert queue.stats()[JOB_SUCCEEDED] == 2
+    finally:
+        queue.shutdown(wait=True)
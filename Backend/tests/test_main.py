@@ -0,0 +1,48 @@
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import main
+
+
+class FailingUpload:
+    """An upload whose connection drops after the first block."""
+
+    content_type = "text/plain"
+    filename = "notes.txt"
+
+    def __init__(self):
+        self.reads = 0
+
+    async def read(self, size):
+        self.reads += 1
+        if self.reads > 1:
+            raise ConnectionResetError("client went away")
+        return b"x" * size
+
+
+def test_save_upload_removes_partial_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(main.tempfile, "tempdir", str(tmp_path))
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(main._save_upload(FailingUpload()))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_ascii_filename_is_sent_as_is():
+    response = main._pptx_response(b"deck", "Photosynthesis_slides.pptx")
+
+    assert response.headers["content-disposition"] == 'attachment; filename="Photosynthesis_slides.pptx"'
+
+
+def test_non_ascii_filename_gets_an_ascii_fallback():
+    response = main._pptx_response(b"deck", 'Café "Ölmühle" 東京_slides.pptx')
+
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="Cafe _Olmuhle_ ___slides.pptx"; '
+        "filename*=utf-8''Caf%C3%A9%20%22%C3%96lm%C3%BChle%22%20%E6%9D%B1%E4%BA%AC_slides.pptx"
+    )
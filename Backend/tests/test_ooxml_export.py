@@ -0,0 +1,46 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from agents.export_agent import export_to_bytes
+from agents.ooxml_export import export_to_bytes_fast
+
+
+SLIDES = [
+    {"title": "Machine learning - Part 1", "bullets": ["Models learn from data", "Escaping <tags> & \"quotes\""]},
+    {"title": "Machine learning - Part 2", "bullets": []},
+    {"title": "Ünïcode títle", "bullets": ["A long bullet " * 30, "Control \x0b characters"]},
+]
+
+
+def parts(data):
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def content_types(xml):
+    # Override order is not significant.
+    return sorted(tuple(sorted(element.attrib.items())) for element in ET.fromstring(xml))
+
+
+@pytest.mark.parametrize("slides, title", [(SLIDES, None), (SLIDES, "Deck title"), (SLIDES[:1], None)])
+def test_matches_python_pptx_output(slides, title):
+    expected = parts(export_to_bytes(slides, title=title))
+    actual = parts(export_to_bytes_fast(slides, title=title))
+
+    assert sorted(actual) == sorted(expected)
+    for name in expected:
+        if name == "[Content_Types].xml":
+            assert content_types(actual[name]) == content_types(expected[name])
+        else:
+            assert actual[name] == expected[name], name
+
+
+def test_empty_deck_has_no_slides():
+    from pptx import Presentation
+
+    assert len(Presentation(BytesIO(export_to_bytes_fast([]))).slides) == 0
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import (TokenBucketRateLimiter, call_with_backoff, call_with_backoff_async,
+                                is_retryable_error)
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backoff_delay", lambda attempt: 0.0)
+
+
+def flaky(errors, result="ok"):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+def test_limiter_does_not_wait_while_budget_remains():
+    limiter = TokenBucketRateLimiter(requests_per_minute=5, tokens_per_minute=1000)
+    for _ in range(5):
+        assert limiter._try_acquire(100) == 0
+    assert limiter._try_acquire(100) > 0
+
+
+def test_limiter_waits_for_the_emptier_bucket():
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, tokens_per_minute=600)
+    assert limiter._try_acquire(600) == 0
+    # 600 tokens per minute refill at 10 per second, so 100 more tokens take about 10 s.
+    assert limiter._try_acquire(100) == pytest.approx(10, abs=0.1)
+
+
+def test_limiter_allows_a_call_larger_than_the_budget_once_full():
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, tokens_per_minute=100)
+    assert limiter._try_acquire(1000) == 0
+    assert limiter._try_acquire(1) > 0
+
+
+def test_limiter_refills_over_time():
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, tokens_per_minute=1000)
+    limiter._state = {"requests": 0.0, "tokens": 1000.0, "updated": time.time() - 2}
+    assert limiter._try_acquire(0) == 0
+
+
+def test_limiter_shares_budget_through_state_file(tmp_path):
+    path = str(tmp_path / "bucket.json")
+    first = TokenBucketRateLimiter(requests_per_minute=2, tokens_per_minute=1000, state_path=path)
+    second = TokenBucketRateLimiter(requests_per_minute=2, tokens_per_minute=1000, state_path=path)
+    assert first._try_acquire(0) == 0
+    assert second._try_acquire(0) == 0
+    assert first._try_acquire(0) > 0
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (APIError(429), True),
+    (APIError(503), True),
+    (ResourceExhausted("quota"), True),
+    (APIError(400), False),
+    (APIError(500), False),
+    (ValueError("bad prompt"), False),
+])
+def test_retry_classification(error, retryable):
+    assert is_retryable_error(error) is retryable
+
+
+def test_call_with_backoff_retries_retryable_errors():
+    fn, calls = flaky([APIError(429), ResourceExhausted("quota")])
+    assert call_with_backoff(fn) == "ok"
+    assert len(calls) == 3
+
+
+def test_call_with_backoff_raises_other_errors_immediately():
+    fn, calls = flaky([APIError(400)])
+    with pytest.raises(APIError):
+        call_with_backoff(fn)
+    assert len(calls) == 1
+
+
+def test_call_with_backoff_gives_up_after_max_retries():
+    fn, calls = flaky([APIError(503)] * 5)
+    with pytest.raises(APIError):
+        call_with_backoff(fn, max_retries=2)
+    assert len(calls) == 3
+
+
+def test_call_with_backoff_async_retries_retryable_errors():
+    fn, calls = flaky([APIError(503)])
+
+    async def attempt():
+        return fn()
+
+    assert asyncio.run(call_with_backoff_async(attempt)) == "ok"
+    assert len(calls) == 2
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from utils.semantic_cache import TopicIndex
+from workflows.slide_workflow import _retitle
+
+
+SLIDES = [{"title": "Machine learning - Part 1", "bullets": ["Models learn from data"]}]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return TopicIndex(path=str(tmp_path / "topics.jsonl"), threshold=0.8, ttl=3600)
+
+
+def matched_topic(index, topic, bullets_per_slide=4, version="v1"):
+    match = index.lookup(topic, bullets_per_slide, version)
+    return match[0]["topic"] if match else None
+
+
+@pytest.mark.parametrize("topic", ["Machine learning", "machine-learning basics", "Intro to ML", "ML"])
+def test_rewordings_and_acronyms_match(index, topic):
+    index.add("Machine learning", 4, "v1", SLIDES)
+    assert matched_topic(index, topic) == "machine learning"
+
+
+@pytest.mark.parametrize("topic", [
+    "Machine translation",
+    "Markup language",
+    "intro to ml",  # lower case: not written as an acronym
+    "MLS",
+    "Deep learning",
+    # Narrower topics must not be served the generic deck.
+    "Machine learning in healthcare",
+    "Ethics of machine learning",
+])
+def test_unrelated_topics_do_not_match(index, topic):
+    index.add("Machine learning", 4, "v1", SLIDES)
+    assert matched_topic(index, topic) is None
+
+
+@pytest.mark.parametrize("cached, topic", [
+    ("World War II", "Causes of World War II"),
+    ("World War II", "World War II in Asia"),
+    ("Climate change", "Economics of climate change"),
+    ("Quantum computing", "Quantum computing history"),
+    # Nor the other way round.
+    ("Machine learning in healthcare", "Machine learning"),
+])
+def test_specialisations_do_not_match(index, cached, topic):
+    index.add(cached, 4, "v1", SLIDES)
+    assert matched_topic(index, topic) is None
+
+
+def test_numerals_keep_world_wars_apart(index):
+    index.add("World War I", 4, "v1", SLIDES)
+    assert matched_topic(index, "World War II") is None
+    assert matched_topic(index, "WWII") is None
+    assert matched_topic(index, "WWI") == "world war i"
+
+
+def test_ambiguous_acronym_is_a_miss(index):
+    index.add("Personal computer", 4, "v1", SLIDES)
+    assert matched_topic(index, "PC") == "personal computer"
+
+    index.add("Political correctness", 4, "v1", SLIDES)
+    assert matched_topic(index, "PC") is None
+
+
+def test_cached_acronym_matches_its_expansion(index):
+    index.add("NASA", 4, "v1", SLIDES)
+    assert matched_topic(index, "National Aeronautics and Space Administration") == "nasa"
+
+
+def test_lookups_are_scoped_to_slide_size_and_version(index):
+    index.add("Machine learning", 4, "v1", SLIDES)
+    assert matched_topic(index, "Machine learning", bullets_per_slide=3) is None
+    assert matched_topic(index, "Machine learning", version="v2") is None
+
+
+def test_expired_entries_do_not_match(index):
+    index.add("Machine learning", 4, "v1", SLIDES)
+    index.ttl = 0
+    time.sleep(0.01)
+    assert matched_topic(index, "Machine learning") is None
+    assert matched_topic(index, "ML") is None
+
+
+def test_threshold_zero_disables_the_index(tmp_path):
+    index = TopicIndex(path=str(tmp_path / "topics.jsonl"), threshold=0)
+    index.add("Machine learning", 4, "v1", SLIDES)
+    assert index.lookup("Machine learning", 4, "v1") is None
+
+
+def test_index_is_rebuilt_from_disk(index):
+    index.add("Machine learning", 4, "v1", SLIDES)
+    index.add("NASA", 4, "v1", SLIDES)
+    reloaded = TopicIndex(path=index.path, threshold=0.8, ttl=3600)
+    assert matched_topic(reloaded, "Intro to ML") == "machine learning"
+    assert matched_topic(reloaded, "National Aeronautics and Space Administration") == "nasa"
+
+
+def test_reused_slides_are_retitled():
+    slides = [
+        {"title": "Machine learning - Part 1", "bullets": ["a"]},
+        {"title": "Machine Learning", "bullets": ["b"]},
+        {"title": "How models are trained", "bullets": ["c"]},
+    ]
+    assert [slide["title"] for slide in _retitle(slides, "machine learning", "Intro to ML")] == [
+        "Intro to ML - Part 1", "Intro to ML", "How models are trained",
+    ]
+    assert slides[0]["title"] == "Machine learning - Part 1"
+
+
+def test_expired_best_match_gives_way_to_a_live_one(index):
+    index.add("Machine learning", 4, "v1", SLIDES)
+    index.add("Machine learning basics", 4, "v1", SLIDES)
+    group = index._groups[(4, "v1")]
+    group.entries[group.rows["machine learning"]]["created"] -= 2 * index.ttl
+
+    assert matched_topic(index, "Machine learning") == "machine learning basics"
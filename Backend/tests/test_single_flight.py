@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work(notify):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "deck"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("topic", work)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do("topic", work)))
+    follower.start()
+    deadline = time.time() + 5
+    while flight._flights["topic"].waiters < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ["deck", "deck"]
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+def test_followers_receive_progress_and_errors():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        events = []
+
+        async def work(notify):
+            await release.wait()
+            notify("halfway")
+            raise ValueError("failed")
+
+        leader = asyncio.ensure_future(flight.do_async("topic", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("topic", work, listener=events.append))
+        await asyncio.sleep(0)
+        release.set()
+
+        for task in (leader, follower):
+            with pytest.raises(ValueError):
+                await task
+        return events
+
+    assert asyncio.run(scenario()) == ["halfway"]
+
+
+def test_flight_survives_while_any_caller_waits():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def work(notify):
+            await release.wait()
+            return "deck"
+
+        leader = asyncio.ensure_future(flight.do_async("topic", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("topic", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        assert not flight._flights["topic"].task.cancelled()
+        release.set()
+        return await follower
+
+    assert asyncio.run(scenario()) == "deck"
+
+
+def test_flight_is_cancelled_when_every_caller_gives_up():
+    async def scenario():
+        flight = SingleFlight("test")
+        cancelled = asyncio.Event()
+
+        async def work(notify):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.ensure_future(flight.do_async("topic", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert flight.in_flight() == 0
+
+        # A later caller starts a fresh flight instead of joining the cancelled one.
+        async def fresh(notify):
+            return "deck"
+        return await flight.do_async("topic", fresh)
+
+    assert asyncio.run(scenario()) == "deck"
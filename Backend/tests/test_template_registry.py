@@ -0,0 +1,68 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+from pptx.util import Inches
+
+from agents.export_agent import _apply_theme, _style_list_level
+from utils.template_registry import (TemplateRegistry, DEFAULT_TEMPLATE, PRESENTATION_MAIN_CONTENT_TYPE,
+                                     TEMPLATE_MAIN_CONTENT_TYPE)
+
+
+def title_font(prs):
+    title_style = prs.slide_master.element.find(qn("p:txStyles")).find(qn("p:titleStyle"))
+    return title_style.find(qn("a:lvl1pPr")).find(qn("a:defRPr")).find(qn("a:latin")).get("typeface")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    # A corporate template: 16:9 at 10 in wide, with Georgia titles in its master.
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(10), Inches(5.625)
+    tx_styles = prs.slide_master.element.find(qn("p:txStyles"))
+    _style_list_level(tx_styles.find(qn("p:titleStyle")), {"font": "Georgia", "size": 40, "color": RGBColor(0, 0, 0)})
+    buffer = BytesIO()
+    prs.save(buffer)
+
+    with zipfile.ZipFile(BytesIO(buffer.getvalue())) as source, \
+            zipfile.ZipFile(tmp_path / "corporate.potx", "w") as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == "[Content_Types].xml":
+                content = content.replace(PRESENTATION_MAIN_CONTENT_TYPE, TEMPLATE_MAIN_CONTENT_TYPE)
+            target.writestr(item, content)
+
+    return TemplateRegistry(template_dir=str(tmp_path), prepare=_apply_theme)
+
+
+def test_template_file_keeps_its_branding(registry):
+    prs = registry.new_presentation("corporate")
+
+    assert (prs.slide_width, prs.slide_height) == (Inches(10), Inches(5.625))
+    assert title_font(prs) == "Georgia"
+
+
+def test_default_template_is_themed(registry):
+    prs = registry.new_presentation(DEFAULT_TEMPLATE)
+
+    assert (prs.slide_width, prs.slide_height) == (Inches(13.33), Inches(7.5))
+    assert title_font(prs) == "Calibri"
+
+
+def test_copies_are_independent(registry):
+    first = registry.new_presentation("corporate")
+    first.slides.add_slide(first.slide_layouts[0])
+
+    assert len(registry.new_presentation("corporate").slides) == 0
+    assert registry.stats()["loads"] == 1
+
+
+def test_unknown_template_raises(registry):
+    with pytest.raises(KeyError):
+        registry.new_presentation("missing")
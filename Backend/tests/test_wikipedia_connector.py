@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from connectors.wikipedia_connector import WikipediaClient
+from utils.research_cache import STATUS_FOUND, STATUS_MISSING, STATUS_DISAMBIGUATION
+
+
+class FakeApi:
+    """Answers extract and search queries; only titles starting with "Page" exist."""
+
+    def __init__(self):
+        self.calls = []
+        self.searching = 0
+        self.max_searching = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, params):
+        with self.lock:
+            self.calls.append(params)
+        if params.get("list") == "search":
+            with self.lock:
+                self.searching += 1
+                self.max_searching = max(self.max_searching, self.searching)
+            time.sleep(0.05)
+            with self.lock:
+                self.searching -= 1
+            query = params["srsearch"]
+            return {"query": {"search": [] if "nothing" in query else [{"title": f"Page {query}"}]}}
+
+        pages = []
+        for title in params["titles"].split("|"):
+            if title.startswith("Page"):
+                props = {"disambiguation": ""} if "Mercury" in title else {}
+                pages.append({"title": title, "extract": f"About {title}.", "pageprops": props})
+            else:
+                pages.append({"title": title, "missing": True})
+        return {"query": {"pages": pages}}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = WikipediaClient(pool_size=8)
+    api = FakeApi()
+    monkeypatch.setattr(client, "_get", api)
+    return client, api
+
+
+def test_extracts_are_batched(client):
+    client, api = client
+    results = client.extracts([f"Page {n}" for n in range(45)])
+
+    assert len(api.calls) == 3
+    assert results["Page 7"] == (STATUS_FOUND, "Page 7", "About Page 7.")
+
+
+def test_missing_titles_are_searched_concurrently(client):
+    client, api = client
+    topics = ["Page one", "Page Mercury"] + [f"topic {n}" for n in range(6)] + ["nothing here", ""]
+    results = client.summaries(topics)
+
+    searches = [call for call in api.calls if call.get("list") == "search"]
+    assert len(searches) == 7
+    assert api.max_searching > 1
+    # One batched extract for the topics, one for all search suggestions.
+    assert len(api.calls) - len(searches) == 2
+
+    assert results["topic 3"] == (STATUS_FOUND, "Page topic 3", "About Page topic 3.")
+    assert results["Page Mercury"][0] == STATUS_DISAMBIGUATION
+    assert results["nothing here"][0] == STATUS_MISSING
+    assert results[""][0] == STATUS_MISSING
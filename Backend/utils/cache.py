@@ -0,0 +1,182 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from utils.helpers import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CACHE_DIR = os.getenv("SLIDEMAGE_CACHE_DIR", os.path.join(BACKEND_DIR, ".cache", "slidemage"))
+DECK_CACHE_MAX_ENTRIES = int(os.getenv("SLIDEMAGE_DECK_CACHE_ENTRIES", "256"))
+DECK_CACHE_MEMORY_BYTES = int(os.getenv("SLIDEMAGE_DECK_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+DECK_CACHE_DISK_BYTES = int(os.getenv("SLIDEMAGE_DECK_CACHE_DISK_MB", "512")) * 1024 * 1024
+DECK_CACHE_TTL_SECONDS = int(os.getenv("SLIDEMAGE_DECK_CACHE_TTL_SECONDS", "86400"))
+
+
+def make_deck_key(topic: str, bullets_per_slide: int, version: str) -> str:
+    """
+    Cache key for a generated deck.
+
+    `version` should identify everything else that changes the output
+    (model, prompt revision), so stale decks are simply never looked up again.
+    """
+    raw = f"{normalize_topic(topic)}|{bullets_per_slide}|{version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DeckCache:
+    """
+    Two-tier cache of exported decks.
+
+    The memory tier is an LRU bounded by entry count and total bytes. The disk
+    tier stores one file per key, expires entries after `ttl` seconds and
+    evicts the oldest files once `disk_quota` bytes are exceeded. A quota of 0
+    disables the disk tier.
+    """
+
+    def __init__(self, max_entries: int = DECK_CACHE_MAX_ENTRIES, max_bytes: int = DECK_CACHE_MEMORY_BYTES,
+                 cache_dir: str = os.path.join(CACHE_DIR, "decks"), ttl: int = DECK_CACHE_TTL_SECONDS,
+                 disk_quota: int = DECK_CACHE_DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.disk_quota = disk_quota
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return data
+
+        data = self._read_disk(key)
+
+        with self._lock:
+            if data is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._store_memory(key, data)
+
+        return data
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._counters["stores"] += 1
+            self._store_memory(key, data)
+
+        try:
+            self._write_disk(key, data)
+        except OSError as e:
+            logger.warning(f"Could not write deck cache entry to disk: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._entries)
+            stats["memory_bytes"] = self._memory_bytes
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _store_memory(self, key: str, data: bytes):
+        # Caller holds the lock.
+        if len(data) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._entries[key] = data
+        self._memory_bytes += len(data)
+
+        while self._entries and (len(self._entries) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters["evictions"] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pptx")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.disk_quota <= 0:
+            return None
+
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.unlink(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        if self.disk_quota <= 0 or len(data) > self.disk_quota:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temp file first so concurrent readers never see a partial deck.
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        self._enforce_disk_quota()
+
+    def _enforce_disk_quota(self):
+        now = time.time()
+        files = []
+        total = 0
+
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".pptx"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._unlink_quietly(entry.path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        files.sort()
+        while files and total > self.disk_quota:
+            _, size, path = files.pop(0)
+            self._unlink_quietly(path)
+            total -= size
+
+    @staticmethod
+    def _unlink_quietly(path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+deck_cache = DeckCache()
@@ -0,0 +1,73 @@
+import os
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Overall time budget for a topic workflow; keep it under the clients' 60 s timeout (0 disables).
+WORKFLOW_DEADLINE_SECONDS = float(os.getenv("SLIDEMAGE_WORKFLOW_DEADLINE_SECONDS", "50"))
+
+# Largest share of the overall budget each stage may use. EXPORT_RESERVE_SECONDS is always
+# kept back from the earlier stages so a deck can still be written.
+STAGE_SHARES = {"research": 0.25, "summarize": 1.0}
+EXPORT_RESERVE_SECONDS = float(os.getenv("SLIDEMAGE_EXPORT_RESERVE_SECONDS", "2"))
+
+LATENCY_WINDOW = 200
+# Until this many calls have been seen, DEFAULT_P95_SECONDS stands in for the observed p95.
+LATENCY_MIN_SAMPLES = 20
+DEFAULT_P95_SECONDS = float(os.getenv("SLIDEMAGE_HEDGE_DEFAULT_SECONDS", "8"))
+
+
+class Deadline:
+    """An absolute point in time on the monotonic clock, and the budgets derived from it."""
+
+    def __init__(self, seconds: float):
+        self.total = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def stage_budget(self, stage: str) -> float:
+        """
+        Seconds `stage` may take: its share of the total, but never eating into
+        the export reserve. Time a stage leaves unused carries over to later ones.
+        """
+        available = max(0.0, self.remaining() - EXPORT_RESERVE_SECONDS)
+        return min(available, self.total * STAGE_SHARES.get(stage, 1.0))
+
+    @classmethod
+    def from_seconds(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """A deadline `seconds` from now; None (the default budget) or 0 (no deadline) are resolved here."""
+        if seconds is None:
+            seconds = WORKFLOW_DEADLINE_SECONDS
+        return cls(seconds) if seconds and seconds > 0 else None
+
+
+class LatencyTracker:
+    """Recent call latencies per key (e.g. model name), for hedging at the observed p95."""
+
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = LATENCY_MIN_SAMPLES,
+                 default: float = DEFAULT_P95_SECONDS):
+        self.window = window
+        self.min_samples = min_samples
+        self.default = default
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def p95(self, key: str) -> float:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return self.default
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
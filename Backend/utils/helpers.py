@@ -150,6 +150,10 @@ def format_topic(topic: str) -> str:
     
     return formatted
 
+def normalize_topic(topic: str) -> str:
+    """Canonical form of a topic for cache keys and de-duplication."""
+    return " ".join(format_topic(topic).casefold().split())
+
 def create_backup_content(topic: str) -> List[Dict[str, Any]]:
     
     logger.warning(f"Creating backup content for topic: {topic}")
@@ -0,0 +1,129 @@
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from utils.cache import deck_cache
+from utils.research_cache import research_cache
+from utils.semantic_cache import topic_index
+
+logger = logging.getLogger(__name__)
+
+# Seconds, from fast in-process steps up to slow model calls.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+TOKEN_BUCKETS = (64, 256, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+BYTE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024)
+
+STAGE_DURATION = Histogram(
+    "slidemage_stage_duration_seconds", "Duration of each workflow stage.",
+    ["stage", "outcome"], buckets=LATENCY_BUCKETS,
+)
+WORKFLOW_DURATION = Histogram(
+    "slidemage_workflow_duration_seconds", "Duration of whole workflows.",
+    ["kind", "outcome"], buckets=LATENCY_BUCKETS,
+)
+WORKFLOW_DEGRADED = Counter(
+    "slidemage_workflow_degraded_total", "Stages cut short by the workflow deadline, by stage.", ["stage"],
+)
+WORKFLOWS_IN_FLIGHT = Gauge(
+    "slidemage_workflows_in_flight", "Workflows currently running.", ["kind"],
+)
+GEMINI_LATENCY = Histogram(
+    "slidemage_gemini_request_duration_seconds", "Gemini call latency, including rate-limit waits and retries.",
+    ["mode", "model", "outcome"], buckets=LATENCY_BUCKETS,
+)
+GEMINI_TOKENS = Histogram(
+    "slidemage_gemini_tokens", "Tokens per Gemini call (reported by the API, estimated when missing).",
+    ["direction"], buckets=TOKEN_BUCKETS,
+)
+GEMINI_HEDGES = Counter(
+    "slidemage_gemini_hedges_total", "Hedged Gemini requests sent or skipped, which request won, and budgets that ran out.",
+    ["result"],
+)
+SUMMARIES = Counter(
+    "slidemage_summaries_total", "Summaries produced, by the model or by the fallback summarizer.", ["source"],
+)
+SINGLE_FLIGHT_CALLS = Counter(
+    "slidemage_single_flight_calls_total", "Calls that ran the work (leader) or joined one in flight (follower).",
+    ["name", "role"],
+)
+SINGLE_FLIGHT_WAITERS = Gauge(
+    "slidemage_single_flight_waiters", "Callers currently waiting on another caller's in-flight work.", ["name"],
+)
+EXPORT_BYTES = Histogram(
+    "slidemage_export_bytes", "Size of exported decks.", ["exporter"], buckets=BYTE_BUCKETS,
+)
+SEMANTIC_LOOKUP_DURATION = Histogram(
+    "slidemage_semantic_lookup_seconds", "Duration of similar-topic lookups in the topic index.",
+    ["result"], buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def track_workflow(kind: str) -> Iterator[None]:
+    """Count a workflow as in flight while the block runs and record its duration and outcome."""
+    start = time.perf_counter()
+    WORKFLOWS_IN_FLIGHT.labels(kind).inc()
+    outcome = "failed"
+    try:
+        yield
+        outcome = "succeeded"
+    finally:
+        WORKFLOWS_IN_FLIGHT.labels(kind).dec()
+        WORKFLOW_DURATION.labels(kind, outcome).observe(time.perf_counter() - start)
+
+
+def observe_gemini_call(mode: str, model: str, outcome: str, duration: float, prompt_tokens: int,
+                        response: Any = None):
+    GEMINI_LATENCY.labels(mode, model, outcome).observe(duration)
+    usage = getattr(response, "usage_metadata", None)
+    GEMINI_TOKENS.labels("prompt").observe(getattr(usage, "prompt_token_count", 0) or prompt_tokens)
+    if response is not None:
+        response_tokens = getattr(usage, "candidates_token_count", 0)
+        if not response_tokens:
+            try:
+                response_tokens = len(response.text or "") // 4 + 1
+            except Exception:
+                # .text raises when the response was blocked and has no parts.
+                response_tokens = 0
+        GEMINI_TOKENS.labels("response").observe(response_tokens)
+
+
+class _CacheCollector:
+    """Reads the cache counters at scrape time, so lookups themselves pay nothing extra."""
+
+    def collect(self):
+        lookups = CounterMetricFamily("slidemage_cache_lookups", "Cache lookups by result.", labels=["cache", "result"])
+        ratio = GaugeMetricFamily("slidemage_cache_hit_ratio", "Share of lookups served from cache.", labels=["cache"])
+
+        deck = deck_cache.stats()
+        for result in ("memory_hits", "disk_hits", "misses"):
+            lookups.add_metric(["deck", result], deck[result])
+        ratio.add_metric(["deck"], deck["hit_ratio"])
+
+        research = research_cache.stats()
+        for result in ("hits", "negative_hits", "misses"):
+            lookups.add_metric(["research", result], research[result])
+        total = research["hits"] + research["negative_hits"] + research["misses"]
+        ratio.add_metric(["research"], (research["hits"] + research["negative_hits"]) / total if total else 0.0)
+
+        topics = topic_index.stats()
+        for result in ("hits", "misses"):
+            lookups.add_metric(["topics", result], topics[result])
+        ratio.add_metric(["topics"], topics["hit_ratio"])
+        entries = GaugeMetricFamily("slidemage_semantic_index_entries", "Topics in the semantic topic index.")
+        entries.add_metric([], topics["entries"])
+        build = GaugeMetricFamily("slidemage_semantic_index_build_seconds", "Time the topic index took to rebuild.")
+        build.add_metric([], topics["build_seconds"])
+
+        yield lookups
+        yield ratio
+        yield entries
+        yield build
+
+
+REGISTRY.register(_CacheCollector())
+
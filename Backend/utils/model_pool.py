@@ -0,0 +1,44 @@
+import threading
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPool:
+    """
+    Model clients created once per model name and shared by every call.
+
+    Building a client per request repeats its setup and, for the async API,
+    opens a fresh channel; a pooled client keeps its connections open
+    between calls. `factory` builds the client for a model name.
+    """
+
+    def __init__(self, factory: Callable[[str], Any]):
+        self.factory = factory
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "reused": 0}
+
+    def get(self, name: str) -> Any:
+        with self._lock:
+            model = self._models.get(name)
+            if model is not None:
+                self._counters["reused"] += 1
+                return model
+
+            model = self.factory(name)
+            self._models[name] = model
+            self._counters["created"] += 1
+        logger.info(f"Created model client for {name}")
+        return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["models"] = len(self._models)
+        return stats
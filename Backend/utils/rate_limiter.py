@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import asyncio
+import random
+import threading
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("SLIDEMAGE_GEMINI_RPM", "60"))
+GEMINI_TOKENS_PER_MINUTE = float(os.getenv("SLIDEMAGE_GEMINI_TPM", "1000000"))
+# When set, the bucket state lives in this file so every worker process shares one budget.
+RATE_LIMIT_STATE_PATH = os.getenv("SLIDEMAGE_RATE_LIMIT_STATE_PATH", "")
+
+BACKOFF_MAX_RETRIES = int(os.getenv("SLIDEMAGE_BACKOFF_MAX_RETRIES", "4"))
+BACKOFF_BASE_DELAY = float(os.getenv("SLIDEMAGE_BACKOFF_BASE_DELAY", "1.0"))
+BACKOFF_MAX_DELAY = float(os.getenv("SLIDEMAGE_BACKOFF_MAX_DELAY", "30.0"))
+
+RETRYABLE_STATUS_CODES = (429, 503)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for budgeting."""
+    return len(text) // 4 + 1
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket limiter over two budgets: requests per minute and tokens per minute.
+
+    Callers only wait when a bucket is actually empty; while there is budget
+    left, acquire() returns immediately. With `state_path` the bucket levels
+    are kept in a small file guarded by an exclusive lock so the limit applies
+    across processes, otherwise they are process-local.
+    """
+
+    def __init__(self, requests_per_minute: float = GEMINI_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = GEMINI_TOKENS_PER_MINUTE,
+                 state_path: Optional[str] = RATE_LIMIT_STATE_PATH or None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._state = {"requests": requests_per_minute, "tokens": tokens_per_minute, "updated": time.time()}
+        self._counters = {"acquired": 0, "throttled": 0}
+
+    def acquire(self, tokens: int = 0):
+        """Block until one request carrying `tokens` tokens fits in the budget."""
+        throttled = False
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                break
+            throttled = True
+            time.sleep(wait)
+
+        with self._lock:
+            self._counters["acquired"] += 1
+            if throttled:
+                self._counters["throttled"] += 1
+
+    async def acquire_async(self, tokens: int = 0):
+        """Like acquire(), but waits with asyncio.sleep so the event loop keeps running."""
+        throttled = False
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                break
+            throttled = True
+            await asyncio.sleep(wait)
+
+        with self._lock:
+            self._counters["acquired"] += 1
+            if throttled:
+                self._counters["throttled"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Consume budget and return 0, or return how long to wait before retrying."""
+        if self.state_path:
+            return self._try_acquire_shared(tokens)
+
+        with self._lock:
+            self._state, wait = self._consume(self._state, tokens)
+            return wait
+
+    def _try_acquire_shared(self, tokens: int) -> float:
+        import fcntl
+
+        with open(self.state_path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else None
+                except ValueError:
+                    state = None
+                if state is None:
+                    state = {"requests": self.requests_per_minute, "tokens": self.tokens_per_minute,
+                             "updated": time.time()}
+
+                state, wait = self._consume(state, tokens)
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _consume(self, state: Dict[str, float], tokens: int) -> Tuple[Dict[str, float], float]:
+        now = time.time()
+        elapsed = max(0.0, now - state["updated"])
+
+        request_rate = self.requests_per_minute / 60.0
+        token_rate = self.tokens_per_minute / 60.0
+
+        requests_level = min(self.requests_per_minute, state["requests"] + elapsed * request_rate)
+        tokens_level = min(self.tokens_per_minute, state["tokens"] + elapsed * token_rate)
+
+        # A single call larger than the whole budget is allowed once the bucket is full.
+        needed_tokens = min(float(tokens), self.tokens_per_minute)
+
+        wait = 0.0
+        if requests_level < 1:
+            wait = max(wait, (1 - requests_level) / request_rate)
+        if tokens_level < needed_tokens:
+            wait = max(wait, (needed_tokens - tokens_level) / token_rate)
+
+        if wait <= 0:
+            requests_level -= 1
+            tokens_level -= needed_tokens
+
+        return {"requests": requests_level, "tokens": tokens_level, "updated": now}, wait
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for quota (429) and overload (503) errors from the Gemini client."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable")
+
+
+def backoff_delay(attempt: int, base_delay: float = BACKOFF_BASE_DELAY, max_delay: float = BACKOFF_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_backoff(fn: Callable[..., Any], *args, max_retries: int = BACKOFF_MAX_RETRIES, **kwargs) -> Any:
+    """Call fn, retrying 429/503 errors with exponential backoff and jitter."""
+    attempt = 0
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"Retryable error from model ({str(e)}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+async def call_with_backoff_async(coro_fn: Callable[[], Awaitable[Any]], max_retries: int = BACKOFF_MAX_RETRIES) -> Any:
+    """Async counterpart of call_with_backoff; coro_fn is called once per attempt."""
+    attempt = 0
+    while True:
+        try:
+            return await coro_fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"Retryable error from model ({str(e)}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+gemini_rate_limiter = TokenBucketRateLimiter()
@@ -0,0 +1,121 @@
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+from utils.cache import CACHE_DIR
+from utils.helpers import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+RESEARCH_CACHE_PATH = os.getenv("SLIDEMAGE_RESEARCH_CACHE_PATH", os.path.join(CACHE_DIR, "research.sqlite3"))
+RESEARCH_HIT_TTL_SECONDS = int(os.getenv("SLIDEMAGE_RESEARCH_HIT_TTL_SECONDS", str(7 * 24 * 3600)))
+RESEARCH_MISS_TTL_SECONDS = int(os.getenv("SLIDEMAGE_RESEARCH_MISS_TTL_SECONDS", str(24 * 3600)))
+
+STATUS_FOUND = "found"
+STATUS_MISSING = "missing"
+STATUS_DISAMBIGUATION = "disambiguation"
+
+
+class ResearchCache:
+    """
+    SQLite-backed cache of Wikipedia lookups, shared by all worker processes.
+
+    Entries are keyed by (source, language, normalized title). Successful
+    lookups live for `hit_ttl` seconds; "no page" and disambiguation results
+    are cached too, for `miss_ttl` seconds, so known-bad topics are not
+    re-queried on every request.
+    """
+
+    def __init__(self, path: str = RESEARCH_CACHE_PATH, hit_ttl: int = RESEARCH_HIT_TTL_SECONDS,
+                 miss_ttl: int = RESEARCH_MISS_TTL_SECONDS):
+        self.path = path
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "negative_hits": 0, "misses": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # One connection per thread; WAL lets readers in other processes proceed during writes.
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS research (
+                    source TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (source, language, title)
+                )
+                """
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, source: str, language: str, title: str) -> Optional[Tuple[str, str]]:
+        """Return (status, content) for a live entry, or None on a miss."""
+        try:
+            row = self._connection().execute(
+                "SELECT status, content, expires_at FROM research WHERE source = ? AND language = ? AND title = ?",
+                (source, language, normalize_topic(title)),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Research cache lookup failed: {str(e)}")
+            self._count("errors")
+            return None
+
+        if row is None or row[2] < time.time():
+            self._count("misses")
+            return None
+
+        self._count("hits" if row[0] == STATUS_FOUND else "negative_hits")
+        return row[0], row[1]
+
+    def put(self, source: str, language: str, title: str, status: str, content: str = ""):
+        ttl = self.hit_ttl if status == STATUS_FOUND else self.miss_ttl
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO research (source, language, title, status, content, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, language, normalize_topic(title), status, content, time.time() + ttl),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Research cache write failed: {str(e)}")
+            self._count("errors")
+
+    def purge_expired(self) -> int:
+        try:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM research WHERE expires_at < ?", (time.time(),)).rowcount
+            conn.commit()
+            return deleted
+        except sqlite3.Error as e:
+            logger.warning(f"Research cache purge failed: {str(e)}")
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+research_cache = ResearchCache()
@@ -0,0 +1,338 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from utils.cache import CACHE_DIR, DECK_CACHE_TTL_SECONDS
+from utils.helpers import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_INDEX_PATH = os.getenv("SLIDEMAGE_SEMANTIC_INDEX_PATH", os.path.join(CACHE_DIR, "topics.jsonl"))
+# Cosine similarity above which a cached deck is reused for a differently worded topic (0 disables).
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SLIDEMAGE_SEMANTIC_CACHE_THRESHOLD", "0.8"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SLIDEMAGE_SEMANTIC_CACHE_ENTRIES", "5000"))
+EMBEDDING_DIM = 1024
+
+# Words that frame a topic without changing its subject ("Intro to X", "X basics").
+FILLER_WORDS = frozenset("""
+a an the of to in on for and about with what is are how why
+intro introduction introductory basic basics fundamental fundamentals overview primer guide beginner
+beginners essentials principles concepts understanding tutorial crash course 101 explained
+""".split())
+# A topic written as an upper-case acronym ("Intro to ML") matches a cached topic of this many
+# content words or fewer whose initials spell it exactly ("Machine learning"), and vice versa.
+ACRONYM_MAX_WORDS = 4
+
+_WORD = re.compile(r"[^\W_]+")
+# Numbers and roman numerals stay whole in acronyms, so "World War I" and "World War II" differ.
+_NUMERAL = re.compile(r"\d+|[ivxlc]+")
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def content_words(topic: str) -> List[str]:
+    """The stemmed words of a topic, without filler words."""
+    words = [_stem(word) for word in _WORD.findall(normalize_topic(topic)) if word not in FILLER_WORDS]
+    # Nothing but filler ("Introduction"): fall back to the words themselves.
+    return words or _WORD.findall(normalize_topic(topic))
+
+
+def expansion_acronym(topic: str) -> Optional[str]:
+    """Initials of a topic of 2 to ACRONYM_MAX_WORDS content words ("World War II" -> "wwii"), else None."""
+    words = content_words(topic)
+    if not 2 <= len(words) <= ACRONYM_MAX_WORDS:
+        return None
+    return "".join(word if _NUMERAL.fullmatch(word) else word[0] for word in words)
+
+
+def bare_acronym(topic: str) -> Optional[str]:
+    """
+    The acronym a topic consists of ("Intro to ML" -> "ml"), or None. Only a
+    single content word written in capitals counts, so "Go basics" is not one.
+    """
+    words = content_words(topic)
+    if len(words) != 1 or not 2 <= len(words[0]) <= ACRONYM_MAX_WORDS + 2:
+        return None
+    capitals = {word.casefold() for word in _WORD.findall(topic) if word.isupper()}
+    return words[0] if words[0] in capitals else None
+
+
+def topic_features(topic: str) -> Dict[str, float]:
+    """Features of a topic: its content words, counted."""
+    features: Dict[str, float] = {}
+    for word in content_words(topic):
+        features[f"w:{word}"] = features.get(f"w:{word}", 0.0) + 1.0
+    return features
+
+
+def embed_topics(topics: List[str]):
+    """
+    L2-normalized hashing-vectorizer embeddings, one float32 row per topic.
+
+    Features are hashed with BLAKE2 (stable across processes, unlike hash(),
+    and without CRC32's habit of colliding on strings that differ by a suffix),
+    with a sign bit so colliding features tend to cancel rather than add up.
+    """
+    import numpy as np
+
+    matrix = np.zeros((len(topics), EMBEDDING_DIM), dtype=np.float32)
+    for row, topic in enumerate(topics):
+        for feature, weight in topic_features(topic).items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            matrix[row, digest % EMBEDDING_DIM] += weight if digest >> 63 else -weight
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    return matrix
+
+
+class _Group:
+    """
+    Entries sharing slide size and deck version, with their embeddings as one
+    matrix and their acronyms: `expansions` maps initials to the multi-word
+    topics they spell, `acronyms` maps a bare acronym topic to itself.
+    """
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix = None
+        # Content words per row, parallel to `entries`.
+        self.words: List[FrozenSet[str]] = []
+        self.expansions: Dict[str, Set[str]] = {}
+        self.acronyms: Dict[str, Set[str]] = {}
+
+    def index_acronyms(self, entry: Dict[str, Any]):
+        expansion = expansion_acronym(entry["topic"])
+        if expansion:
+            self.expansions.setdefault(expansion, set()).add(entry["topic"])
+        if entry.get("acronym"):
+            self.acronyms.setdefault(entry["acronym"], set()).add(entry["topic"])
+
+
+class TopicIndex:
+    """
+    In-memory vector index of generated topics, for reusing a deck's slides
+    when a new topic is worded differently but means the same thing
+    ("Machine learning", "machine-learning basics", "Intro to ML").
+
+    Topics are embedded with a hashing vectorizer, so vectors never need to
+    be stored: the index persists as an append-only JSON-lines file of topics
+    and slides under `path` and is rebuilt from it on first use. Lookups only
+    compare against entries with the same slide size and deck version.
+    A match must also have exactly the query's content words, so a topic
+    with an extra qualifier ("Machine learning in healthcare") never reuses
+    the broader deck, nor the other way round; the cosine ranks candidates
+    and absorbs repeated words. Acronyms are not embedded; they match only a cached topic whose initials
+    spell them exactly, and only when exactly one such topic is cached, so
+    "PC" never guesses between "personal computer" and "political correctness".
+    `threshold` 0 disables lookups.
+    """
+
+    def __init__(self, path: str = SEMANTIC_INDEX_PATH, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES, ttl: int = DECK_CACHE_TTL_SECONDS):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._groups: Dict[Tuple[int, str], _Group] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0}
+        self._build_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def load(self):
+        """Rebuild the index from disk, if that has not happened yet."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._build(self._read_entries())
+                self._loaded = True
+
+    def lookup(self, topic: str, bullets_per_slide: int, version: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (entry, similarity) of the closest live topic above the threshold, or None."""
+        import numpy as np
+
+        if not self.enabled:
+            return None
+        self.load()
+
+        query = embed_topics([topic])[0]
+        words = frozenset(content_words(topic))
+        with self._lock:
+            group = self._groups.get((bullets_per_slide, version))
+            match = None
+            if group is not None and group.entries:
+                similarities = group.matrix[:len(group.entries)] @ query
+                # Best first, so an expired best match gives way to the next live one.
+                for row in sorted(np.flatnonzero(similarities >= self.threshold), key=lambda r: -similarities[r]):
+                    entry = group.entries[row]
+                    if group.words[row] == words and self._live(entry):
+                        match = entry, float(similarities[row])
+                        break
+                else:
+                    match = self._acronym_match(group, topic)
+            self._counters["hits" if match else "misses"] += 1
+        return match
+
+    def add(self, topic: str, bullets_per_slide: int, version: str, slides: List[Dict[str, Any]]):
+        if not self.enabled:
+            return
+        self.load()
+
+        entry = {"topic": normalize_topic(topic), "bullets_per_slide": bullets_per_slide, "version": version,
+                 "slides": slides, "created": time.time()}
+        acronym = bare_acronym(topic)
+        if acronym:
+            # Capitalization is lost in the normalized topic, so remember that it was an acronym.
+            entry["acronym"] = acronym
+        with self._lock:
+            self._counters["stores"] += 1
+            self._insert(entry)
+            compact = self._size() > self.max_entries * 1.1
+            try:
+                if compact:
+                    self._compact()
+                else:
+                    self._append(entry)
+            except OSError as e:
+                logger.warning(f"Could not persist semantic topic index: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["entries"] = self._size()
+            stats["build_seconds"] = round(self._build_seconds, 4)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _live(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["created"] <= self.ttl
+
+    def _acronym_match(self, group: _Group, topic: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        # Caller holds the lock.
+        acronym = bare_acronym(topic)
+        if acronym:
+            candidates = group.expansions.get(acronym, set())
+        else:
+            expansion = expansion_acronym(topic)
+            candidates = group.acronyms.get(expansion, set()) if expansion else set()
+
+        live = [group.entries[group.rows[candidate]] for candidate in candidates]
+        live = [entry for entry in live if self._live(entry)]
+        # Ambiguous acronyms are a miss rather than a guess.
+        return (live[0], 1.0) if len(live) == 1 else None
+
+    def _size(self) -> int:
+        # Caller holds the lock.
+        return sum(len(group.entries) for group in self._groups.values())
+
+    def _insert(self, entry: Dict[str, Any]):
+        # Caller holds the lock.
+        import numpy as np
+
+        group = self._groups.setdefault((entry["bullets_per_slide"], entry["version"]), _Group())
+        row = group.rows.get(entry["topic"])
+        if row is not None:
+            group.entries[row] = entry
+            group.words[row] = frozenset(content_words(entry["topic"]))
+            group.index_acronyms(entry)
+            return
+
+        vector = embed_topics([entry["topic"]])[0]
+        if group.matrix is None or len(group.entries) == group.matrix.shape[0]:
+            # Grow by doubling so adds stay amortized O(1).
+            grown = np.zeros((max(16, 2 * len(group.entries)), EMBEDDING_DIM), dtype=np.float32)
+            if group.matrix is not None:
+                grown[:len(group.entries)] = group.matrix[:len(group.entries)]
+            group.matrix = grown
+        group.rows[entry["topic"]] = len(group.entries)
+        group.matrix[len(group.entries)] = vector
+        group.entries.append(entry)
+        group.words.append(frozenset(content_words(entry["topic"])))
+        group.index_acronyms(entry)
+
+    def _build(self, entries: List[Dict[str, Any]]):
+        # Caller holds the lock.
+        start = time.perf_counter()
+        self._groups = {}
+        by_key: Dict[Tuple[int, str], Dict[str, Dict[str, Any]]] = {}
+        for entry in entries:
+            by_key.setdefault((entry["bullets_per_slide"], entry["version"]), {})[entry["topic"]] = entry
+
+        for key, latest in by_key.items():
+            group = self._groups[key] = _Group()
+            group.entries = list(latest.values())
+            group.rows = {entry["topic"]: row for row, entry in enumerate(group.entries)}
+            group.words = [frozenset(content_words(entry["topic"])) for entry in group.entries]
+            for entry in group.entries:
+                group.index_acronyms(entry)
+            # One batched embedding per group rather than a row at a time.
+            group.matrix = embed_topics([entry["topic"] for entry in group.entries])
+
+        self._build_seconds = time.perf_counter() - start
+        logger.info(f"Built semantic topic index: {len(entries)} entries in {self._build_seconds * 1000:.1f} ms")
+
+    def _read_entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        cutoff = time.time() - self.ttl
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append.
+                        continue
+                    if entry.get("created", 0) >= cutoff:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not read semantic topic index: {str(e)}")
+        return entries[-self.max_entries:]
+
+    def _append(self, entry: Dict[str, Any]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _compact(self):
+        # Caller holds the lock. Keep the newest entries and rewrite the file atomically.
+        entries = sorted((e for g in self._groups.values() for e in g.entries), key=lambda e: e["created"])
+        entries = entries[-self.max_entries:]
+        self._build(entries)
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+topic_index = TopicIndex()
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from utils.metrics import SINGLE_FLIGHT_CALLS, SINGLE_FLIGHT_WAITERS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Listener = Callable[[Any], None]
+Notify = Callable[[Any], None]
+
+
+def _retrieve(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
+
+
+class _Flight:
+    def __init__(self, key: str):
+        self.key = key
+        self.future: Future = Future()
+        # Running futures cannot be cancelled, so no waiter can cancel the shared result.
+        self.future.set_running_or_notify_cancel()
+        self.listeners: List[Listener] = []
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs the work; callers arriving
+    while it is in flight attach to it and receive the same result or
+    exception. The work function is passed a `notify` callable that forwards
+    progress events to every attached caller's listener. Sync and async
+    callers can share a flight. An async flight runs as its own task and is
+    only cancelled once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[Notify], T], listener: Optional[Listener] = None) -> T:
+        """Run fn(notify) in this thread, or wait for the identical call already in flight."""
+        flight, leader = self._join(key, listener)
+        if not leader:
+            try:
+                return flight.future.result()
+            finally:
+                self._leave(flight, leader)
+
+        try:
+            result = fn(lambda event: self._notify(flight, event))
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            raise
+        self._finish(key, flight, result=result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[Notify], Awaitable[T]],
+                       listener: Optional[Listener] = None) -> T:
+        """Await fn(notify) as a shared task, or the identical call already in flight."""
+        flight, leader = self._join(key, listener)
+        if leader:
+            flight.task = asyncio.ensure_future(fn(lambda event: self._notify(flight, event)))
+            flight.task.add_done_callback(lambda task: self._finish_task(key, flight, task))
+
+        result = asyncio.wrap_future(flight.future)
+        # A cancelled caller no longer awaits it, so retrieve the outcome to keep asyncio from warning.
+        result.add_done_callback(_retrieve)
+        cancelled = False
+        try:
+            return await asyncio.shield(result)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            remaining = self._leave(flight, leader)
+            if cancelled and remaining == 0 and flight.task is not None:
+                flight.task.cancel()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def _join(self, key: str, listener: Optional[Listener]):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight(key)
+                self._flights[key] = flight
+            flight.waiters += 1
+            if listener is not None:
+                flight.listeners.append(listener)
+
+        SINGLE_FLIGHT_CALLS.labels(self.name, "leader" if leader else "follower").inc()
+        if not leader:
+            SINGLE_FLIGHT_WAITERS.labels(self.name).inc()
+            logger.info(f"Joined in-flight {self.name} request ({flight.waiters} callers)")
+        return flight, leader
+
+    def _leave(self, flight: _Flight, leader: bool) -> int:
+        """Detach a caller and return how many are still waiting on the flight."""
+        if not leader:
+            SINGLE_FLIGHT_WAITERS.labels(self.name).dec()
+        with self._lock:
+            flight.waiters -= 1
+            # Everyone gave up on it: later callers must start afresh, not join a cancelled flight.
+            if flight.waiters == 0 and self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            return flight.waiters
+
+    def _notify(self, flight: _Flight, event: Any):
+        with self._lock:
+            listeners = list(flight.listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Single-flight listener failed: {str(e)}")
+
+    def _finish(self, key: str, flight: _Flight, result: Any = None, error: Optional[BaseException] = None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(result)
+
+    def _finish_task(self, key: str, flight: _Flight, task: asyncio.Task):
+        if task.cancelled():
+            self._finish(key, flight, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish(key, flight, error=task.exception())
+        else:
+            self._finish(key, flight, result=task.result())
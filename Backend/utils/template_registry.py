@@ -0,0 +1,164 @@
+import os
+import copy
+import zipfile
+import threading
+import logging
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pptx import Presentation
+
+from utils.cache import BACKEND_DIR
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.getenv("SLIDEMAGE_TEMPLATE_DIR", os.path.join(BACKEND_DIR, "templates"))
+DEFAULT_TEMPLATE = "default"
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+TEMPLATE_MAIN_CONTENT_TYPE = b"application/vnd.openxmlformats-officedocument.presentationml.template.main+xml"
+PRESENTATION_MAIN_CONTENT_TYPE = b"application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"
+
+
+def open_template_package(path: str) -> BytesIO:
+    """
+    Read a .pptx or .potx file into memory so python-pptx can open it.
+
+    python-pptx refuses the template content type that .potx files declare for
+    their main part, so it is rewritten to the presentation content type.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not path.lower().endswith(".potx"):
+        return BytesIO(data)
+
+    source = zipfile.ZipFile(BytesIO(data))
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == CONTENT_TYPES_PART:
+                content = content.replace(TEMPLATE_MAIN_CONTENT_TYPE, PRESENTATION_MAIN_CONTENT_TYPE)
+            target.writestr(item, content)
+    output.seek(0)
+    return output
+
+
+def _drop_slides(prs: Presentation):
+    slide_ids = prs.slides._sldIdLst
+    for slide_id in list(slide_ids):
+        prs.part.drop_rel(slide_id.rId)
+        slide_ids.remove(slide_id)
+
+
+class TemplateRegistry:
+    """
+    Parsed presentation templates kept in memory and copied per export.
+
+    Templates are the built-in python-pptx default plus every .potx/.pptx file
+    in `template_dir`, named by file stem. Each (template, theme) pair is
+    loaded once and emptied of slides; the built-in default is also passed to
+    `prepare` (which sizes and styles it), while template files keep their own
+    slide size, fonts and colours. new_presentation() then returns an
+    independent deep copy of that prototype, which is much cheaper than
+    unzipping and parsing again.
+    """
+
+    def __init__(self, template_dir: str = TEMPLATE_DIR,
+                 prepare: Optional[Callable[[Presentation, str], None]] = None):
+        self.template_dir = template_dir
+        self.prepare = prepare
+        self._prototypes: Dict[Tuple[str, str], Presentation] = {}
+        self._packages: Dict[Tuple[str, str], bytes] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._counters = {"loads": 0, "copies": 0}
+
+    def template_names(self) -> List[str]:
+        names = [DEFAULT_TEMPLATE]
+        if os.path.isdir(self.template_dir):
+            for filename in sorted(os.listdir(self.template_dir)):
+                stem, extension = os.path.splitext(filename)
+                if extension.lower() in (".potx", ".pptx") and stem not in names:
+                    names.append(stem)
+        return names
+
+    def preload(self, themes: List[str]):
+        """Parse every template for every theme up front, e.g. at startup."""
+        for name in self.template_names():
+            for theme in themes:
+                try:
+                    self._prototype(name, theme)
+                except Exception as e:
+                    logger.error(f"Could not load template '{name}': {str(e)}")
+        logger.info(f"Loaded {len(self._prototypes)} presentation templates")
+
+    def new_presentation(self, name: str = DEFAULT_TEMPLATE, theme: str = "default") -> Presentation:
+        """Return an empty presentation built from the named template, ready to add slides to."""
+        prs = copy.deepcopy(self._prototype(name, theme))
+        with self._lock:
+            self._counters["copies"] += 1
+        return prs
+
+    def package(self, name: str = DEFAULT_TEMPLATE, theme: str = "default") -> bytes:
+        """The prepared, slide-less template as .pptx bytes, for writers that bypass python-pptx."""
+        key = (name, theme)
+        self._prototype(name, theme)
+        with self._lock:
+            return self._packages[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["templates"] = len(self._prototypes)
+        return stats
+
+    def _prototype(self, name: str, theme: str) -> Presentation:
+        key = (name, theme)
+        with self._lock:
+            prototype = self._prototypes.get(key)
+            if prototype is not None:
+                return prototype
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._lock:
+                prototype = self._prototypes.get(key)
+            if prototype is None:
+                package = self._load(name, theme)
+                # python-pptx caches proxies holding sub-elements of a part's
+                # XML, and deepcopy would copy those apart from the part they
+                # belong to. The prototype is therefore loaded fresh from the
+                # prepared package and used for nothing but copying.
+                prototype = Presentation(BytesIO(package))
+                with self._lock:
+                    self._packages[key] = package
+                    self._prototypes[key] = prototype
+                    self._counters["loads"] += 1
+        return prototype
+
+    def _load(self, name: str, theme: str) -> bytes:
+        if name == DEFAULT_TEMPLATE:
+            prs = Presentation()
+        else:
+            path = self._find(name)
+            if path is None:
+                raise KeyError(f"Unknown presentation template: {name}")
+            prs = Presentation(open_template_package(path))
+
+        _drop_slides(prs)
+        # Template files carry their own branding, which a theme would overwrite.
+        if self.prepare is not None and name == DEFAULT_TEMPLATE:
+            self.prepare(prs, theme)
+
+        buffer = BytesIO()
+        prs.save(buffer)
+        return buffer.getvalue()
+
+    def _find(self, name: str) -> Optional[str]:
+        for extension in (".potx", ".pptx"):
+            path = os.path.join(self.template_dir, name + extension)
+            if os.path.isfile(path):
+                return path
+        return None
@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import asyncio
+import zipfile
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from agents import research_agent
+from workflows.slide_workflow import prepare_slides, deck_version, resolve_offline
+from utils.cache import deck_cache, make_deck_key
+from utils.helpers import clean_filename, normalize_topic
+from utils.metrics import EXPORT_BYTES
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_TOPICS = int(os.getenv("SLIDEMAGE_BATCH_MAX_TOPICS", "200"))
+BATCH_CONCURRENCY = int(os.getenv("SLIDEMAGE_BATCH_CONCURRENCY", "8"))
+BATCH_EXPORT_PROCESSES = int(os.getenv("SLIDEMAGE_BATCH_EXPORT_PROCESSES", str(os.cpu_count() or 2)))
+
+_export_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_export_pool() -> ProcessPoolExecutor:
+    global _export_pool
+    if _export_pool is None:
+        # Spawned (not forked) workers only import the export agent, and never
+        # inherit locks held by the server's threads.
+        _export_pool = ProcessPoolExecutor(
+            max_workers=BATCH_EXPORT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _export_pool
+
+
+def shutdown_export_pool():
+    global _export_pool
+    if _export_pool is not None:
+        _export_pool.shutdown(wait=False, cancel_futures=True)
+        _export_pool = None
+
+
+def dedupe_topics(topics: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Group topics by their normalized form, keeping first-seen order.
+
+    Returns (topic, duplicates) pairs where `topic` is the first spelling seen
+    and `duplicates` lists the other submitted spellings that map to it.
+    """
+    groups: Dict[str, Tuple[str, List[str]]] = {}
+    for topic in topics:
+        if not topic or not topic.strip():
+            continue
+        key = normalize_topic(topic)
+        if key in groups:
+            groups[key][1].append(topic)
+        else:
+            groups[key] = (topic.strip(), [])
+    return list(groups.values())
+
+
+class _ZipStream:
+    """Write-only sink for zipfile; buffers output until drained so it can be streamed."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unique_name(name: str, used: set) -> str:
+    candidate = name
+    n = 2
+    while candidate in used:
+        candidate = f"{name}_{n}"
+        n += 1
+    used.add(candidate)
+    return candidate
+
+
+async def _build_one(topic: str, bullets_per_slide: int, semaphore: asyncio.Semaphore,
+                     offline: bool) -> Dict[str, Any]:
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {"topic": topic, "status": "ok", "error": None}
+
+    cache_key = make_deck_key(topic, bullets_per_slide, deck_version(offline))
+    data = deck_cache.get(cache_key)
+    if data is not None:
+        entry["status"] = "cached"
+    else:
+        try:
+            async with semaphore:
+                slides = await asyncio.to_thread(prepare_slides, topic, bullets_per_slide, offline=offline)
+
+            from agents.export_agent import export_to_bytes
+            
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(_get_export_pool(), functools.partial(export_to_bytes, slides, title=topic))
+            if data is None:
+                raise RuntimeError("Export failed")
+            EXPORT_BYTES.labels("pptx").observe(len(data))
+
+            deck_cache.put(cache_key, data)
+        except Exception as e:
+            logger.error(f"Batch item failed for topic '{topic}': {str(e)}")
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+            data = None
+
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    entry["data"] = data
+    return entry
+
+
+async def stream_batch_zip(topics: List[str], bullets_per_slide: int = 4,
+                           concurrency: int = BATCH_CONCURRENCY,
+                           offline: Optional[bool] = None) -> AsyncIterator[bytes]:
+    """
+    Generate decks for many topics and stream them as a ZIP archive.
+
+    Topics are de-duplicated after normalization, researched up front in
+    batched Wikipedia requests, summarized with at most `concurrency` in
+    flight, and exported in a process pool. Each deck is written to the
+    archive as soon as it is ready; a
+    `manifest.json` with the per-topic status is written last. `offline`
+    summarizes every deck locally, as in build_workflow.
+    """
+    unique = dedupe_topics(topics)
+    logger.info(f"Starting batch of {len(unique)} unique topics ({len(topics)} submitted)")
+
+    # Fill the research cache for every topic in a few requests instead of one or more per topic.
+    await asyncio.to_thread(research_agent.research_many, [topic for topic, _ in unique])
+
+    semaphore = asyncio.Semaphore(concurrency)
+    offline = resolve_offline(offline)
+    duplicates = {topic: dups for topic, dups in unique}
+    tasks = [asyncio.ensure_future(_build_one(topic, bullets_per_slide, semaphore, offline)) for topic, _ in unique]
+
+    sink = _ZipStream()
+    used_names: set = set()
+    manifest: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for next_done in asyncio.as_completed(tasks):
+                entry = await next_done
+                data = entry.pop("data")
+                entry["duplicates"] = duplicates[entry["topic"]]
+                entry["file"] = None
+
+                if data is not None:
+                    name = _unique_name(f"{clean_filename(entry['topic'])}_slides", used_names)
+                    entry["file"] = f"{name}.pptx"
+                    # PPTX is already deflated, so store it as-is.
+                    archive.writestr(entry["file"], data)
+
+                manifest.append(entry)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+
+            summary = {
+                "submitted": len(topics),
+                "unique": len(unique),
+                "succeeded": sum(1 for e in manifest if e["status"] != "failed"),
+                "failed": sum(1 for e in manifest if e["status"] == "failed"),
+                "seconds": round(time.perf_counter() - started, 3),
+                "topics": manifest,
+            }
+            archive.writestr("manifest.json", json.dumps(summary, indent=2))
+
+        yield sink.drain()
+        logger.info(f"Batch finished: {summary['succeeded']} succeeded, {summary['failed']} failed "
+                    f"in {summary['seconds']:.2f}s")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,121 @@
+import os
+import time
+import uuid
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv("SLIDEMAGE_MAX_WORKERS", "4"))
+MAX_QUEUE_DEPTH = int(os.getenv("SLIDEMAGE_MAX_QUEUE_DEPTH", "32"))
+JOB_TTL_SECONDS = int(os.getenv("SLIDEMAGE_JOB_TTL_SECONDS", "3600"))
+# Finished jobs (and their deck bytes) kept for retrieval; the oldest are dropped first.
+MAX_FINISHED_JOBS = int(os.getenv("SLIDEMAGE_MAX_FINISHED_JOBS", "256"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+class JobQueue:
+    """
+    Bounded worker pool for running workflows off the event loop.
+
+    At most `max_workers` jobs run concurrently and at most `max_queue_depth`
+    more wait for a worker; anything beyond that is rejected with QueueFullError
+    so callers can shed load instead of piling up threads. Finished jobs are
+    kept for `job_ttl` seconds, and at most `max_finished` of them at a time.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_queue_depth: int = MAX_QUEUE_DEPTH,
+                 job_ttl: int = JOB_TTL_SECONDS, max_finished: int = MAX_FINISHED_JOBS):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.job_ttl = job_ttl
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="slidemage-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args, description: str = "",
+               metadata: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+        with self._lock:
+            self._purge()
+
+            active = sum(1 for job in self._jobs.values() if job["status"] in (JOB_QUEUED, JOB_RUNNING))
+            if active >= self.max_workers + self.max_queue_depth:
+                raise QueueFullError(f"Job queue is full ({active} active jobs)")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "id": job_id,
+                "description": description,
+                "metadata": dict(metadata or {}),
+                "status": JOB_QUEUED,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "result": None,
+            }
+
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        logger.info(f"Queued job {job_id}: {description}")
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[..., Any], args: tuple, kwargs: dict):
+        self._update(job_id, status=JOB_RUNNING, started_at=time.time())
+
+        try:
+            result = fn(*args, **kwargs)
+            self._update(job_id, status=JOB_SUCCEEDED, result=result, finished_at=time.time())
+            logger.info(f"Job {job_id} succeeded")
+        except Exception as e:
+            self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+            logger.error(f"Job {job_id} failed: {str(e)}")
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+                if job["finished_at"] is not None:
+                    self._purge()
+
+    def _purge(self):
+        # Caller holds the lock.
+        now = time.time()
+        finished = sorted(
+            (job["finished_at"], job_id) for job_id, job in self._jobs.items() if job["finished_at"] is not None
+        )
+        excess = max(0, len(finished) - self.max_finished)
+        for index, (finished_at, job_id) in enumerate(finished):
+            if index < excess or now - finished_at > self.job_ttl:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of the job record, or None if it is unknown or expired."""
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._purge()
+            counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_SUCCEEDED: 0, JOB_FAILED: 0}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+        counts["max_workers"] = self.max_workers
+        counts["max_queue_depth"] = self.max_queue_depth
+        return counts
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -64,102 +64,519 @@
 #     return filename
 
 import os
+import time
+import asyncio
+import threading
 import logging
-from typing import List, Dict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from agents import research_agent, summarizer_agent
 from agents.research_agent import research
-from agents.summarizer_agent import summarize_with_context
+from agents.summarizer_agent import (
+    summarize_with_context, summarize_with_context_async, summarize_chunks, summarize_deck, summarize_deck_async,
+    summarize_extractive, MODEL_VERSION, PROMPT_VERSION, STRUCTURED_DECK, MAP_REDUCE_TOKEN_BUDGET, CHARS_PER_TOKEN
+)
 from agents.designer_agent import design_slides
-from agents.export_agent import export_to_pptx
-from utils.helpers import chunk_bullets, clean_filename
+from connectors.document_connector import read_document_chunks, MAX_DOCUMENT_CHARS
+from utils.helpers import (
+    chunk_bullets, chunk_text, clean_filename, log_workflow_metrics, create_backup_content, normalize_topic
+)
+from utils.metrics import STAGE_DURATION, EXPORT_BYTES, WORKFLOW_DEGRADED, SEMANTIC_LOOKUP_DURATION, track_workflow
+from utils.deadline import Deadline
+from utils.cache import deck_cache, make_deck_key
+from utils.semantic_cache import topic_index
+from utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-def build_workflow(topic: str, bullets_per_slide: int = 4) -> str:
+DECK_VERSION = f"{MODEL_VERSION}:{PROMPT_VERSION}:{'structured' if STRUCTURED_DECK else 'lines'}"
+# Offline decks are summarized by the local extractive summarizer alone and never call Gemini.
+# Bump OFFLINE_DECK_VERSION when the extractive scoring changes.
+OFFLINE_MODE = os.getenv("SLIDEMAGE_OFFLINE", "0") == "1"
+OFFLINE_DECK_VERSION = "extractive:1"
+# Bullets per topic deck, spread over slides of `bullets_per_slide` bullets.
+DECK_BULLETS = 12
+# Decks with at least this many slides skip python-pptx and are written as OOXML directly (0 disables).
+OOXML_EXPORT_MIN_SLIDES = int(os.getenv("SLIDEMAGE_OOXML_EXPORT_MIN_SLIDES", "300"))
 
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# Concurrent requests for the same deck share one research, summarize and export run.
+deck_flights = SingleFlight("deck")
+# Runs research under a deadline; a call that overruns finishes here after the workflow has moved on.
+_deadline_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="slidemage-research")
+
+def _emit(on_progress: Optional[ProgressCallback], event: Dict[str, Any]):
+    if on_progress is None:
+        return
     try:
-        logger.info(f"Starting workflow for topic: {topic}")
-        
-        # Step 1: Research
-        logger.info("Step 1: Researching topic...")
-        research_text = research(topic)
-        
-        if not research_text or research_text == "Error":
-            raise ValueError(f"Failed to research topic: {topic}")
-        
-        # Step 2: Summarize with context
-        logger.info("Step 2: Summarizing content...")
-        bullets = summarize_with_context(research_text, topic, max_bullets=12)
-        
-        if not bullets:
-            raise ValueError("Failed to generate summary bullets")
-        
-        # Step 3: Chunk bullets into slides
-        logger.info("Step 3: Organizing content into slides...")
-        slide_chunks = chunk_bullets(bullets, bullets_per_slide=bullets_per_slide)
-        
-        # Step 4: Design slides
-        logger.info("Step 4: Designing slides...")
-        slides = []
-        for i, chunk in enumerate(slide_chunks):
-            slide_title = f"{topic}" if len(slide_chunks) == 1 else f"{topic} - Part {i+1}"
-            slide = design_slides(title=slide_title, bullets=chunk)
-            slides.append(slide)
-        
-        # Step 5: Export to PowerPoint
-        logger.info("Step 5: Exporting to PowerPoint...")
-        safe_topic = clean_filename(topic)
-        filename = f"{safe_topic}_slides.pptx"
-        export_to_pptx(slides, filename)
-        
-        if not os.path.exists(filename):
-            raise FileNotFoundError(f"Failed to create PowerPoint file: {filename}")
-        
-        logger.info(f"Workflow completed successfully! Generated {len(slides)} slides")
-        return filename
-        
+        on_progress(event)
     except Exception as e:
-        logger.error(f" Workflow failed: {str(e)}")
+        # A broken listener must never fail the workflow itself.
+        logger.warning(f"Progress callback failed: {str(e)}")
+
+@contextmanager
+def _stage(on_progress: Optional[ProgressCallback], stage: str, step: int, total_steps: int, message: str):
+    """Log a workflow step and report its start, finish and duration to on_progress."""
+    logger.info(f"Step {step}: {message}")
+    _emit(on_progress, {"stage": stage, "status": "started", "step": step, "total_steps": total_steps})
+    
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        duration = time.perf_counter() - start
+        STAGE_DURATION.labels(stage, "failed").observe(duration)
+        if isinstance(e, Exception):
+            _emit(on_progress, {"stage": stage, "status": "failed", "step": step, "total_steps": total_steps,
+                                "duration": duration, "error": str(e)})
         raise
+    
+    duration = time.perf_counter() - start
+    STAGE_DURATION.labels(stage, "succeeded").observe(duration)
+    _emit(on_progress, {"stage": stage, "status": "finished", "step": step, "total_steps": total_steps,
+                        "duration": duration})
+
+@contextmanager
+def _workflow_run(kind: str, name: str):
+    """Track a workflow in the metrics and log its summary line when it ends."""
+    run = {"slides": 0}
+    start_time = time.time()
+    success = False
+    try:
+        with track_workflow(kind):
+            yield run
+        success = True
+    finally:
+        log_workflow_metrics(start_time, name, run["slides"], success)
+
+def _design_deck(title: str, slide_chunks: List[List[str]]) -> List[Dict[str, Any]]:
+    slides = []
+    for i, chunk in enumerate(slide_chunks):
+        slide_title = f"{title}" if len(slide_chunks) == 1 else f"{title} - Part {i+1}"
+        slide = design_slides(title=slide_title, bullets=chunk)
+        slides.append(slide)
+    return slides
+
+def _retitle(slides: List[Dict[str, Any]], source_topic: str, title: str) -> List[Dict[str, Any]]:
+    """Rename slides titled after `source_topic` ("Machine learning - Part 1") after `title` instead."""
+    retitled = []
+    for slide in slides:
+        name, part, number = slide["title"].rpartition(" - Part ")
+        if not (part and number.isdigit()):
+            name, number = slide["title"], ""
+        if normalize_topic(name) == source_topic:
+            slide = dict(slide, title=f"{title} - Part {number}" if number else title)
+        retitled.append(slide)
+    return retitled
+
+def _design_structured(deck: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [design_slides(title=slide["title"], bullets=slide["bullets"], notes=slide.get("notes", ""))
+            for slide in deck]
+
+def warm_up():
+    """
+    Load Gemini, Wikipedia and python-pptx, parse the presentation templates
+    and rebuild the semantic topic index ahead of the first request.
+    """
+    start = time.perf_counter()
+    summarizer_agent.warm_up()
+    research_agent.warm_up()
+    topic_index.load()
+    from agents.export_agent import template_registry, THEMES
+    import agents.ooxml_export  # noqa: F401
+    template_registry.preload(list(THEMES))
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+def _render(slides: List[Dict[str, Any]], name: str, title: Optional[str] = None) -> bytes:
+    # python-pptx is imported on first export (or by warm_up) to keep startup fast.
+    from agents.export_agent import export_to_buffer
+    from agents.ooxml_export import export_to_bytes_fast
+    
+    # The direct OOXML writer does not write speaker notes.
+    if OOXML_EXPORT_MIN_SLIDES and len(slides) >= OOXML_EXPORT_MIN_SLIDES and not any(s.get("notes") for s in slides):
+        exporter = "ooxml"
+        data = export_to_bytes_fast(slides, title=title)
+    else:
+        exporter = "pptx"
+        buffer = export_to_buffer(slides, title=title)
+        data = buffer.getvalue() if buffer is not None else None
+    
+    if data is None:
+        raise RuntimeError(f"Failed to create PowerPoint presentation for: {name}")
+    
+    EXPORT_BYTES.labels(exporter).observe(len(data))
+    return data
+
+def _deliver(data: bytes, name: str, in_memory: bool) -> Union[str, bytes]:
+    """Return the deck as bytes, or write it to `<name>_slides.pptx` and return the path."""
+    if in_memory:
+        return data
+    
+    safe_name = clean_filename(name)
+    filename = f"{safe_name}_slides.pptx"
+    with open(filename, "wb") as f:
+        f.write(data)
+    
+    return filename
+
+def _cached_deck(cache_key: Optional[str], topic: str, on_progress: Optional[ProgressCallback]) -> Optional[bytes]:
+    if not cache_key:
+        return None
+    
+    cached = deck_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Deck cache hit for topic: {topic}")
+        _emit(on_progress, {"stage": "cache", "status": "hit"})
+    return cached
+
+def _similar_deck(topic: str, bullets_per_slide: int, version: str, cache_key: str,
+                  on_progress: Optional[ProgressCallback]) -> Optional[bytes]:
+    """Render the slides of a cached, similarly worded topic under this topic's title, or return None."""
+    start = time.perf_counter()
+    match = topic_index.lookup(topic, bullets_per_slide, version)
+    SEMANTIC_LOOKUP_DURATION.labels("hit" if match else "miss").observe(time.perf_counter() - start)
+    if match is None:
+        return None
+    
+    entry, similarity = match
+    logger.info(f"Semantic cache hit for topic: {topic} (matched '{entry['topic']}', similarity {similarity:.2f})")
+    _emit(on_progress, {"stage": "cache", "status": "similar", "topic": entry["topic"], "similarity": similarity})
+    data = _render(_retitle(entry["slides"], entry["topic"], topic), topic, topic)
+    deck_cache.put(cache_key, data)
+    return data
+
+def _degrade(on_progress: Optional[ProgressCallback], stage: str, reason: str) -> bool:
+    logger.warning(f"Deadline: {stage} degraded ({reason})")
+    WORKFLOW_DEGRADED.labels(stage).inc()
+    _emit(on_progress, {"stage": stage, "status": "degraded", "reason": reason})
+    return True
 
-def build_workflow_from_text(text: str, title: str = "Presentation", bullets_per_slide: int = 4) -> str:
+def _research_within(topic: str, deadline: Optional[Deadline]) -> Optional[str]:
+    """research(topic), or None when it does not finish within the research budget."""
+    if deadline is None:
+        return research(topic)
     
+    future = _deadline_pool.submit(research, topic)
     try:
-        logger.info(f"Starting text-based workflow for: {title}")
-        
-        # Skip research step, go directly to summarization
-        logger.info("Step 1: Summarizing provided text...")
-        bullets = summarize_with_context(text, title, max_bullets=12)
-        
-        if not bullets:
-            raise ValueError("Failed to generate summary bullets from text")
-        
-        # Step 2: Chunk bullets into slides
-        logger.info("Step 2: Organizing content into slides...")
-        slide_chunks = chunk_bullets(bullets, bullets_per_slide=bullets_per_slide)
-        
-        # Step 3: Design slides
-        logger.info("Step 3: Designing slides...")
-        slides = []
-        for i, chunk in enumerate(slide_chunks):
-            slide_title = f"{title}" if len(slide_chunks) == 1 else f"{title} - Part {i+1}"
-            slide = design_slides(title=slide_title, bullets=chunk)
-            slides.append(slide)
+        return future.result(timeout=deadline.stage_budget("research"))
+    except FuturesTimeoutError:
+        return None
+
+def _summarize_within(research_text: str, topic: str, bullets_per_slide: int, deadline: Optional[Deadline],
+                      on_progress: Optional[ProgressCallback],
+                      offline: bool = False) -> Tuple[Optional[List[Dict[str, Any]]], List[str], bool]:
+    """Return (structured deck or None, bullets, degraded) for the research text."""
+    if offline:
+        return None, summarize_extractive(research_text, DECK_BULLETS, topic), False
+    
+    budget = deadline.stage_budget("summarize") if deadline else None
+    deck = None
+    if STRUCTURED_DECK:
+        deck = summarize_deck(research_text, topic, DECK_BULLETS, bullets_per_slide, budget=budget)
+    if deck is not None:
+        return deck, [], False
+    
+    if deadline is None:
+        return None, summarize_with_context(research_text, topic, max_bullets=DECK_BULLETS), False
+    
+    try:
+        bullets = summarize_with_context(research_text, topic, max_bullets=DECK_BULLETS,
+                                         budget=deadline.stage_budget("summarize"), fallback=False)
+        return None, bullets, False
+    except Exception as e:
+        _degrade(on_progress, "summarize", str(e) or type(e).__name__)
+        return None, summarize_extractive(research_text, DECK_BULLETS, topic), True
+
+async def _summarize_within_async(research_text: str, topic: str, bullets_per_slide: int,
+                                  deadline: Optional[Deadline], on_progress: Optional[ProgressCallback],
+                                  offline: bool = False) -> Tuple[Optional[List[Dict[str, Any]]], List[str], bool]:
+    """Async counterpart of _summarize_within."""
+    if offline:
+        return None, summarize_extractive(research_text, DECK_BULLETS, topic), False
+    
+    budget = deadline.stage_budget("summarize") if deadline else None
+    deck = None
+    if STRUCTURED_DECK:
+        deck = await summarize_deck_async(research_text, topic, DECK_BULLETS, bullets_per_slide, budget=budget)
+    if deck is not None:
+        return deck, [], False
+    
+    if deadline is None:
+        return None, await summarize_with_context_async(research_text, topic, max_bullets=DECK_BULLETS), False
+    
+    try:
+        bullets = await summarize_with_context_async(research_text, topic, max_bullets=DECK_BULLETS,
+                                                     budget=deadline.stage_budget("summarize"), fallback=False)
+        return None, bullets, False
+    except Exception as e:
+        _degrade(on_progress, "summarize", str(e) or type(e).__name__)
+        return None, summarize_extractive(research_text, DECK_BULLETS, topic), True
+
+def _finish_slides(topic: str, bullets_per_slide: int, deck: Optional[List[Dict[str, Any]]], bullets: List[str],
+                   on_progress: Optional[ProgressCallback]) -> List[Dict[str, Any]]:
+    # Step 3: Chunk bullets into slides (a structured deck already comes in slides)
+    with _stage(on_progress, "chunk", 3, 5, "Organizing content into slides..."):
+        slide_chunks = chunk_bullets(bullets, bullets_per_slide=bullets_per_slide) if deck is None else None
+    
+    # Step 4: Design slides
+    with _stage(on_progress, "design", 4, 5, "Designing slides..."):
+        return _design_deck(topic, slide_chunks) if deck is None else _design_structured(deck)
+
+def _prepare_slides(topic: str, bullets_per_slide: int, on_progress: Optional[ProgressCallback],
+                    deadline: Optional[Deadline], offline: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+    degraded = False
+    
+    # Step 1: Research
+    with _stage(on_progress, "research", 1, 5, "Researching topic..."):
+        research_text = _research_within(topic, deadline)
         
-        # Step 4: Export to PowerPoint
-        logger.info("Step 4: Exporting to PowerPoint...")
-        safe_title = clean_filename(title)
-        filename = f"{safe_title}_slides.pptx"
-        export_to_pptx(slides, filename)
+        if research_text is None:
+            degraded = _degrade(on_progress, "research", "timeout")
+        elif not research_text or research_text == "Error":
+            raise ValueError(f"Failed to research topic: {topic}")
+    
+    # Step 2: Summarize with context, as a whole structured deck when possible
+    with _stage(on_progress, "summarize", 2, 5, "Summarizing content..."):
+        if research_text is None:
+            deck, bullets = create_backup_content(topic), []
+        else:
+            deck, bullets, summary_degraded = _summarize_within(
+                research_text, topic, bullets_per_slide, deadline, on_progress, offline
+            )
+            degraded = degraded or summary_degraded
         
-        if not os.path.exists(filename):
-            raise FileNotFoundError(f"Failed to create PowerPoint file: {filename}")
+        if deck is None and not bullets:
+            raise ValueError("Failed to generate summary bullets")
+    
+    return _finish_slides(topic, bullets_per_slide, deck, bullets, on_progress), degraded
+
+def prepare_slides(topic: str, bullets_per_slide: int = 4, on_progress: Optional[ProgressCallback] = None,
+                   deadline: Optional[Deadline] = None, offline: Optional[bool] = None) -> List[Dict[str, Any]]:
+    """Run the research, summarize, chunk and design steps and return the designed slides."""
+    return _prepare_slides(topic, bullets_per_slide, on_progress, deadline, resolve_offline(offline))[0]
+
+def resolve_offline(offline: Optional[bool]) -> bool:
+    """An explicit offline flag, or SLIDEMAGE_OFFLINE when the caller did not choose."""
+    return OFFLINE_MODE if offline is None else offline
+
+def deck_version(offline: bool) -> str:
+    """Cache version of a deck; offline decks do not depend on the model or prompt."""
+    return OFFLINE_DECK_VERSION if offline else DECK_VERSION
+
+def _generate_deck(topic: str, bullets_per_slide: int, cache_key: Optional[str],
+                   on_progress: Optional[ProgressCallback], deadline: Optional[Deadline],
+                   offline: bool = False) -> Tuple[bytes, int]:
+    slides, degraded = _prepare_slides(topic, bullets_per_slide, on_progress, deadline, offline)
+    
+    # Step 5: Export to PowerPoint
+    with _stage(on_progress, "export", 5, 5, "Exporting to PowerPoint..."):
+        data = _render(slides, topic, topic)
+    
+    # A deck cut short by the deadline is served once, never cached.
+    if cache_key and not degraded:
+        deck_cache.put(cache_key, data)
+        topic_index.add(topic, bullets_per_slide, deck_version(offline), slides)
+    return data, len(slides)
+
+def build_workflow(topic: str, bullets_per_slide: int = 4, in_memory: bool = False,
+                   use_cache: bool = True, on_progress: Optional[ProgressCallback] = None,
+                   deadline: Optional[float] = None, offline: Optional[bool] = None) -> Union[str, bytes]:
+    """
+    Generate a deck for `topic`.
+    
+    Concurrent calls for the same normalized topic and slide size run the
+    workflow once; the others wait for it, receive its progress events from
+    then on, and get the same deck or the same error.
+    
+    `deadline` is the overall time budget in seconds (default
+    SLIDEMAGE_WORKFLOW_DEADLINE_SECONDS, 0 for none). Research and
+    summarization get per-stage budgets, model calls are hedged at their
+    observed p95, and when a stage runs out of time the deck is finished from
+    the extractive summary or backup content so that it is still returned in time.
+    
+    `offline` (default SLIDEMAGE_OFFLINE) summarizes with the local extractive
+    summarizer only: no Gemini calls, no API cost, and no model latency.
+    Offline decks are cached separately from model-written ones.
+    
+    With `use_cache`, a topic that misses the deck cache but is worded much
+    like a cached one ("Intro to ML" after "Machine learning") reuses that
+    deck's slides; see utils/semantic_cache.py.
+    """
+    with _workflow_run("topic", topic) as run:
+        try:
+            logger.info(f"Starting workflow for topic: {topic}")
+            budget = Deadline.from_seconds(deadline)
+            offline = resolve_offline(offline)
+            version = deck_version(offline)
+            
+            cache_key = make_deck_key(topic, bullets_per_slide, version) if use_cache else None
+            cached = _cached_deck(cache_key, topic, on_progress)
+            if cached is None and cache_key:
+                cached = _similar_deck(topic, bullets_per_slide, version, cache_key, on_progress)
+            if cached is not None:
+                return _deliver(cached, topic, in_memory)
+            
+            data, run["slides"] = deck_flights.do(
+                make_deck_key(topic, bullets_per_slide, version),
+                lambda notify: _generate_deck(topic, bullets_per_slide, cache_key, notify, budget, offline),
+                listener=on_progress
+            )
+            
+            logger.info(f"Workflow completed successfully! Generated {run['slides']} slides")
+            return _deliver(data, topic, in_memory)
+            
+        except Exception as e:
+            logger.error(f" Workflow failed: {str(e)}")
+            raise
+
+async def _generate_deck_async(topic: str, bullets_per_slide: int, cache_key: Optional[str],
+                               on_progress: Optional[ProgressCallback],
+                               deadline: Optional[Deadline], offline: bool = False) -> Tuple[bytes, int]:
+    degraded = False
+    
+    with _stage(on_progress, "research", 1, 5, "Researching topic..."):
+        try:
+            research_text = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(_deadline_pool, research, topic),
+                deadline.stage_budget("research") if deadline else None
+            )
+        except asyncio.TimeoutError:
+            research_text = None
+            degraded = _degrade(on_progress, "research", "timeout")
         
-        logger.info(f"Text-based workflow completed! Generated {len(slides)} slides")
-        return filename
+        if research_text is not None and (not research_text or research_text == "Error"):
+            raise ValueError(f"Failed to research topic: {topic}")
+    
+    with _stage(on_progress, "summarize", 2, 5, "Summarizing content..."):
+        if research_text is None:
+            deck, bullets = create_backup_content(topic), []
+        else:
+            deck, bullets, summary_degraded = await _summarize_within_async(
+                research_text, topic, bullets_per_slide, deadline, on_progress, offline
+            )
+            degraded = degraded or summary_degraded
         
-    except Exception as e:
-        logger.error(f"Text-based workflow failed: {str(e)}")
-        raise
+        if deck is None and not bullets:
+            raise ValueError("Failed to generate summary bullets")
+    
+    slides = _finish_slides(topic, bullets_per_slide, deck, bullets, on_progress)
+    
+    with _stage(on_progress, "export", 5, 5, "Exporting to PowerPoint..."):
+        data = await asyncio.to_thread(_render, slides, topic, topic)
+    
+    if cache_key and not degraded:
+        deck_cache.put(cache_key, data)
+        await asyncio.to_thread(topic_index.add, topic, bullets_per_slide, deck_version(offline), slides)
+    return data, len(slides)
+
+async def build_workflow_async(topic: str, bullets_per_slide: int = 4, in_memory: bool = False,
+                               use_cache: bool = True, on_progress: Optional[ProgressCallback] = None,
+                               deadline: Optional[float] = None, offline: Optional[bool] = None) -> Union[str, bytes]:
+    """
+    Async variant of build_workflow for use directly from request handlers.
+    
+    Summarization awaits the async Gemini API; research and export, which are
+    blocking libraries, run in worker threads. Identical concurrent requests
+    are coalesced as in build_workflow; the shared run is cancelled (along
+    with its in-flight model call) only when every request waiting on it has
+    been cancelled. `deadline` and `offline` work as in build_workflow.
+    """
+    with _workflow_run("topic", topic) as run:
+        try:
+            logger.info(f"Starting async workflow for topic: {topic}")
+            budget = Deadline.from_seconds(deadline)
+            offline = resolve_offline(offline)
+            version = deck_version(offline)
+            
+            cache_key = make_deck_key(topic, bullets_per_slide, version) if use_cache else None
+            cached = _cached_deck(cache_key, topic, on_progress)
+            if cached is None and cache_key:
+                cached = await asyncio.to_thread(_similar_deck, topic, bullets_per_slide, version, cache_key, on_progress)
+            if cached is not None:
+                return await asyncio.to_thread(_deliver, cached, topic, in_memory)
+            
+            data, run["slides"] = await deck_flights.do_async(
+                make_deck_key(topic, bullets_per_slide, version),
+                lambda notify: _generate_deck_async(topic, bullets_per_slide, cache_key, notify, budget, offline),
+                listener=on_progress
+            )
+            
+            logger.info(f"Async workflow completed successfully! Generated {run['slides']} slides")
+            return await asyncio.to_thread(_deliver, data, topic, in_memory)
+            
+        except Exception as e:
+            logger.error(f" Workflow failed: {str(e)}")
+            raise
+
+def build_workflow_from_text(text: str, title: str = "Presentation", bullets_per_slide: int = 4,
+                             in_memory: bool = False,
+                             on_progress: Optional[ProgressCallback] = None) -> Union[str, bytes]:
+    
+    chunks = chunk_text(text, max_chunk_size=MAP_REDUCE_TOKEN_BUDGET * CHARS_PER_TOKEN)
+    return _build_from_chunks(chunks, title, bullets_per_slide, in_memory, on_progress)
+
+def _build_from_chunks(chunks: List[str], title: str, bullets_per_slide: int, in_memory: bool,
+                       on_progress: Optional[ProgressCallback]) -> Union[str, bytes]:
+    
+    with _workflow_run("text", title) as run:
+        try:
+            logger.info(f"Starting text-based workflow for: {title}")
+            
+            # Skip research step, go directly to summarization; each chunk is one map call
+            with _stage(on_progress, "summarize", 1, 4, "Summarizing provided text..."):
+                bullets = summarize_chunks(
+                    chunks, title, max_bullets=12,
+                    on_chunk=lambda chunk: _emit(on_progress, {"stage": "summarize", "status": "chunk", **chunk})
+                )
+            
+                if not bullets:
+                    raise ValueError("Failed to generate summary bullets from text")
+            
+            # Step 2: Chunk bullets into slides
+            with _stage(on_progress, "chunk", 2, 4, "Organizing content into slides..."):
+                slide_chunks = chunk_bullets(bullets, bullets_per_slide=bullets_per_slide)
+            
+            # Step 3: Design slides
+            with _stage(on_progress, "design", 3, 4, "Designing slides..."):
+                slides = _design_deck(title, slide_chunks)
+            
+            # Step 4: Export to PowerPoint
+            with _stage(on_progress, "export", 4, 4, "Exporting to PowerPoint..."):
+                data = _render(slides, title)
+            
+            run["slides"] = len(slides)
+            logger.info(f"Text-based workflow completed! Generated {len(slides)} slides")
+            return _deliver(data, title, in_memory)
+            
+        except Exception as e:
+            logger.error(f"Text-based workflow failed: {str(e)}")
+            raise
+
+def build_workflow_from_document(path: str, content_type: Optional[str] = None, title: str = "Document",
+                                 bullets_per_slide: int = 4, in_memory: bool = False,
+                                 cancel_event: Optional[threading.Event] = None,
+                                 on_progress: Optional[ProgressCallback] = None) -> Union[str, bytes]:
+    """
+    Extract text from a PDF, DOCX or TXT file and build a deck from it.
+    
+    Text beyond SLIDEMAGE_MAX_DOCUMENT_CHARS is left out, which is reported
+    as an `extract` stage event with status `truncated`.
+    """
+    logger.info(f"Extracting text from document: {title}")
+    # Extract in map-sized chunks so they go straight to the map step.
+    chunks, truncated = read_document_chunks(
+        path, content_type, max_chunk_size=MAP_REDUCE_TOKEN_BUDGET * CHARS_PER_TOKEN, cancel_event=cancel_event
+    )
+    
+    if not chunks:
+        raise ValueError(f"No text could be extracted from document: {title}")
+    
+    if truncated:
+        _emit(on_progress, {"stage": "extract", "status": "truncated", "max_chars": MAX_DOCUMENT_CHARS})
+    
+    return _build_from_chunks(chunks, title, bullets_per_slide, in_memory, on_progress)
 
 def validate_workflow_requirements() -> Dict[str, bool]:
     """
@@ -170,7 +587,7 @@ def validate_workflow_requirements() -> Dict[str, bool]:
     """
     requirements = {
         "gemini_api_key": bool(os.getenv("GEMINI_API_KEY")),
-        "wikipedia_available": True,  # Assume available for now
+        "requests_library": True,  # The Wikipedia client's HTTP library
         "pptx_library": True,  # Check if python-pptx is available
     }
     
@@ -181,9 +598,9 @@ def validate_workflow_requirements() -> Dict[str, bool]:
         requirements["pptx_library"] = False
     
     try:
-        import wikipedia
-        requirements["wikipedia_available"] = True
+        import requests
+        requirements["requests_library"] = True
     except ImportError:
-        requirements["wikipedia_available"] = False
+        requirements["requests_library"] = False
     
     return requirements
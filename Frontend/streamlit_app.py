@@ -1,10 +1,91 @@
 import streamlit as st
 import requests
 import os
+import json
 from io import BytesIO
 
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
 
+# Connect timeout and maximum gap between server-sent events (the backend sends keep-alives).
+STREAM_TIMEOUT = (5, 60)
+
+STAGE_LABELS = {
+    "extract": "Reading document",
+    "cache": "Found a cached presentation",
+    "research": "Researching topic",
+    "summarize": "Summarizing content",
+    "chunk": "Organizing content into slides",
+    "design": "Designing slides",
+    "export": "Exporting to PowerPoint",
+}
+
+def iter_sse(response):
+    """Yield (event, data) pairs from a server-sent events response."""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith(":"):
+            continue
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+def stream_deck(stream, progress_bar, stage_log):
+    """
+    Render a job's SSE progress and return the finished deck's bytes, or None
+    after showing an error.
+    """
+    finished_stages = []
+    
+    for event, data in iter_sse(stream):
+        if event == "stage":
+            label = STAGE_LABELS.get(data["stage"], data["stage"])
+            if data["status"] == "started":
+                progress_bar.progress((data["step"] - 1) / data["total_steps"], text=f"{label}...")
+            elif data["status"] == "finished":
+                finished_stages.append(f"✔ {label} ({data['duration']:.1f}s)")
+                progress_bar.progress(data["step"] / data["total_steps"], text=f"{label} done")
+            elif data["status"] == "hit":
+                finished_stages.append(f"✔ {label}")
+            elif data["status"] == "truncated":
+                finished_stages.append(f"⚠ Only the first {data['max_chars']:,} characters of the document were used")
+            elif data["status"] == "similar":
+                finished_stages.append(f"✔ Reused the presentation for '{data['topic']}' ({data['similarity']:.0%} match)")
+            elif data["status"] == "degraded":
+                # The deadline cut this stage short; the deck is still built, with simpler content.
+                finished_stages.append(f"⚠ {label}: {data['reason']}")
+            elif data["status"] == "chunk":
+                # Map-reduce progress within the summarize stage of a long document.
+                progress_bar.progress(
+                    min(1.0, (data["index"] + 1) / data["total"]),
+                    text=f"{label}: {data['phase']} {data['index'] + 1}/{data['total']} ({data['latency']:.1f}s)"
+                )
+                continue
+            else:
+                continue
+            stage_log.markdown("  \n".join(finished_stages))
+        
+        elif event == "complete":
+            progress_bar.progress(1.0, text=f"Done in {data['elapsed']:.1f}s")
+            result = requests.get(f"{API_URL}{data['result_url']}", timeout=STREAM_TIMEOUT)
+            if result.status_code == 200:
+                return result.content
+            st.error(f"❌ Error downloading presentation: {result.text}")
+            return None
+        
+        elif event == "error":
+            st.error(f"❌ Error generating presentation: {data['detail']}")
+            return None
+    
+    st.error("❌ The server closed the progress stream early. Please try again.")
+    return None
+
 # Page configuration
 st.set_page_config(
     page_title="SlideMage",
@@ -70,33 +151,37 @@ with col1:
         if not topic.strip():
             st.error("Please enter a topic!")
         else:
-            with st.spinner(f"Creating presentation about '{topic}'..."):
-                try:
-                    response = requests.post(
-                        f"{API_URL}/generate_slides", 
-                        data={"topic": topic},
-                        timeout=60
-                    )
-                    
-                    if response.status_code == 200:
-                        st.success("✅ Presentation generated successfully!")
-                        
-                        # Download button
-                        st.download_button(
-                            label="Download Presentation",
-                            data=response.content,
-                            file_name=f"{topic.replace(' ', '_')}_slides.pptx",
-                            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-                        )
+            progress_bar = st.progress(0, text=f"Creating presentation about '{topic}'...")
+            stage_log = st.empty()
+            
+            try:
+                with requests.get(
+                    f"{API_URL}/generate_slides/stream",
+                    params={"topic": topic},
+                    stream=True,
+                    timeout=STREAM_TIMEOUT
+                ) as stream:
+                    if stream.status_code != 200:
+                        st.error(f"❌ Error generating presentation: {stream.text}")
                     else:
-                        st.error(f"❌ Error generating presentation: {response.text}")
-                        
-                except requests.exceptions.Timeout:
-                    st.error("⏱Request timed out. Please try again.")
-                except requests.exceptions.ConnectionError:
-                    st.error("Cannot connect to the API. Make sure the backend is running.")
-                except Exception as e:
-                    st.error(f"❌ An error occurred: {str(e)}")
+                        deck = stream_deck(stream, progress_bar, stage_log)
+                        if deck is not None:
+                            st.success("✅ Presentation generated successfully!")
+                            
+                            # Download button
+                            st.download_button(
+                                label="Download Presentation",
+                                data=deck,
+                                file_name=f"{topic.replace(' ', '_')}_slides.pptx",
+                                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+                            )
+                    
+            except requests.exceptions.Timeout:
+                st.error("⏱Request timed out. Please try again.")
+            except requests.exceptions.ConnectionError:
+                st.error("Cannot connect to the API. Make sure the backend is running.")
+            except Exception as e:
+                st.error(f"❌ An error occurred: {str(e)}")
 
 with col2:
     st.header("Generate from Document")
@@ -107,34 +192,39 @@ with col2:
     )
     
     if uploaded_file and st.button("🚀 Generate from Document", key="doc_btn"):
-        with st.spinner(f"Processing '{uploaded_file.name}'..."):
-            try:
-                files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
-                response = requests.post(
-                    f"{API_URL}/upload_doc",
-                    files=files,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    st.success("✅ Presentation generated from document!")
-                    
-                    # Download button
-                    st.download_button(
-                        label="Download Presentation",
-                        data=response.content,
-                        file_name=f"{uploaded_file.name}_slides.pptx",
-                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-                    )
+        progress_bar = st.progress(0, text=f"Processing '{uploaded_file.name}'...")
+        stage_log = st.empty()
+        
+        try:
+            files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
+            # Long documents take a while; streaming progress keeps the read timeout per event, not per deck.
+            with requests.post(
+                f"{API_URL}/upload_doc/stream",
+                files=files,
+                stream=True,
+                timeout=STREAM_TIMEOUT
+            ) as stream:
+                if stream.status_code != 200:
+                    st.error(f"❌ Error processing document: {stream.text}")
                 else:
-                    st.error(f"❌ Error processing document: {response.text}")
-                    
-            except requests.exceptions.Timeout:
-                st.error("Request timed out. Please try again.")
-            except requests.exceptions.ConnectionError:
-                st.error("Cannot connect to the API. Make sure the backend is running.")
-            except Exception as e:
-                st.error(f"❌ An error occurred: {str(e)}")
+                    deck = stream_deck(stream, progress_bar, stage_log)
+                    if deck is not None:
+                        st.success("✅ Presentation generated from document!")
+                        
+                        # Download button
+                        st.download_button(
+                            label="Download Presentation",
+                            data=deck,
+                            file_name=f"{uploaded_file.name}_slides.pptx",
+                            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+                        )
+                
+        except requests.exceptions.Timeout:
+            st.error("Request timed out. Please try again.")
+        except requests.exceptions.ConnectionError:
+            st.error("Cannot connect to the API. Make sure the backend is running.")
+        except Exception as e:
+            st.error(f"❌ An error occurred: {str(e)}")
 
 # Footer
 st.markdown("---")